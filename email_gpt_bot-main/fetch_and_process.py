@@ -1,7 +1,11 @@
 # [第 1 行 ~ 第 83 行]
 import json
 from utils.email_fetcher import fetch_all_emails
-from utils.gpt_summary import gpt_summarize_email
+from utils.gpt_summary import summarize_with_gate, train_classifier_from_replies
+from utils.ad_classifier import load_classifier, save_classifier
+from utils.dedup import annotate_summary, cluster_near_duplicates, pick_representatives
+from utils.mail_store import MailStore
+from utils.morningcast_export import build_morningcast_records, write_morningcast_summary
 from utils.report_writer import write_markdown_report
 from openai import OpenAI
 from markdown_it import MarkdownIt
@@ -16,6 +20,12 @@ def load_config():
     raw_from_password = os.environ.get("SEND_EMAIL_FROM_PASSWORD", "")
     raw_report_receivers = os.environ.get("REPORT_RECEIVERS", "")
     raw_email_accounts = os.environ.get("EMAIL_ACCOUNTS", "[]")
+    raw_ad_model_path = os.environ.get("AD_MODEL_PATH", "output/ad_model.json")
+    raw_ad_threshold = os.environ.get("AD_CLASSIFIER_THRESHOLD", "0.9")
+    raw_batch_budget = os.environ.get("GPT_BATCH_TOKEN_BUDGET", "0")
+    raw_report_mode = os.environ.get("REPORT_MODE", "auto")
+    raw_email_store_path = os.environ.get("EMAIL_STORE_PATH", "")
+    raw_morningcast_json = os.environ.get("MORNINGCAST_EMAIL_JSON", "")
 
     # 印出環境變數（顯示部分敏感資訊避免洩漏）
     print("==== Debug: 環境變數讀取結果 ====")
@@ -33,6 +43,18 @@ def load_config():
         print("❌ 解析 EMAIL_ACCOUNTS JSON 時發生錯誤：", e)
         parsed_email_accounts = []
 
+    try:
+        ad_threshold = float(raw_ad_threshold)
+    except ValueError:
+        print("❌ AD_CLASSIFIER_THRESHOLD 不是數字，改用預設 0.9：", raw_ad_threshold)
+        ad_threshold = 0.9
+
+    try:
+        batch_token_budget = int(raw_batch_budget)
+    except ValueError:
+        print("❌ GPT_BATCH_TOKEN_BUDGET 不是整數，停用批次摘要：", raw_batch_budget)
+        batch_token_budget = 0
+
     return {
         "gpt_api_key": raw_gpt_key,
         "send_email_from": {
@@ -40,7 +62,13 @@ def load_config():
             "password": raw_from_password
         },
         "report_receivers": raw_report_receivers.split(","),  # 以逗號切割
-        "email_accounts": parsed_email_accounts
+        "email_accounts": parsed_email_accounts,
+        "ad_model_path": raw_ad_model_path,
+        "ad_threshold": ad_threshold,
+        "batch_token_budget": batch_token_budget,
+        "report_mode": raw_report_mode if raw_report_mode in ("auto", "single", "hierarchical") else "auto",
+        "email_store_path": raw_email_store_path,
+        "morningcast_email_json": raw_morningcast_json
     }
 
 def main():
@@ -54,6 +82,11 @@ def main():
     print("send_email_from.password (部分) =", config["send_email_from"]["password"][:3] + "***" if config["send_email_from"]["password"] else "(空/None)")
     print("report_receivers =", config["report_receivers"])
     print("email_accounts =", config["email_accounts"])
+    print("ad_model_path =", config["ad_model_path"], "／ ad_threshold =", config["ad_threshold"])
+    print("batch_token_budget =", config["batch_token_budget"] or "(停用，單封模式)")
+    print("report_mode =", config["report_mode"])
+    print("email_store_path =", config["email_store_path"] or "(未使用常駐收信)")
+    print("morningcast_email_json =", config["morningcast_email_json"] or "(不輸出)")
     print("=============================\n")
 
     all_emails = []
@@ -68,6 +101,16 @@ def main():
         with open("test_data.txt", "r", encoding="utf-8") as file:
             summaries = file.read().split("\n\n")
             print("📄 測試模式：讀取 test_data.txt 完成，摘要數量：", len(summaries))
+    elif config["email_store_path"] and os.path.exists(config["email_store_path"]):
+        # 常駐收信（ingest_daemon.py）已整晚摘要好，直接讀取結果
+        store = MailStore(config["email_store_path"])
+        stored_emails, stored_replies = store.recent()
+        print(f"🌙 從摘要庫讀取 {len(stored_emails)} 封預先摘要的郵件（更新於 {store.data['updated_at']}）")
+
+        clusters = cluster_near_duplicates(stored_emails)
+        all_emails = pick_representatives(stored_emails, clusters)
+        summaries = [annotate_summary(stored_replies[c[0]], email_item) for c, email_item in zip(clusters, all_emails)]
+        print(f"🧬 近似重複郵件分群：{len(stored_emails)} 封 → {len(all_emails)} 群")
     else:
         # 取得所有信件
         for account in config.get("email_accounts", []):
@@ -80,19 +123,45 @@ def main():
             print(f"  找到 {len(emails)} 封郵件")
             all_emails.extend(emails)
 
+        tokens_saved = sum(e.get("body_tokens_saved", 0) for e in all_emails)
+        print(f"✂️ 內文清理（引用舊信、簽名檔、頁尾、長網址）共省下約 {tokens_saved} tokens")
+
+        # 合併幾乎相同的郵件（電子報、CI 通知、多個信箱收到的同一封信），每群只摘要一封
+        clusters = cluster_near_duplicates(all_emails)
+        all_emails = pick_representatives(all_emails, clusters)
+        print(f"🧬 近似重複郵件分群：{sum(len(c) for c in clusters)} 封 → {len(all_emails)} 群")
+
         # 對所有信件做 GPT 摘要
         print(f"📧 總共收集到 {len(all_emails)} 封郵件，開始摘要...")
-        for i, email_item in enumerate(all_emails, start=1):
-            print(f"  - 處理第 {i} 封郵件，主旨：{email_item.get('subject')}")
-            reply = gpt_summarize_email(client, email_item, model="gpt-4o-mini")
-            print("--- GPT 回覆 ---")
-            print(reply)
-            print("---------------")
-            summaries.append(reply)
+        classifier = load_classifier(config["ad_model_path"])
+        if not classifier.is_ready():
+            print("🤖 廣告分類器訓練資料不足，本次僅用關鍵字過濾。")
+        summaries, gate_stats = summarize_with_gate(
+            client, all_emails, classifier=classifier, threshold=config["ad_threshold"], model="gpt-4o-mini",
+            batch_token_budget=config["batch_token_budget"]
+        )
+        print(
+            f"🤖 LLM 呼叫：{gate_stats['llm_calls']} 次，省下 {gate_stats['llm_calls_avoided']} 次"
+            f"（關鍵字 {gate_stats['keyword_skipped']}、分類器 {gate_stats['classifier_skipped']}）／共 {gate_stats['total']} 封"
+            f"，批次失敗改單封 {gate_stats['batch_fallbacks']} 封"
+        )
+
+        # 用 GPT 的分類結果繼續訓練本地分類器
+        learned = train_classifier_from_replies(classifier, all_emails, summaries)
+        save_classifier(classifier, config["ad_model_path"])
+        print(f"🤖 分類器新增 {learned} 筆訓練資料，已儲存到 {config['ad_model_path']}")
+
+        summaries = [annotate_summary(reply, email_item) for reply, email_item in zip(summaries, all_emails)]
+
+    # 輸出 MorningCast 可直接使用的結構化郵件資料
+    if config["morningcast_email_json"] and all_emails:
+        records = build_morningcast_records(all_emails, summaries)
+        write_morningcast_summary(records, config["morningcast_email_json"])
+        print(f"🎙️ 已輸出 {len(records)} 筆 MorningCast 郵件資料到 {config['morningcast_email_json']}")
 
     # 整理並產出 Markdown 報告
     print("📝 開始整合摘要並產出 Markdown 報告...")
-    markdown_text = write_markdown_report(all_emails, summaries, api_key=config.get("gpt_api_key"))
+    markdown_text = write_markdown_report(all_emails, summaries, api_key=config.get("gpt_api_key"), mode=config["report_mode"])
     print("📝 Markdown 內容預覽（前 200 字）：\n", markdown_text[:200])
 
     # 移除 markdown 清單開頭 "- "
@@ -0,0 +1,195 @@
+"""常駐收信模式：整晚監看各信箱，新信一到就摘要並寫入摘要庫。
+
+早上執行 fetch_and_process.py 時若設定了 EMAIL_STORE_PATH，
+就直接讀取摘要庫裡預先算好的結果，不必在關鍵路徑上收信與摘要。
+"""
+import imaplib
+import os
+import signal
+import socket
+import threading
+import time
+
+from openai import OpenAI
+
+from fetch_and_process import load_config
+from utils.ad_classifier import load_classifier, save_classifier
+from utils.dedup import cluster_near_duplicates, pick_representatives
+from utils.email_fetcher import connect, fetch_new_emails
+from utils.gpt_summary import summarize_with_gate, train_classifier_from_replies
+from utils.mail_store import MailStore
+from utils.morningcast_export import build_morningcast_records, write_morningcast_summary
+
+# IMAP IDLE 需在 29 分鐘內重新發送，這裡每 10 分鐘重新整理一次
+IDLE_REFRESH_SECONDS = 600
+
+# 分類器與摘要共用，避免多個帳號執行緒同時更新模型
+_summarize_lock = threading.Lock()
+
+
+class _IdleConnection:
+    """IDLE 需要碰到的 imaplib 內部細節都集中在這裡。
+
+    imaplib 沒有 IDLE 的公開 API：指令標籤只能用私有的 mail._new_tag() 產生；
+    讀取逾時後 socket.makefile() 建立的 mail.file 就不能再讀，必須換成新的。
+    mail.readline() 在連線被關閉時回傳空字串而不是拋例外，這裡改拋
+    imaplib.IMAP4.abort，讓呼叫端走重新連線的流程。
+    """
+
+    def __init__(self, mail):
+        self.mail = mail
+        self.tag = mail._new_tag()
+
+    def send(self, data):
+        self.mail.send(data)
+
+    def readline(self, timeout=None):
+        """讀一行回應；設定 timeout 時逾時回傳 None。"""
+        mail = self.mail
+        previous_timeout = mail.sock.gettimeout()
+        if timeout is not None:
+            mail.sock.settimeout(timeout)
+        try:
+            line = mail.readline()
+        except socket.timeout:
+            # 逾時的 makefile 物件不能再讀，換一個新的（此時沒有讀到半行資料）
+            mail.file = mail.sock.makefile("rb")
+            return None
+        finally:
+            mail.sock.settimeout(previous_timeout)
+        if not line:
+            raise imaplib.IMAP4.abort("IDLE 期間連線被伺服器關閉")
+        return line
+
+
+def idle_wait(mail, timeout):
+    """送出 IMAP IDLE 並等待伺服器通知新信；逾時或收到通知後送 DONE 結束。
+
+    直接以 socket 逾時等待 readline，不對 mail.sock 做 select：
+    通知可能已經被 imaplib 的緩衝讀取器（或 SSL 層）讀進來，select 會看不到。
+    """
+    conn = _IdleConnection(mail)
+    conn.send(conn.tag + b" IDLE\r\n")
+    line = conn.readline()
+    if not line.startswith(b"+"):
+        raise imaplib.IMAP4.error(f"IDLE 被拒絕：{line!r}")
+
+    got_new = False
+    deadline = time.monotonic() + timeout
+    while not got_new:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        line = conn.readline(remaining)
+        if line is None:
+            break
+        got_new = b"EXISTS" in line or b"RECENT" in line
+
+    conn.send(b"DONE\r\n")
+    while True:
+        line = conn.readline()
+        if line.startswith(conn.tag):
+            break
+        got_new = got_new or b"EXISTS" in line
+    return got_new
+
+
+def export_for_morningcast(store, path):
+    """把摘要庫最近一天的內容去重後輸出成 MorningCast 的 email_summary.json。"""
+    emails, replies = store.recent()
+    clusters = cluster_near_duplicates(emails)
+    representatives = pick_representatives(emails, clusters)
+    records = build_morningcast_records(representatives, [replies[c[0]] for c in clusters])
+    write_morningcast_summary(records, path)
+    return len(records)
+
+
+def process_new_mail(mail, account, store, client, classifier, config):
+    username = account["username"]
+    last_uid = store.account_state(username)["last_uid"]
+    emails, max_uid = fetch_new_emails(mail, username, last_uid)
+    if not emails:
+        if max_uid != last_uid:
+            store.add(username, [], [], max_uid)
+        return 0
+
+    print(f"📥 {username} 收到 {len(emails)} 封新郵件，開始摘要...")
+    with _summarize_lock:
+        replies, stats = summarize_with_gate(
+            client, emails, classifier=classifier, threshold=config["ad_threshold"], model="gpt-4o-mini",
+            batch_token_budget=config["batch_token_budget"]
+        )
+        if train_classifier_from_replies(classifier, emails, replies):
+            save_classifier(classifier, config["ad_model_path"])
+    store.add(username, emails, replies, max_uid)
+    print(f"💾 {username} 已寫入摘要庫（LLM 呼叫 {stats['llm_calls']} 次，省下 {stats['llm_calls_avoided']} 次）")
+    if config["morningcast_email_json"]:
+        with _summarize_lock:
+            count = export_for_morningcast(store, config["morningcast_email_json"])
+        print(f"🎙️ 已更新 MorningCast 郵件資料（{count} 筆）")
+    return len(emails)
+
+
+def watch_account(account, store, client, classifier, config, stop_event, poll_seconds):
+    username = account["username"]
+    while not stop_event.is_set():
+        mail = None
+        try:
+            mail = connect(account["imap_server"], username, account["password"])
+            _, uidvalidity = mail.response("UIDVALIDITY")
+            if uidvalidity and uidvalidity[0]:
+                store.set_uidvalidity(username, uidvalidity[0].decode())
+            use_idle = poll_seconds <= 0 and "IDLE" in mail.capabilities
+            print(f"👀 開始監看 {username}（{'IDLE' if use_idle else f'每 {poll_seconds or 60} 秒輪詢'}）")
+
+            while not stop_event.is_set():
+                process_new_mail(mail, account, store, client, classifier, config)
+                if use_idle:
+                    idle_wait(mail, IDLE_REFRESH_SECONDS)
+                else:
+                    stop_event.wait(poll_seconds or 60)
+                    mail.noop()
+        except Exception as e:
+            print(f"❌ {username} 監看中斷：{e}，30 秒後重新連線")
+            stop_event.wait(30)
+        finally:
+            if mail is not None:
+                try:
+                    mail.logout()
+                except Exception:
+                    pass
+
+
+def main():
+    config = load_config()
+    store_path = config["email_store_path"] or "output/email_store.json"
+    poll_seconds = int(os.environ.get("INGEST_POLL_SECONDS", "0"))  # 0 = 使用 IMAP IDLE（伺服器不支援時退回 60 秒輪詢）
+
+    store = MailStore(store_path)
+    client = OpenAI(api_key=config.get("gpt_api_key"))
+    classifier = load_classifier(config["ad_model_path"])
+    stop_event = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: stop_event.set())
+
+    threads = []
+    for account in config.get("email_accounts", []):
+        thread = threading.Thread(
+            target=watch_account,
+            args=(account, store, client, classifier, config, stop_event, poll_seconds),
+            name=f"ingest-{account.get('username')}",
+            daemon=True,
+        )
+        thread.start()
+        threads.append(thread)
+
+    print(f"🌙 常駐收信啟動，共 {len(threads)} 個帳號，摘要庫：{store_path}")
+    try:
+        while any(t.is_alive() for t in threads) and not stop_event.is_set():
+            stop_event.wait(5)
+    except KeyboardInterrupt:
+        stop_event.set()
+    print("🌅 常駐收信結束")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+import json
+import math
+import os
+import re
+import zlib
+from pathlib import Path
+
+
+# 以 GPT 分類結果判斷為「低價值」的關鍵字（中英文皆可）
+LOW_VALUE_CATEGORY_KEYWORDS = [
+    "廣告", "推銷", "宣傳", "促銷", "行銷", "電子報", "優惠",
+    "ad", "ads", "promotion", "promotional", "marketing", "newsletter", "spam",
+]
+
+LOW_VALUE = "low_value"
+KEEP = "keep"
+
+_WORD_RE = re.compile(r"[a-z0-9][a-z0-9._%+-]*")
+_CJK_RE = re.compile(r"[\u3400-\u9fff\uf900-\ufaff]+")
+_EMAIL_RE = re.compile(r"[\w.+-]+@([\w-]+\.[\w.-]+)")
+
+
+def _cjk_bigrams(text):
+    for run in _CJK_RE.findall(text):
+        if len(run) == 1:
+            yield run
+            continue
+        for i in range(len(run) - 1):
+            yield run[i:i + 2]
+
+
+def tokenize_email(email_item, body_chars=1000):
+    """把主旨、寄件者、內文切成帶欄位前綴的 token（英文單字 + 中文雙字詞）。"""
+    subject = (email_item.get("subject") or "").lower()
+    sender = (email_item.get("from") or "").lower()
+    body = (email_item.get("body") or "")[:body_chars].lower()
+
+    tokens = []
+    for prefix, text in (("s", subject), ("b", body)):
+        tokens.extend(f"{prefix}:{w}" for w in _WORD_RE.findall(text))
+        tokens.extend(f"{prefix}:{g}" for g in _cjk_bigrams(text))
+
+    match = _EMAIL_RE.search(sender)
+    if match:
+        tokens.append(f"f:{match.group(0)}")
+        tokens.append(f"fd:{match.group(1)}")
+    tokens.extend(f"f:{w}" for w in _WORD_RE.findall(sender.split("<")[0]))
+    return tokens
+
+
+def is_low_value_reply(parsed):
+    """依 parse_gpt_reply 的結果判斷 GPT 是否認為這封信屬於廣告／低價值郵件。"""
+    if parsed.get("important", "").startswith("是"):
+        return False
+    if parsed.get("promo", "").startswith("是"):
+        return True
+    category = parsed.get("category", "").lower()
+    if not category:
+        return None
+    words = set(re.findall(r"[a-z]+", category))
+    for kw in LOW_VALUE_CATEGORY_KEYWORDS:
+        if kw.isascii():
+            if kw in words:
+                return True
+        elif kw in category:
+            return True
+    return False
+
+
+class HashedNaiveBayes:
+    """以 hashing trick 壓縮特徵的多項式 Naive Bayes，用來判斷郵件是否為廣告／低價值。"""
+
+    def __init__(self, n_features=2 ** 18, alpha=1.0, min_examples_per_class=10):
+        self.n_features = n_features
+        self.alpha = alpha
+        self.min_examples_per_class = min_examples_per_class
+        self.doc_counts = {LOW_VALUE: 0, KEEP: 0}
+        self.token_totals = {LOW_VALUE: 0, KEEP: 0}
+        self.token_counts = {LOW_VALUE: {}, KEEP: {}}
+
+    def _bucket(self, token):
+        return zlib.crc32(token.encode("utf-8")) % self.n_features
+
+    def _features(self, email_item):
+        counts = {}
+        for token in tokenize_email(email_item):
+            bucket = self._bucket(token)
+            counts[bucket] = counts.get(bucket, 0) + 1
+        return counts
+
+    def is_ready(self):
+        return all(count >= self.min_examples_per_class for count in self.doc_counts.values())
+
+    def learn(self, email_item, low_value):
+        label = LOW_VALUE if low_value else KEEP
+        self.doc_counts[label] += 1
+        table = self.token_counts[label]
+        for bucket, count in self._features(email_item).items():
+            table[bucket] = table.get(bucket, 0) + count
+            self.token_totals[label] += count
+
+    def predict_proba(self, email_item):
+        """回傳此郵件屬於低價值郵件的機率；模型尚未訓練時回傳 None。"""
+        if not self.is_ready():
+            return None
+        features = self._features(email_item)
+        total_docs = sum(self.doc_counts.values())
+        vocab = len(set(self.token_counts[LOW_VALUE]) | set(self.token_counts[KEEP])) or 1
+        log_scores = {}
+        for label in (LOW_VALUE, KEEP):
+            table = self.token_counts[label]
+            denom = self.token_totals[label] + self.alpha * vocab
+            score = math.log(self.doc_counts[label] / total_docs)
+            for bucket, count in features.items():
+                score += count * math.log((table.get(bucket, 0) + self.alpha) / denom)
+            log_scores[label] = score
+        diff = log_scores[KEEP] - log_scores[LOW_VALUE]
+        if diff > 700:
+            return 0.0
+        return 1.0 / (1.0 + math.exp(diff))
+
+    def to_dict(self):
+        return {
+            "n_features": self.n_features,
+            "alpha": self.alpha,
+            "min_examples_per_class": self.min_examples_per_class,
+            "doc_counts": self.doc_counts,
+            "token_totals": self.token_totals,
+            "token_counts": {label: {str(k): v for k, v in table.items()} for label, table in self.token_counts.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        model = cls(
+            n_features=data.get("n_features", 2 ** 18),
+            alpha=data.get("alpha", 1.0),
+            min_examples_per_class=data.get("min_examples_per_class", 10),
+        )
+        model.doc_counts.update(data.get("doc_counts", {}))
+        model.token_totals.update(data.get("token_totals", {}))
+        for label, table in data.get("token_counts", {}).items():
+            model.token_counts[label] = {int(k): v for k, v in table.items()}
+        return model
+
+
+def load_classifier(path):
+    if path and Path(path).exists():
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return HashedNaiveBayes.from_dict(json.load(f))
+        except (OSError, ValueError) as e:
+            print(f"⚠️ 讀取廣告分類模型失敗，改用空白模型：{e}")
+    return HashedNaiveBayes()
+
+
+def save_classifier(model, path):
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(model.to_dict(), f)
+    os.replace(tmp_path, path)
@@ -0,0 +1,179 @@
+import html
+import re
+from html.parser import HTMLParser
+
+from .token_utils import estimate_tokens
+
+# 超過這個長度的網址會被收合成 [L1]、[L2] 等參照
+LONG_URL_LENGTH = 40
+
+_URL_RE = re.compile(r"https?://[^\s<>\"')\]]+")
+
+# 回覆鏈開頭：遇到這些行之後的內容都視為引用的舊信
+_QUOTE_HEADER_RES = [
+    re.compile(r"^on .{0,200}wrote:\s*$", re.IGNORECASE),
+    re.compile(r"^-{2,}\s*(original message|forwarded message)\s*-{2,}", re.IGNORECASE),
+    re.compile(r"^-{2,}\s*(原始郵件|原始邮件|轉寄的郵件|转发的邮件)\s*-{2,}"),
+    re.compile(r"^.{0,200}(於|在).{0,200}(寫道|写道)\s*[:：]\s*$"),
+    re.compile(r"^_{10,}\s*$"),
+    re.compile(r"^from:\s.+$", re.IGNORECASE),
+    re.compile(r"^寄件者\s*[:：].+$"),
+]
+
+# 簽名檔開頭
+_SIGNATURE_RES = [
+    re.compile(r"^--\s?$"),
+    re.compile(r"^(sent from my|get outlook for)\b", re.IGNORECASE),
+    re.compile(r"^(寄自我的|从我的).{0,20}$"),
+]
+
+# 信尾常見的退訂說明、版權聲明等樣板行：結尾的短行符合時直接移除
+_FOOTER_LINE_RES = [
+    re.compile(r"unsubscribe|manage (your )?(preferences|subscription)|view (it )?in (your )?browser", re.IGNORECASE),
+    re.compile(r"privacy policy|all rights reserved|©|\(c\) \d{4}", re.IGNORECASE),
+    re.compile(r"取消訂閱|退訂|取消订阅|隱私權政策|隐私政策|版權所有|版权所有|請勿直接回覆|系統自動發送"),
+]
+# 機密／免責聲明的字眼也常出現在正文，只在分隔線之後的信尾區塊才視為樣板
+_FOOTER_RES = _FOOTER_LINE_RES + [
+    re.compile(r"confidential|intended (solely )?for the (named )?(addressee|recipient)|privileged", re.IGNORECASE),
+    re.compile(r"此(電子)?郵件.{0,20}(機密|保密|僅供)|本郵件.{0,20}(機密|保密|僅供)|免責聲明"),
+]
+_FOOTER_DELIMITER_RE = re.compile(r"^\s*[-_=*~]{3,}\s*$")
+# 超過這個長度的行視為正文，不當作樣板行刪除
+FOOTER_LINE_MAX_CHARS = 120
+
+
+class _HTMLTextExtractor(HTMLParser):
+    _BLOCK_TAGS = {"p", "div", "br", "tr", "li", "h1", "h2", "h3", "h4", "h5", "h6", "table", "section", "article", "blockquote"}
+    _SKIP_TAGS = {"script", "style", "head", "title"}
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.parts = []
+        self._skip_depth = 0
+        self._href = None
+
+    def handle_starttag(self, tag, attrs):
+        if tag in self._SKIP_TAGS:
+            self._skip_depth += 1
+        elif tag in self._BLOCK_TAGS:
+            self.parts.append("\n")
+        elif tag == "a":
+            self._href = dict(attrs).get("href")
+
+    def handle_endtag(self, tag):
+        if tag in self._SKIP_TAGS:
+            self._skip_depth = max(0, self._skip_depth - 1)
+        elif tag in self._BLOCK_TAGS:
+            self.parts.append("\n")
+        elif tag == "a":
+            if self._href and self._href.startswith("http"):
+                self.parts.append(f" {self._href} ")
+            self._href = None
+
+    def handle_data(self, data):
+        if not self._skip_depth:
+            self.parts.append(data)
+
+
+def html_to_text(raw_html):
+    """把 HTML 郵件轉成純文字，保留段落換行與超連結網址。"""
+    parser = _HTMLTextExtractor()
+    try:
+        parser.feed(raw_html)
+        parser.close()
+    except Exception:
+        return html.unescape(re.sub(r"<[^>]+>", " ", raw_html))
+    text = "".join(parser.parts)
+    lines = [" ".join(line.split()) for line in text.splitlines()]
+    return "\n".join(line for line in lines if line)
+
+
+def strip_quoted_history(lines):
+    kept = []
+    for line in lines:
+        stripped = line.strip()
+        if any(p.match(stripped) for p in _QUOTE_HEADER_RES) and kept:
+            break
+        if stripped.startswith(">"):
+            continue
+        kept.append(line)
+    return kept
+
+
+def strip_signature(lines):
+    for i, line in enumerate(lines):
+        if i > 0 and any(p.match(line.strip()) for p in _SIGNATURE_RES):
+            return lines[:i]
+    return lines
+
+
+def strip_footers(lines):
+    """移除信尾的樣板文字，正文中提到 confidential、隱私權政策等字眼的句子不受影響。
+
+    先看最後一條分隔線：其後的區塊若含有樣板字句就整段切掉；
+    再由結尾往前移除符合退訂、版權等樣板的短行。第一行一定保留。
+    """
+    delimiters = [i for i, line in enumerate(lines) if i > 0 and _FOOTER_DELIMITER_RE.match(line)]
+    if delimiters:
+        tail = lines[delimiters[-1] + 1:]
+        if any(p.search(line) for line in tail for p in _FOOTER_RES):
+            lines = lines[:delimiters[-1]]
+
+    end = len(lines)
+    while end > 1:
+        line = lines[end - 1].strip()
+        if line and (len(line) > FOOTER_LINE_MAX_CHARS or not any(p.search(line) for p in _FOOTER_LINE_RES)):
+            break
+        end -= 1
+    return lines[:end]
+
+
+def collapse_urls(text):
+    """把過長的網址換成 [L1] 之類的參照，並在文末附上去掉追蹤參數的網址列表。"""
+    references = []
+    seen = {}
+
+    def _replace(match):
+        url = match.group(0).rstrip(".,;:")
+        trailing = match.group(0)[len(url):]
+        if len(url) <= LONG_URL_LENGTH:
+            return match.group(0)
+        short = url.split("?", 1)[0].split("#", 1)[0]
+        if short not in seen:
+            seen[short] = f"[L{len(references) + 1}]"
+            references.append(f"{seen[short]} {short}")
+        return seen[short] + trailing
+
+    collapsed = _URL_RE.sub(_replace, text)
+    if references:
+        collapsed += "\n\n連結：\n" + "\n".join(references)
+    return collapsed
+
+
+def normalize_email_body(text, html_body=None):
+    """清理郵件內文以節省 prompt token。
+
+    純 HTML 郵件先轉成文字，接著移除引用的舊信、簽名檔與樣板頁尾，
+    再把長網址收合成參照。回傳 (清理後內文, stats)。
+    """
+    original = text or html_body or ""
+    if not (text or "").strip() and html_body:
+        text = html_to_text(html_body)
+    text = (text or "").replace("\r\n", "\n").replace("\r", "\n")
+
+    lines = text.split("\n")
+    lines = strip_quoted_history(lines)
+    lines = strip_signature(lines)
+    lines = strip_footers(lines)
+    cleaned = "\n".join(lines).strip()
+    cleaned = re.sub(r"\n{3,}", "\n\n", cleaned)
+    cleaned = collapse_urls(cleaned)
+
+    tokens_before = estimate_tokens(original)
+    tokens_after = estimate_tokens(cleaned)
+    return cleaned, {
+        "tokens_before": tokens_before,
+        "tokens_after": tokens_after,
+        "tokens_saved": max(0, tokens_before - tokens_after),
+    }
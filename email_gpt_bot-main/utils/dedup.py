@@ -0,0 +1,98 @@
+import hashlib
+import re
+
+SIMHASH_BITS = 64
+# 64 bits 切成 4 段，漢明距離 <= 3 的兩個指紋必定至少有一段完全相同（鴿籠原理）
+BANDS = 4
+DEFAULT_MAX_DISTANCE = 3
+
+_DIGITS_RE = re.compile(r"\d+")
+_SPACE_RE = re.compile(r"\s+")
+
+
+def _normalize(text):
+    # 數字統一成 0，讓 CI 編號、訂單編號、日期不同的通知信仍被視為同一類
+    text = _DIGITS_RE.sub("0", (text or "").lower())
+    return _SPACE_RE.sub(" ", text).strip()
+
+
+def _shingles(text, size=3):
+    if len(text) <= size:
+        return [text] if text else []
+    return [text[i:i + size] for i in range(len(text) - size + 1)]
+
+
+def simhash(text):
+    # 先按位元組統計各 hash 值出現次數，再展開成位元權重，避免每個 shingle 都跑 64 次迴圈
+    byte_counts = [[0] * 256 for _ in range(SIMHASH_BITS // 8)]
+    for shingle in set(_shingles(text)):
+        digest = hashlib.blake2b(shingle.encode("utf-8"), digest_size=8).digest()
+        for position, value in enumerate(digest):
+            byte_counts[position][value] += 1
+
+    fingerprint = 0
+    for position, counts in enumerate(byte_counts):
+        total = sum(counts)
+        for bit in range(8):
+            ones = sum(count for value, count in enumerate(counts) if value >> bit & 1)
+            if ones * 2 > total:
+                fingerprint |= 1 << ((7 - position) * 8 + bit)
+    return fingerprint
+
+
+def email_fingerprint(email_item, body_chars=1500):
+    subject = _normalize(email_item.get("subject"))
+    body = _normalize(email_item.get("body"))[:body_chars]
+    return simhash(f"{subject} {body}")
+
+
+def cluster_near_duplicates(email_items, max_distance=DEFAULT_MAX_DISTANCE):
+    """以 SimHash 將幾乎相同的郵件分群，回傳 list of list（郵件索引，依原順序）。"""
+    fingerprints = [email_fingerprint(e) for e in email_items]
+    parent = list(range(len(email_items)))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    band_bits = SIMHASH_BITS // BANDS
+    mask = (1 << band_bits) - 1
+    buckets = {}
+    for i, fp in enumerate(fingerprints):
+        for band in range(BANDS):
+            key = (band, (fp >> (band * band_bits)) & mask)
+            for j in buckets.get(key, []):
+                if find(i) != find(j) and bin(fingerprints[i] ^ fingerprints[j]).count("1") <= max_distance:
+                    root_i, root_j = find(i), find(j)
+                    parent[max(root_i, root_j)] = min(root_i, root_j)
+            buckets.setdefault(key, []).append(i)
+
+    clusters = {}
+    for i in range(len(email_items)):
+        clusters.setdefault(find(i), []).append(i)
+    return list(clusters.values())
+
+
+def pick_representatives(email_items, clusters):
+    """每群取第一封（最新的一封）當代表，並記錄 duplicate_count 與同群其他收件信箱。"""
+    representatives = []
+    for cluster in clusters:
+        rep = dict(email_items[cluster[0]])
+        rep["duplicate_count"] = len(cluster)
+        accounts = []
+        for i in cluster:
+            account = email_items[i].get("recipient_account")
+            if account and account not in accounts:
+                accounts.append(account)
+        rep["duplicate_accounts"] = accounts
+        representatives.append(rep)
+    return representatives
+
+
+def annotate_summary(reply, email_item):
+    count = email_item.get("duplicate_count", 1)
+    if count <= 1:
+        return reply
+    return f"{reply}\n同類郵件：共 {count} 封（收件信箱：{', '.join(email_item.get('duplicate_accounts', []))}）"
@@ -3,9 +3,11 @@ import email
 from email.header import decode_header
 import email.message
 import re
-from typing import List, Dict
+from typing import List, Dict, Tuple
 import datetime
 
+from .body_normalizer import normalize_email_body
+
 
 def clean_text(text):
     return " ".join(text.split()) if text else ""
@@ -20,24 +22,87 @@ def is_probably_ad(msg: email.message.Message) -> bool:
     return any(kw in subject for kw in ad_keywords)
 
 
-def extract_email_text(msg: email.message.Message) -> str:
-    if msg.is_multipart():
-        for part in msg.walk():
-            content_type = part.get_content_type()
-            content_disposition = str(part.get("Content-Disposition"))
-            if content_type == "text/plain" and "attachment" not in content_disposition:
-                return part.get_payload(decode=True).decode(errors="ignore")
+def _decode_part(part: email.message.Message) -> str:
+    payload = part.get_payload(decode=True)
+    if payload is None:
+        return ""
+    charset = part.get_content_charset() or "utf-8"
+    try:
+        return payload.decode(charset, errors="ignore")
+    except LookupError:
+        return payload.decode(errors="ignore")
+
+
+def extract_email_parts(msg: email.message.Message) -> Tuple[str, str]:
+    """回傳 (text/plain 內文, text/html 內文)，找不到的部分為空字串。"""
+    plain, html_body = "", ""
+    for part in msg.walk() if msg.is_multipart() else [msg]:
+        content_type = part.get_content_type()
+        content_disposition = str(part.get("Content-Disposition"))
+        if "attachment" in content_disposition:
+            continue
+        if content_type == "text/plain" and not plain:
+            plain = _decode_part(part)
+        elif content_type == "text/html" and not html_body:
+            html_body = _decode_part(part)
+    return plain, html_body
+
+
+def parse_message(msg: email.message.Message, username: str) -> Dict:
+    sender = msg.get("From")
+    subject, _ = decode_header(msg.get("Subject"))[0]
+    if isinstance(subject, bytes):
+        subject = subject.decode(errors="ignore")
+    date = msg.get("Date")
+    plain, html_body = extract_email_parts(msg)
+    body, body_stats = normalize_email_body(plain, html_body)
+    is_ad = is_probably_ad(msg)
+    return {
+        "from": clean_text(sender),
+        "to": clean_text(msg.get("To")),
+        "subject": clean_text(subject),
+        "date": clean_text(date),
+        "body": clean_text(body),
+        "is_ad": is_ad,
+        "body_tokens_saved": body_stats["tokens_saved"],
+        "message_id": clean_text(msg.get("Message-ID")),
+        "recipient_account": username  # 👈 新增這行
+    }
+
+
+def connect(imap_server: str, username: str, password: str) -> imaplib.IMAP4_SSL:
+    mail = imaplib.IMAP4_SSL(imap_server)
+    mail.login(username, password)
+    mail.select("inbox")
+    return mail
+
+
+def fetch_new_emails(mail: imaplib.IMAP4_SSL, username: str, last_uid: int = 0) -> Tuple[List[Dict], int]:
+    """以 UID 取回 last_uid 之後的新郵件，回傳 (郵件列表, 目前最大 UID)。
+
+    last_uid 為 0 時只抓最近一天的郵件，避免第一次啟動就把整個信箱讀進來。
+    """
+    if last_uid:
+        status, data = mail.uid("search", None, f"UID {last_uid + 1}:*")
     else:
-        return msg.get_payload(decode=True).decode(errors="ignore")
-    return ""
+        date = (datetime.date.today() - datetime.timedelta(days=1.1)).strftime("%d-%b-%Y")
+        status, data = mail.uid("search", None, f'(SINCE "{date}")')
+    # 伺服器在沒有新信時仍可能回傳最後一封的 UID，需過濾
+    uids = [int(uid) for uid in data[0].split() if int(uid) > last_uid]
+
+    results = []
+    for uid in uids:
+        status, msg_data = mail.uid("fetch", str(uid), "(RFC822)")
+        for response_part in msg_data:
+            if isinstance(response_part, tuple):
+                results.append(parse_message(email.message_from_bytes(response_part[1]), username))
+    return results, max(uids, default=last_uid)
 
 
 def fetch_all_emails(imap_server: str, username: str, password: str) -> List[Dict]:
     results = []
     try:
-        mail = imaplib.IMAP4_SSL(imap_server)
-        mail.login(username, password)
-        mail.select("inbox")
+        mail = connect(imap_server, username, password)
 
         # 搜尋所有最近一週的郵件
         date = (datetime.date.today() - datetime.timedelta(days=1.1)).strftime("%d-%b-%Y")
@@ -48,23 +113,7 @@ def fetch_all_emails(imap_server: str, username: str, password: str) -> List[Dic
             status, msg_data = mail.fetch(eid, "(RFC822)")
             for response_part in msg_data:
                 if isinstance(response_part, tuple):
-                    msg = email.message_from_bytes(response_part[1])
-                    sender = msg.get("From")
-                    subject, _ = decode_header(msg.get("Subject"))[0]
-                    if isinstance(subject, bytes):
-                        subject = subject.decode(errors="ignore")
-                    date = msg.get("Date")
-                    body = extract_email_text(msg)
-                    is_ad = is_probably_ad(msg)
-                    results.append({
-                        "from": clean_text(sender),
-                        "to": clean_text(msg.get("To")),
-                        "subject": clean_text(subject),
-                        "date": clean_text(date),
-                        "body": clean_text(body),
-                        "is_ad": is_ad,
-                        "recipient_account": username  # 👈 新增這行
-                    })
+                    results.append(parse_message(email.message_from_bytes(response_part[1]), username))
         mail.logout()
     except Exception as e:
         print(f"❌ 錯誤：{e}")
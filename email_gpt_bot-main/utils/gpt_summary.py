@@ -1,3 +1,24 @@
+import json
+import re
+
+from .token_utils import estimate_tokens
+
+SYSTEM_PROMPT = "你是一位善於閱讀電子郵件並生成摘要與分類的助理。"
+
+BATCH_INSTRUCTIONS = (
+    "請幫我閱讀以下多封電子郵件，逐封完成分析，並只輸出一個 JSON array（不要加任何說明或 code fence）。\n"
+    "array 中每個元素對應一封郵件，格式如下：\n"
+    '{"index": 郵件編號(整數), "summary": "郵件詳情摘要", "important": true/false, '
+    '"need_reply": true/false, "category": "分類（例如：工作、個人、廣告等）", "links": ["相關鏈結"], '
+    '"spoken": "一句適合早晨電台直接唸出的口語短句（30 字以內）"}\n'
+    "請確保每封郵件都有一個對應元素，且 index 與郵件編號一致。"
+)
+
+BATCH_ITEM_KEYS = ("summary", "important", "need_reply", "category", "links")
+
+FAILED_REPLY = "摘要：失敗\n是否重要：未知\n是否需要回覆：未知\n分類：未知"
+
+
 def build_prompt(email_item):
     body = email_item["body"]
     if email_item["is_ad"]:
@@ -9,7 +30,8 @@ def build_prompt(email_item):
            f"3. 是否需要回覆？（是/否）\n" \
            f"4. 是否為推銷或宣傳性質？（是/否）\n" \
            f"5. 分類（例如：工作、個人、廣告等）\n" \
-           f"6. 相關鏈結：\n\n" \
+           f"6. 相關鏈結：\n" \
+           f"7. 口語播報：（一句適合早晨電台直接唸出的口語短句，30 字以內，單獨一行以「口語播報：」開頭）\n\n" \
            f"\n---\nFrom: {email_item['from']}\nTo: {email_item['recipient_account']}\nSubject: {email_item['subject']}\nDate: {email_item['date']}\n\n{body[:2000]}\n---"
 
 
@@ -20,7 +42,7 @@ def gpt_summarize_email(client, email_item, model="gpt-4o-mini"):
         response = client.chat.completions.create(
             model=model,
             messages=[
-                {"role": "system", "content": "你是一位善於閱讀電子郵件並生成摘要與分類的助理。"},
+                {"role": "system", "content": SYSTEM_PROMPT},
                 {"role": "user", "content": prompt}
             ],
             temperature=0.4,
@@ -31,4 +53,185 @@ def gpt_summarize_email(client, email_item, model="gpt-4o-mini"):
 
     except Exception as e:
         print(f"GPT API 錯誤：{e}")
-        return "摘要：失敗\n是否重要：未知\n是否需要回覆：未知\n分類：未知"
+        return FAILED_REPLY
+
+
+def is_failed_reply(parsed):
+    """GPT 呼叫失敗時的替代回覆（摘要：失敗…／分類：未知）不是真正的判斷，不能拿來學習。"""
+    return parsed.get("summary", "").startswith("失敗") or parsed.get("category", "") == "未知"
+
+
+def format_email_block(email_item, index):
+    return f"=== 郵件 {index} ===\nFrom: {email_item['from']}\nTo: {email_item['recipient_account']}\n" \
+           f"Subject: {email_item['subject']}\nDate: {email_item['date']}\n\n{email_item['body'][:2000]}\n"
+
+
+def pack_batches(email_items, token_budget):
+    """依 token 預算把郵件切成多個批次；單封超過預算的郵件自成一批。"""
+    overhead = estimate_tokens(SYSTEM_PROMPT) + estimate_tokens(BATCH_INSTRUCTIONS)
+    batches = []
+    current, used = [], overhead
+    for email_item in email_items:
+        cost = estimate_tokens(format_email_block(email_item, 0))
+        if current and used + cost > token_budget:
+            batches.append(current)
+            current, used = [], overhead
+        current.append(email_item)
+        used += cost
+    if current:
+        batches.append(current)
+    return batches
+
+
+def build_batch_prompt(email_items):
+    blocks = [format_email_block(email_item, i) for i, email_item in enumerate(email_items, start=1)]
+    return BATCH_INSTRUCTIONS + "\n\n" + "\n".join(blocks)
+
+
+def format_summary_reply(result):
+    """把批次模式的 JSON 結果轉成與單封模式相同的文字格式，方便後續 parse_gpt_reply。"""
+    yes_no = lambda value: "是" if value else "否"
+    lines = [
+        f"摘要：{result['summary']}",
+        f"是否重要：{yes_no(result['important'])}",
+        f"是否需要回覆：{yes_no(result['need_reply'])}",
+        f"分類：{result['category']}",
+    ]
+    if result["links"]:
+        lines.append("相關鏈結：" + " ".join(result["links"]))
+    if result.get("spoken"):
+        lines.append(f"口語播報：{result['spoken']}")
+    return "\n".join(lines)
+
+
+def _is_valid_batch_item(item):
+    if not isinstance(item, dict) or not all(k in item for k in BATCH_ITEM_KEYS):
+        return False
+    return (
+        isinstance(item["summary"], str)
+        and isinstance(item["important"], bool)
+        and isinstance(item["need_reply"], bool)
+        and isinstance(item["category"], str)
+        and isinstance(item["links"], list)
+        and isinstance(item.get("spoken", ""), str)
+    )
+
+
+def parse_batch_reply(text, count):
+    """解析批次回覆，回傳長度為 count 的 list；無法對應或格式錯誤的郵件為 None。"""
+    results = [None] * count
+    text = (text or "").strip()
+    text = re.sub(r"^```[a-zA-Z]*\s*|\s*```$", "", text)
+    try:
+        data = json.loads(text)
+    except json.JSONDecodeError:
+        return results
+    if not isinstance(data, list):
+        return results
+    for position, item in enumerate(data):
+        if not _is_valid_batch_item(item):
+            continue
+        index = item.get("index", position + 1)
+        if isinstance(index, int) and 1 <= index <= count and results[index - 1] is None:
+            results[index - 1] = item
+    return results
+
+
+def gpt_summarize_batch(client, email_items, model="gpt-4o-mini", max_tokens_per_email=300):
+    """一次請求摘要多封郵件；回傳與 email_items 對應的回覆文字，失敗的項目為 None。"""
+    try:
+        response = client.chat.completions.create(
+            model=model,
+            messages=[
+                {"role": "system", "content": SYSTEM_PROMPT},
+                {"role": "user", "content": build_batch_prompt(email_items)}
+            ],
+            temperature=0.4,
+            max_tokens=min(16000, max_tokens_per_email * len(email_items))
+        )
+        content = response.choices[0].message.content
+    except Exception as e:
+        print(f"GPT API 錯誤（批次）：{e}")
+        return [None] * len(email_items)
+
+    return [format_summary_reply(r) if r else None for r in parse_batch_reply(content, len(email_items))]
+
+
+def local_ad_reply():
+    """不呼叫 GPT，直接回傳與廣告信相同格式的摘要結果。"""
+    return "摘要：略過\n是否重要：否\n是否需要回覆：否\n分類：廣告"
+
+
+def summarize_with_gate(client, email_items, classifier=None, threshold=0.9, model="gpt-4o-mini", batch_token_budget=0):
+    """先用關鍵字與本地分類器過濾廣告信，只有剩下的郵件才送給 GPT 摘要。
+
+    batch_token_budget > 0 時改用批次模式，把多封郵件塞進同一個請求。
+    回傳 (replies, stats)，replies 與 email_items 一一對應；
+    stats 記錄各種略過方式省下的 LLM 呼叫次數。
+    """
+    replies = [None] * len(email_items)
+    stats = {"total": len(email_items), "keyword_skipped": 0, "classifier_skipped": 0, "llm_calls": 0, "batch_fallbacks": 0}
+    pending = []
+
+    for i, email_item in enumerate(email_items):
+        if email_item.get("is_ad"):
+            replies[i] = local_ad_reply()
+            stats["keyword_skipped"] += 1
+            continue
+        if classifier is not None:
+            prob = classifier.predict_proba(email_item)
+            email_item["ad_probability"] = prob
+            if prob is not None and prob >= threshold:
+                print(f"  - 🤖 分類器判定為廣告（{prob:.2f}），略過：{email_item.get('subject')}")
+                replies[i] = local_ad_reply()
+                stats["classifier_skipped"] += 1
+                continue
+        pending.append(i)
+
+    if batch_token_budget > 0 and len(pending) > 1:
+        batches = pack_batches([email_items[i] for i in pending], batch_token_budget)
+        cursor = 0
+        for batch in batches:
+            indices = pending[cursor:cursor + len(batch)]
+            cursor += len(batch)
+            print(f"  - 📦 批次摘要 {len(batch)} 封郵件")
+            stats["llm_calls"] += 1
+            for i, reply in zip(indices, gpt_summarize_batch(client, batch, model=model)):
+                replies[i] = reply
+        failed = [i for i in pending if replies[i] is None]
+        if failed:
+            print(f"  - ⚠️ 批次結果有 {len(failed)} 封無法解析，改用單封模式")
+        stats["batch_fallbacks"] = len(failed)
+        pending = failed
+
+    for i in pending:
+        email_item = email_items[i]
+        print(f"  - 處理第 {i + 1} 封郵件，主旨：{email_item.get('subject')}")
+        replies[i] = gpt_summarize_email(client, email_item, model=model)
+        stats["llm_calls"] += 1
+        print("--- GPT 回覆 ---")
+        print(replies[i])
+        print("---------------")
+
+    stats["llm_calls_avoided"] = stats["keyword_skipped"] + stats["classifier_skipped"]
+    return replies, stats
+
+
+def train_classifier_from_replies(classifier, email_items, replies):
+    """用 GPT 實際回傳的分類結果更新本地分類器（只學習真的送進 GPT 且成功回覆的郵件）。"""
+    from .ad_classifier import is_low_value_reply
+    from .report_writer import parse_gpt_reply
+
+    learned = 0
+    for email_item, reply in zip(email_items, replies):
+        if email_item.get("is_ad") or reply == local_ad_reply():
+            continue
+        parsed = parse_gpt_reply(reply)
+        if is_failed_reply(parsed):
+            continue
+        label = is_low_value_reply(parsed)
+        if label is None:
+            continue
+        classifier.learn(email_item, label)
+        learned += 1
+    return learned
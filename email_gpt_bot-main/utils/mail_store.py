@@ -0,0 +1,72 @@
+import json
+import os
+import threading
+from datetime import datetime, timedelta
+from pathlib import Path
+
+
+class MailStore:
+    """常駐收信模式使用的本地摘要庫（JSON 檔）。
+
+    記錄每個帳號處理到的 UID，以及每封郵件與其 GPT 摘要；
+    每次寫入都先寫暫存檔再 os.replace，早上的批次讀取時不會讀到寫一半的檔案。
+    """
+
+    def __init__(self, path, retention_days=3):
+        self.path = Path(path)
+        self.retention_days = retention_days
+        self._lock = threading.Lock()
+        self.data = {"updated_at": None, "accounts": {}, "emails": []}
+        if self.path.exists():
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    self.data.update(json.load(f))
+            except (OSError, ValueError) as e:
+                print(f"⚠️ 讀取摘要庫失敗，從空白開始：{e}")
+
+    def account_state(self, username):
+        return self.data["accounts"].setdefault(username, {"last_uid": 0, "uidvalidity": None})
+
+    def known_ids(self):
+        return {entry["email"].get("message_id") for entry in self.data["emails"] if entry["email"].get("message_id")}
+
+    def add(self, username, email_items, replies, last_uid):
+        with self._lock:
+            known = self.known_ids()
+            now = datetime.now().isoformat(timespec="seconds")
+            for email_item, reply in zip(email_items, replies):
+                message_id = email_item.get("message_id")
+                if message_id and message_id in known:
+                    continue
+                self.data["emails"].append({"email": email_item, "reply": reply, "received_at": now})
+            self.account_state(username)["last_uid"] = last_uid
+            self._prune()
+            self._save()
+
+    def set_uidvalidity(self, username, uidvalidity):
+        """UIDVALIDITY 變了代表伺服器重新編號，需從頭同步。"""
+        with self._lock:
+            state = self.account_state(username)
+            if state["uidvalidity"] != uidvalidity:
+                state["uidvalidity"] = uidvalidity
+                state["last_uid"] = 0
+                self._save()
+
+    def recent(self, days=1.1):
+        """回傳最近 days 天內收進摘要庫的 (emails, replies)，由新到舊。"""
+        cutoff = datetime.now() - timedelta(days=days)
+        entries = [e for e in self.data["emails"] if datetime.fromisoformat(e["received_at"]) >= cutoff]
+        entries.reverse()
+        return [e["email"] for e in entries], [e["reply"] for e in entries]
+
+    def _prune(self):
+        cutoff = datetime.now() - timedelta(days=self.retention_days)
+        self.data["emails"] = [e for e in self.data["emails"] if datetime.fromisoformat(e["received_at"]) >= cutoff]
+
+    def _save(self):
+        self.data["updated_at"] = datetime.now().isoformat(timespec="seconds")
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.data, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.path)
@@ -0,0 +1,47 @@
+import json
+import os
+from pathlib import Path
+
+from .ad_classifier import is_low_value_reply
+from .report_writer import parse_gpt_reply
+
+
+def _yes(value):
+    return value.strip().startswith("是") or value.strip().lower().startswith("yes")
+
+
+def build_morningcast_records(email_items, replies):
+    """把郵件與 GPT 摘要轉成 MorningCast load_email_summary 直接可用的結構化資料。
+
+    廣告與低價值郵件不會上節目，直接略過；有口語播報句的項目會帶上 spoken_line，
+    MorningCast 的 LLM-A 就不必再改寫一次。
+    """
+    records = []
+    for email_item, reply in zip(email_items, replies):
+        parsed = parse_gpt_reply(reply or "")
+        if email_item.get("is_ad") or is_low_value_reply(parsed):
+            continue
+        record = {
+            "category": parsed["category"] or "email",
+            "title": email_item.get("subject", ""),
+            "important": _yes(parsed["important"]),
+            "need_reply": _yes(parsed["need_reply"]),
+            "summary": parsed["summary"],
+            "spoken_line": parsed["spoken"],
+            "account": email_item.get("recipient_account", ""),
+            "duplicate_count": email_item.get("duplicate_count", 1),
+            "source": "email_gpt_bot",
+        }
+        records.append(record)
+    # 需要回覆、重要的排前面，方便節目規劃
+    records.sort(key=lambda r: (not r["need_reply"], not r["important"]))
+    return records
+
+
+def write_morningcast_summary(records, path):
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(records, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, path)
+    return path
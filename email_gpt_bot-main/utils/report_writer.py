@@ -1,43 +1,218 @@
 import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 from openai import OpenAI
 
+# 摘要數量超過這個值時，auto 模式改用分區平行整理（map-reduce）
+HIERARCHICAL_THRESHOLD = 20
+
+REPORT_MODEL = "gpt-4o-2024-08-06"
+
+# (key, 標題, 說明)：分區整理時每個區塊獨立送一次 GPT
+REPORT_SECTIONS = [
+    ("reply", "## 📩 需要回覆的郵件", "包含助教、會議、合作提案等必須回覆的訊息。"),
+    ("priority", "## ✉️ 優先通知", "涉及學業、考試、校務、報名等重要事務的郵件，或有明確提醒必須注意的事項。"),
+    ("promo", "## 📢 推廣與演講資訊", "與研討會、活動邀請或講座通知相關的郵件，但無需立即回覆。"),
+    ("other", "## 🗂 其他通知", "包括系統通知、帳戶提醒、消息公告等其他資訊，請依照重要程度排序。"),
+]
+
+PROMO_CATEGORY_KEYWORDS = ["演講", "講座", "研討", "活動", "推廣", "宣傳", "廣告", "推銷", "電子報", "seminar", "event", "newsletter"]
+
+SECTION_SYSTEM_PROMPT = (
+    "你是一位專業郵件助理，負責整理每日郵件報告中的「{title}」區塊（{description}）。\n"
+    "請根據提供的信件摘要，只輸出這個區塊的條目（不要輸出區塊標題、導言或結語），依重要性排序，重複主題請合併重點。\n"
+    "每封郵件的格式統一為：\n"
+    "- **主旨：** xxx  \n"
+    "  **📬 收件信箱：** xxx@xxx.com  \n"
+    "  **濃縮摘要：** （簡明扼要，建議不超過 30 字）\n"
+    "  **相關鏈結：** (若有再提供)\n"
+    "若摘要標示「同類郵件：共 N 封」，請在該條目後註明（共 N 封）。"
+)
+
+MERGE_SYSTEM_PROMPT = (
+    "你是一位專業郵件助理，以屬下身份向 Patrick 呈報今日郵件，風格類似一份公司內部精美電子報。\n"
+    "以下是已整理好的各區塊重點。請先輸出「## 今日摘要」與一段約 100 字的導言（可加入問候語如「親愛的 Patrick」，"
+    "語氣正式但不失溫度，概述今日來信趨勢與重點任務，強調重要通知與需要回覆的郵件，適度使用粗體）。\n"
+    "接著單獨輸出一行 {marker}，再寫一段簡短結語（謝謝閱讀，並提醒關注後續重點更新）。不要重複各區塊的條目。"
+)
+
+CLOSING_MARKER = "<<<CLOSING>>>"
+
 
 
 def parse_gpt_reply(text):
-    result = {"summary": "", "important": "", "need_reply": "", "category": ""}
+    result = {"summary": "", "important": "", "need_reply": "", "category": "", "promo": "", "spoken": ""}
     lines = text.strip().split("\n")
     for line in lines:
+        line = line.replace("：", ":", 1) if "：" in line.split(":", 1)[0] else line  # GPT 常用全形冒號
         if ":" in line:
             key, val = line.split(":", 1)
             key = key.strip().lower()
             val = val.strip()
 
-            if any(k in key for k in ["摘要", "summary"]):
+            if any(k in key for k in ["口語", "spoken"]):
+                result["spoken"] = val
+            elif any(k in key for k in ["摘要", "summary"]):
                 result["summary"] = val
             elif any(k in key for k in ["重要", "importance"]):
                 result["important"] = val
             elif any(k in key for k in ["回覆", "reply"]):
                 result["need_reply"] = val
+            elif any(k in key for k in ["推銷", "宣傳", "promotion"]):
+                result["promo"] = val
             elif any(k in key for k in ["分類", "category"]):
                 result["category"] = val
     return result
 
 
-def write_markdown_report(emails, summaries, output_dir="output", api_key=None):
+def assign_section(summary_text):
+    parsed = parse_gpt_reply(summary_text)
+    if parsed["need_reply"].startswith("是"):
+        return "reply"
+    if parsed["important"].startswith("是"):
+        return "priority"
+    category = parsed["category"].lower()
+    if parsed["promo"].startswith("是") or any(kw in category for kw in PROMO_CATEGORY_KEYWORDS):
+        return "promo"
+    return "other"
+
+
+def _with_headers(emails, summaries):
+    """在每則摘要前補上主旨與收件信箱，讓分區整理時不必再從摘要裡猜。"""
+    if len(emails) != len(summaries):
+        return list(summaries)
+    return [
+        f"主旨：{e.get('subject', '')}\n收件信箱：{e.get('recipient_account', '')}\n{s}"
+        for e, s in zip(emails, summaries)
+    ]
+
+
+def _summarize_section(client, section, items):
+    _, title, description = section
+    response = client.chat.completions.create(
+        model=REPORT_MODEL,
+        messages=[
+            {"role": "system", "content": SECTION_SYSTEM_PROMPT.format(title=title.lstrip("# "), description=description)},
+            {"role": "user", "content": "\n\n".join(items)},
+        ],
+        temperature=0.4,
+        max_tokens=min(4000, 150 * len(items) + 200),
+    )
+    return response.choices[0].message.content.strip()
+
+
+def _stream_merge(client, section_outputs, f):
+    """串流產生導言並邊收邊寫入檔案；結語先暫存，等各區塊寫完再補上。"""
+    digest = []
+    for (_, title, _), body in section_outputs:
+        subjects = [line.strip() for line in body.splitlines() if "主旨" in line]
+        digest.append(f"{title}（{len(subjects)} 則）\n" + "\n".join(subjects))
+
+    stream = client.chat.completions.create(
+        model=REPORT_MODEL,
+        messages=[
+            {"role": "system", "content": MERGE_SYSTEM_PROMPT.format(marker=CLOSING_MARKER)},
+            {"role": "user", "content": "\n\n".join(digest)},
+        ],
+        temperature=0.4,
+        max_tokens=600,
+        stream=True,
+    )
+    intro, closing, pending = [], [], ""
+    in_closing = False
+    for chunk in stream:
+        if not chunk.choices:
+            continue
+        delta = chunk.choices[0].delta.content or ""
+        if in_closing:
+            closing.append(delta)
+            continue
+        pending += delta
+        if CLOSING_MARKER in pending:
+            head, tail = pending.split(CLOSING_MARKER, 1)
+            intro.append(head)
+            f.write(head)
+            closing.append(tail)
+            in_closing = True
+            pending = ""
+            continue
+        # 保留可能是標記開頭的尾巴，其餘直接寫入檔案
+        safe = len(pending) - len(CLOSING_MARKER) + 1
+        if safe > 0:
+            intro.append(pending[:safe])
+            f.write(pending[:safe])
+            f.flush()
+            pending = pending[safe:]
+    if pending:
+        intro.append(pending)
+        f.write(pending)
+    return "".join(intro).strip(), "".join(closing).strip()
+
+
+def write_hierarchical_report(emails, summaries, md_path, client, max_workers=4):
+    """分區 map-reduce：各區塊平行整理，再用一次小型合併請求寫導言與結語，並邊產生邊寫入 .md。"""
+    items_by_section = {key: [] for key, _, _ in REPORT_SECTIONS}
+    for item in _with_headers(emails, summaries):
+        items_by_section[assign_section(item)].append(item)
+    print("🧾 分區筆數：", {key: len(items) for key, items in items_by_section.items()})
+
+    active = [section for section in REPORT_SECTIONS if items_by_section[section[0]]]
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(active)))) as pool:
+        futures = [(section, pool.submit(_summarize_section, client, section, items_by_section[section[0]])) for section in active]
+        section_outputs = []
+        for section, future in futures:
+            try:
+                section_outputs.append((section, future.result()))
+            except Exception as e:
+                print(f"❌ 區塊 {section[1]} 整理失敗：{e}")
+                section_outputs.append((section, "\n\n".join(items_by_section[section[0]])))
+
+    parts = ["# 📬 今日郵件摘要\n\n"]
+    with open(md_path, "w", encoding="utf-8") as f:
+        f.write(parts[0])
+        f.flush()
+        try:
+            intro, closing = _stream_merge(client, section_outputs, f)
+        except Exception as e:
+            print(f"❌ 導言合併失敗：{e}")
+            intro, closing = "", ""
+        parts.append(intro)
+        for (_, title, _), body in section_outputs:
+            block = f"\n\n{title}\n{body}"
+            f.write(block)
+            f.flush()
+            parts.append(block)
+        if closing:
+            block = f"\n\n---\n{closing}\n"
+            f.write(block)
+            parts.append(block)
+
+    return "".join(parts)
+
+
+def write_markdown_report(emails, summaries, output_dir="output", api_key=None, mode="auto", max_workers=4):
+    """產生 Markdown 報告。
+
+    mode 為 "single" 時整包送一次 GPT；"hierarchical" 時分區平行整理後再合併；
+    "auto" 會在摘要數量超過 HIERARCHICAL_THRESHOLD 時改用分區模式。
+    """
     today = datetime.today().strftime("%Y-%m-%d")
     Path(output_dir).mkdir(parents=True, exist_ok=True)
     md_path = os.path.join(output_dir, f"{today}.md")
 
     client = OpenAI(api_key=api_key)
+    if mode == "hierarchical" or (mode == "auto" and len(summaries) > HIERARCHICAL_THRESHOLD):
+        print(f"🧾 使用分區整理模式（{len(summaries)} 則摘要）")
+        return write_hierarchical_report(emails, summaries, md_path, client, max_workers=max_workers)
+
     print("🧾 summaries length:", len(summaries))
     print("🧾 First item of summaries:", summaries[0] if summaries else "空")
     print("🧾 Sending to GPT:\n", "\n\n".join(summaries)[:1000])  # 顯示前 1000 字
 
     try:
         final_response = client.chat.completions.create(
-            model="gpt-4o-2024-08-06",
+            model=REPORT_MODEL,
             messages=[
                 {
                     "role": "system",
@@ -82,7 +257,8 @@ def write_markdown_report(emails, summaries, output_dir="output", api_key=None):
                 },
                 {
                     "role": "user",
-                    "content": "以下是今天收到的信件摘要，每封信可能包含：主旨、來源信箱、摘要、是否需要回覆、是否為推銷、是否包含重要資訊、自由分類：\n\n" + "\n\n".join(summaries)
+                    "content": "以下是今天收到的信件摘要，每封信可能包含：主旨、來源信箱、摘要、是否需要回覆、是否為推銷、是否包含重要資訊、自由分類"
+                               "；內容幾乎相同的郵件已合併為一則，並以「同類郵件：共 N 封」標示，請在該項目後註明（共 N 封）：\n\n" + "\n\n".join(summaries)
                 }
             ],
             temperature=0.4,
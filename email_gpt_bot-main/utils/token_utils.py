@@ -0,0 +1,11 @@
+import re
+
+_CJK_RE = re.compile(r"[\u3000-\u303f\u3400-\u9fff\uf900-\ufaff\uff00-\uffef]")
+
+
+def estimate_tokens(text):
+    """粗估 token 數：中日韓字元約 1 字 1 token，其餘約 4 個字元 1 token。"""
+    if not text:
+        return 0
+    cjk = len(_CJK_RE.findall(text))
+    return cjk + (len(text) - cjk + 3) // 4
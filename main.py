@@ -28,6 +28,26 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument("--model-refiner", default=None, help="Override model for LLM-A")
     parser.add_argument("--model-planner", default=None, help="Override model for LLM-B")
     parser.add_argument("--model-script", default=None, help="Override model for LLM-C")
+    parser.add_argument("--llm-concurrency", type=int, default=4, help="Maximum concurrent LLM requests")
+    parser.add_argument("--llm-timeout", type=float, default=60.0, help="Per-call LLM timeout in seconds")
+    parser.add_argument("--llm-cache", type=Path, default=None, help="Directory for the opt-in LLM response cache")
+    parser.add_argument("--llm-cache-ttl", type=float, default=72.0, help="LLM cache entry lifetime in hours")
+    parser.add_argument("--llm-cache-bypass", default="", help="Comma-separated stages that skip the cache (refiner,planner,script)")
+    parser.add_argument("--stream-script", action="store_true", help="Stream LLM-C and start TTS per paragraph while the script is generated")
+    parser.add_argument("--planner-token-budget", type=int, default=None, help="Prompt token budget for LLM-B (default 6000, 0 = no trimming)")
+    parser.add_argument("--script-token-budget", type=int, default=None, help="Prompt token budget for LLM-C (default 6000, 0 = no trimming)")
+    parser.add_argument("--refiner-batch-tokens", type=int, default=3000, help="Token budget per batched LLM-A request (0 = one request per item)")
+    parser.add_argument("--tts-chunk-chars", type=int, default=0, help="Split the script into chunks of about this many characters and synthesise them in parallel (0 = one call)")
+    parser.add_argument("--tts-workers", type=int, default=4, help="Maximum concurrent TTS chunk requests")
+    parser.add_argument("--tts-cache", type=Path, default=None, help="Directory for the sentence-level TTS audio cache; implies per-sentence chunked synthesis regardless of --tts-chunk-chars")
+    parser.add_argument("--tts-health", type=Path, default=None, help="TTS engine health state file (default: <output>/tts_health.json)")
+    parser.add_argument("--tts-hedge", action="store_true", help="Send a duplicate TTS request when a chunk runs past its engine's p90 latency")
+    parser.add_argument("--duration-model", type=Path, default=None, help="Voice duration model state file (default: <output>/duration_model.json)")
+    parser.add_argument("--incremental", action="store_true", help="Regenerate and re-synthesise only the plan segments whose inputs changed since the last run")
+    fixtures = parser.add_mutually_exclusive_group()
+    fixtures.add_argument("--record-fixtures", type=Path, default=None, help="Record LLM, weather, calendar and TTS results to this directory")
+    fixtures.add_argument("--replay-fixtures", type=Path, default=None, help="Run offline from fixtures recorded with --record-fixtures")
+    parser.add_argument("--replay-latency", type=float, default=0.0, help="Replay recorded latencies scaled by this factor (0 = instant)")
     return parser.parse_args()
 
 
@@ -48,6 +68,11 @@ def main() -> None:
         models["planner"] = args.model_planner
     if args.model_script:
         models["script"] = args.model_script
+    budgets = {}
+    if args.planner_token_budget is not None:
+        budgets["planner"] = args.planner_token_budget
+    if args.script_token_budget is not None:
+        budgets["script"] = args.script_token_budget
     pipeline = MorningCastPipeline(
         PipelineConfig(
             date=production_date,
@@ -62,6 +87,24 @@ def main() -> None:
             output_dir=args.output,
             llm_api_key=args.llm_key,
             llm_models=models or None,
+            prompt_token_budgets=budgets or None,
+            refiner_batch_tokens=args.refiner_batch_tokens,
+            llm_concurrency=args.llm_concurrency,
+            llm_timeout=args.llm_timeout,
+            llm_cache_dir=args.llm_cache,
+            llm_cache_ttl_hours=args.llm_cache_ttl,
+            stream_script=args.stream_script,
+            llm_cache_bypass=tuple(stage.strip() for stage in args.llm_cache_bypass.split(",") if stage.strip()),
+            fixture_dir=args.replay_fixtures or args.record_fixtures,
+            fixture_mode="replay" if args.replay_fixtures else "record",
+            fixture_latency=args.replay_latency,
+            tts_chunk_chars=args.tts_chunk_chars,
+            tts_workers=args.tts_workers,
+            tts_cache_dir=args.tts_cache,
+            tts_health_path=args.tts_health,
+            tts_hedge=args.tts_hedge,
+            duration_model_path=args.duration_model,
+            incremental=args.incremental,
         )
     )
     pipeline.run()
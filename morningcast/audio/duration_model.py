@@ -0,0 +1,131 @@
+"""Predict spoken length from the script, calibrated against past voice tracks."""
+from __future__ import annotations
+
+import json
+import os
+import re
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from ..utils.logging import get_logger
+from ..utils.segmenter import AUTO, paragraphs
+
+logger = get_logger(__name__)
+
+# Uncalibrated speaking rates: Mandarin newsreaders run ~4.5 characters/s, English ~2.6 words/s.
+CJK_CHARS_PER_SECOND = 4.5
+WORDS_PER_SECOND = 2.6
+# Pauses an engine (or the chunk stitcher) leaves between sentences and paragraphs.
+SENTENCE_GAP = 0.3
+PARAGRAPH_GAP = 0.6
+
+_CJK = re.compile(r"[\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff]")
+_WORD = re.compile(r"[A-Za-z0-9]+(?:['’][A-Za-z]+)?")
+_BREAK = re.compile(r"<break\b([^>]*)>", re.IGNORECASE)
+_BREAK_TIME = re.compile(r"time\s*=\s*[\"']?\s*([\d.]+)\s*(ms|s)", re.IGNORECASE)
+_BREAK_STRENGTH = re.compile(r"strength\s*=\s*[\"']?([\w-]+)", re.IGNORECASE)
+_STRENGTH_SECONDS = {"none": 0.0, "x-weak": 0.1, "weak": 0.25, "medium": 0.5, "strong": 0.75, "x-strong": 1.0}
+
+
+@dataclass(slots=True)
+class DurationEstimate:
+    seconds: float
+    speech_seconds: float
+    pause_seconds: float
+    cjk_chars: int
+    words: int
+
+
+def _break_seconds(attributes: str) -> float:
+    match = _BREAK_TIME.search(attributes)
+    if match:
+        value = float(match.group(1))
+        return value / 1000 if match.group(2).lower() == "ms" else value
+    match = _BREAK_STRENGTH.search(attributes)
+    return _STRENGTH_SECONDS.get(match.group(1).lower(), 0.5) if match else 0.5
+
+
+class DurationModel:
+    """Per engine/voice speaking-rate scale learnt from actual voice durations.
+
+    The estimate is ``speech * scale + pauses``, where speech comes from fixed
+    CJK-character and word rates and pauses from ``<break>`` tags plus sentence
+    and paragraph gaps. After each run :meth:`observe` nudges the voice's
+    ``scale`` toward what the real track implied (an EMA), so estimates track
+    the engine without hand-tuned rates. State is a small JSON file.
+    """
+
+    def __init__(self, path: Path, *, alpha: float = 0.3):
+        self.path = Path(path)
+        self.alpha = alpha
+        self._lock = threading.Lock()
+        self._state: Dict[str, Dict[str, Any]] = {}
+        if self.path.exists():
+            try:
+                self._state = json.loads(self.path.read_text(encoding="utf-8"))
+            except (OSError, json.JSONDecodeError) as exc:
+                logger.warning("Ignoring unreadable duration model %s: %s", self.path, exc)
+
+    def _entry(self, voice: str) -> Dict[str, Any]:
+        return self._state.setdefault(voice, {"scale": 1.0, "samples": 0, "show_seconds": None})
+
+    def estimate(self, script: str, voice: str) -> DurationEstimate:
+        """Predict how long ``script`` (SSML, Markdown or plain text) takes to speak."""
+        grouped = paragraphs(script, AUTO)
+        cjk_chars = words = sentences = 0
+        for group in grouped:
+            for sentence in group:
+                cjk_chars += len(_CJK.findall(sentence))
+                words += len(_WORD.findall(sentence))
+                sentences += 1
+        pause = sum(_break_seconds(match.group(1)) for match in _BREAK.finditer(script))
+        pause += max(sentences - len(grouped), 0) * SENTENCE_GAP + max(len(grouped) - 1, 0) * PARAGRAPH_GAP
+        raw_speech = cjk_chars / CJK_CHARS_PER_SECOND + words / WORDS_PER_SECOND
+        with self._lock:
+            scale = self._entry(voice)["scale"]
+        speech = raw_speech * scale
+        return DurationEstimate(
+            seconds=speech + pause,
+            speech_seconds=speech,
+            pause_seconds=pause,
+            cjk_chars=cjk_chars,
+            words=words,
+        )
+
+    def typical(self, voice: str) -> Optional[float]:
+        """Smoothed length of recent shows for ``voice``, before any script exists."""
+        with self._lock:
+            return self._entry(voice)["show_seconds"]
+
+    def observe(self, script: str, voice: str, actual_seconds: float) -> DurationEstimate:
+        """Calibrate ``voice`` with the real duration of ``script``; returns the pre-update estimate."""
+        estimate = self.estimate(script, voice)
+        with self._lock:
+            entry = self._entry(voice)
+            raw_speech = estimate.speech_seconds / entry["scale"]
+            if raw_speech > 0 and actual_seconds > estimate.pause_seconds:
+                # Clamp so one odd run (a failed-over engine, a truncated track) cannot wreck the model.
+                implied = min(max((actual_seconds - estimate.pause_seconds) / raw_speech, 0.3), 3.0)
+                entry["scale"] = round((1 - self.alpha) * entry["scale"] + self.alpha * implied, 4)
+                entry["samples"] += 1
+            previous = entry["show_seconds"]
+            entry["show_seconds"] = round(
+                actual_seconds if previous is None else (1 - self.alpha) * previous + self.alpha * actual_seconds, 2
+            )
+            self._save()
+        logger.info(
+            "Voice %s: estimated %.1fs, actual %.1fs (scale now %.3f)",
+            voice,
+            estimate.seconds,
+            actual_seconds,
+            self._state[voice]["scale"],
+        )
+        return estimate
+
+    def _save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(self._state, indent=2, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp_path, self.path)
@@ -1,9 +1,13 @@
 """Audio mixing utilities for MorningCast."""
 from __future__ import annotations
 
+import sys
+import tempfile
+import wave
+from array import array
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Iterable, Optional
+from typing import Iterable, List, Optional, Sequence
 
 import ffmpeg
 
@@ -44,6 +48,228 @@ def crossfade_tracks(tracks: Iterable[Path], output_path: Path, crossfade: float
     return output_path
 
 
+@dataclass(slots=True)
+class ChunkPlacement:
+    """Where a stitched chunk landed: output offset plus the span kept from its source file."""
+
+    offset: float
+    trim_start: float
+    trim_end: float
+
+
+# Samples screened per slice when looking for the first/last sound of a chunk.
+VOICE_BOUNDS_BLOCK = 4096
+# Most inputs one ffmpeg run of ``stitch_voice_chunks`` opens; longer shows are joined in batches.
+STITCH_BATCH_SIZE = 32
+# Most speech regions one ducking envelope carries; ffmpeg re-evaluates it every frame.
+MAX_DUCK_REGIONS = 48
+
+
+def wav_duration(path: Path) -> float:
+    """Length of a WAV file in seconds, read from its header."""
+    with wave.open(str(path), "rb") as handle:
+        return handle.getnframes() / handle.getframerate()
+
+
+def trim_to_duration(source: Path, output_path: Path, duration: float, *, fade_out: float = 3.0) -> Path:
+    """Cut a bed to ``duration`` seconds ending in a fade; a shorter bed passes through whole."""
+    stream = (
+        ffmpeg.input(str(source))
+        .audio.filter("atrim", end=duration)
+        .filter("afade", t="out", st=max(duration - fade_out, 0), d=fade_out)
+    )
+    ffmpeg.output(stream, str(output_path), ac=2, ar=44100).overwrite_output().run(quiet=True)
+    return output_path
+
+
+def _is_loud(block: array, limit: float) -> bool:
+    return bool(block) and (max(block) > limit or -min(block) > limit)
+
+
+def voice_bounds(path: Path, *, silence_threshold_db: float = -50.0) -> tuple[float, float, float]:
+    """Return ``(first sound, last sound, duration)`` in seconds for a 16-bit PCM WAV.
+
+    Samples are screened in ``VOICE_BOUNDS_BLOCK`` slices with the C-level
+    ``max``/``min``; only the slice holding each bound is walked in Python.
+    """
+    with wave.open(str(path), "rb") as handle:
+        rate, channels = handle.getframerate(), handle.getnchannels()
+        samples = array("h")
+        samples.frombytes(handle.readframes(handle.getnframes()))
+    if sys.byteorder == "big":
+        samples.byteswap()
+    duration = len(samples) / (rate * channels)
+    limit = 32768 * 10 ** (silence_threshold_db / 20)
+    first = None
+    for begin in range(0, len(samples), VOICE_BOUNDS_BLOCK):
+        block = samples[begin : begin + VOICE_BOUNDS_BLOCK]
+        if _is_loud(block, limit):
+            first = begin + next(i for i, value in enumerate(block) if abs(value) > limit)
+            break
+    if first is None:
+        return 0.0, duration, duration
+    last = first
+    for end in range(len(samples), first, -VOICE_BOUNDS_BLOCK):
+        begin = max(end - VOICE_BOUNDS_BLOCK, first)
+        block = samples[begin:end]
+        if _is_loud(block, limit):
+            last = begin + next(i for i in range(len(block) - 1, -1, -1) if abs(block[i]) > limit)
+            break
+    return first // channels / rate, (last // channels + 1) / rate, duration
+
+
+def stitch_voice_chunks(
+    tracks: Iterable[Path],
+    output_path: Path,
+    *,
+    pauses: Sequence[float],
+    crossfade: float = 0.03,
+    sample_rate: int = 44100,
+    silence_threshold_db: float = -50.0,
+    batch_size: int = STITCH_BATCH_SIZE,
+) -> List[ChunkPlacement]:
+    """Join separately synthesised voice chunks with fixed pauses and short crossfades.
+
+    Chunks are expected in the canonical TTS PCM format, so they are used as-is
+    without resampling. Each chunk's own leading and trailing silence is
+    trimmed first, so the gap after chunk ``i`` is exactly ``pauses[i]``
+    whatever the engine padded. Returns where every chunk landed, so engine
+    timings can be moved onto the stitched track. At most ``batch_size`` chunk
+    files are opened by one ffmpeg run.
+    """
+    paths = list(tracks)
+    if not paths:
+        raise ValueError("At least one track is required")
+    if batch_size < 2:
+        raise ValueError("batch_size must be at least 2")
+    streams = []
+    placements: List[ChunkPlacement] = []
+    offset = 0.0
+    for index, path in enumerate(paths):
+        start, end, _ = voice_bounds(path, silence_threshold_db=silence_threshold_db)
+        stream = ffmpeg.input(str(path)).audio.filter("atrim", start=start, end=end).filter("asetpts", "PTS-STARTPTS")
+        placements.append(ChunkPlacement(offset=offset, trim_start=start, trim_end=end))
+        length = end - start
+        if index < len(paths) - 1:
+            pause = max(pauses[index], crossfade)
+            stream = stream.filter("apad", pad_dur=pause)
+            length += pause
+        streams.append(stream)
+        offset += length - (crossfade if crossfade > 0 else 0.0)
+
+    _join_voice_streams(streams, output_path, crossfade=crossfade, sample_rate=sample_rate, batch_size=batch_size)
+    return placements
+
+
+def _join_voice_streams(
+    streams: List, output_path: Path, *, crossfade: float, sample_rate: int, batch_size: int
+) -> Path:
+    """Chain ``streams`` with ``acrossfade``, opening at most ``batch_size`` inputs per ffmpeg run.
+
+    Longer lists are joined batch by batch into scratch WAVs next to
+    ``output_path``, which are then joined the same way. Every boundary is still
+    one crossfade, so the offsets computed by ``stitch_voice_chunks`` hold.
+    """
+    if len(streams) > batch_size:
+        with tempfile.TemporaryDirectory(dir=output_path.parent) as scratch:
+            parts = []
+            for number, begin in enumerate(range(0, len(streams), batch_size)):
+                part = Path(scratch) / f"batch{number:04d}.wav"
+                _join_voice_streams(
+                    streams[begin : begin + batch_size],
+                    part,
+                    crossfade=crossfade,
+                    sample_rate=sample_rate,
+                    batch_size=batch_size,
+                )
+                parts.append(ffmpeg.input(str(part)).audio)
+            return _join_voice_streams(
+                parts, output_path, crossfade=crossfade, sample_rate=sample_rate, batch_size=batch_size
+            )
+    joined = streams[0]
+    for nxt in streams[1:]:
+        if crossfade > 0:
+            joined = ffmpeg.filter([joined, nxt], "acrossfade", d=crossfade, c1="tri", c2="tri")
+        else:
+            joined = ffmpeg.concat(joined, nxt, v=0, a=1)
+    ffmpeg.output(joined, str(output_path), ac=1, ar=sample_rate, acodec="pcm_s16le").overwrite_output().run(quiet=True)
+    return output_path
+
+
+def speech_regions(timings: Sequence[dict], *, merge_gap: float = 0.8) -> List[tuple[float, float]]:
+    """Merge sentence timings into speech regions, bridging pauses shorter than ``merge_gap``."""
+    regions: List[tuple[float, float]] = []
+    for timing in sorted(timings, key=lambda item: item["start"]):
+        start, end = float(timing["start"]), float(timing["end"])
+        if regions and start - regions[-1][1] <= merge_gap:
+            regions[-1] = (regions[-1][0], max(regions[-1][1], end))
+        else:
+            regions.append((start, end))
+    return regions
+
+
+def envelope_regions(
+    regions: Sequence[tuple[float, float]], *, bridge: float, limit: int = MAX_DUCK_REGIONS
+) -> List[tuple[float, float]]:
+    """Merge regions less than ``bridge`` apart, then close the shortest gaps until at most ``limit`` remain.
+
+    The result never overlaps once ramps of total length ``bridge`` are added,
+    so the ramps can simply be summed.
+    """
+    merged: List[tuple[float, float]] = []
+    for start, end in sorted(regions):
+        if merged and start - merged[-1][1] < bridge:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    while len(merged) > max(limit, 1):
+        index = min(range(1, len(merged)), key=lambda i: merged[i][0] - merged[i - 1][1])
+        merged[index - 1 : index + 1] = [(merged[index - 1][0], max(merged[index - 1][1], merged[index][1]))]
+    return merged
+
+
+def duck_with_envelope(
+    music_path: Path,
+    voice_path: Path,
+    output_path: Path,
+    regions: Sequence[tuple[float, float]],
+    *,
+    music_gain_db: float = -12.0,
+    duck_db: float = -12.0,
+    attack: float = 0.25,
+    release: float = 0.6,
+    voice_gain_db: float = 0.0,
+    target_lufs: float = -16.0,
+) -> Path:
+    """Mix voice over the bed using a gain envelope precomputed from speech regions.
+
+    The bed sits at ``music_gain_db`` between regions (so it swells exactly in
+    the gaps between segments) and drops a further ``duck_db`` while the host
+    speaks, ramping over ``attack`` before and ``release`` after each region.
+    This replaces detecting the voice from audio with ``sidechaincompress``.
+    Regions whose ramps would touch are merged and at most
+    ``MAX_DUCK_REGIONS`` are kept, so the per-frame volume expression is a
+    short, flat sum however many sentences the show has.
+    """
+    depth = 1 - 10 ** (duck_db / 20)
+    regions = envelope_regions(regions, bridge=attack + release)
+    envelope = "+".join(
+        f"clip(min((t-{start - attack:.3f})/{attack},({end + release:.3f}-t)/{release}),0,1)"
+        for start, end in regions
+    )
+
+    music = ffmpeg.input(str(music_path)).audio.filter_("volume", volume=f"{music_gain_db}dB")
+    if regions:
+        music = music.filter_("volume", volume=f"1-{depth:.4f}*({envelope})", eval="frame")
+    voice = ffmpeg.input(str(voice_path)).audio.filter_("volume", volume=f"{voice_gain_db}dB")
+
+    mixed = ffmpeg.filter([music, voice], "amix", inputs=2, dropout_transition=0)
+    mixed = mixed.filter_("alimiter", limit="-1dB", level="disabled")
+    mixed = mixed.filter_("loudnorm", I=str(target_lufs), TP="-1.5", LRA="11")
+    ffmpeg.output(mixed, str(output_path), ac=2, ar=44100).overwrite_output().run(quiet=True)
+    return output_path
+
+
 def duck_voice_over(
     music_path: Path,
     voice_path: Path,
@@ -3,13 +3,62 @@ from __future__ import annotations
 
 import json
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
+
+from ..utils.logging import get_logger
+
+logger = get_logger(__name__)
 
 
 class EmailSummaryLoaderError(RuntimeError):
     """Raised when the email summary file cannot be parsed."""
 
 
+_TRUTHY = {"true", "yes", "y", "1", "是"}
+# Characters of the summary used as a title when an item has none.
+_TITLE_FROM_SUMMARY_CHARS = 40
+
+
+def _as_bool(value: Any) -> bool:
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, (int, float)):
+        return bool(value)
+    return str(value or "").strip().lower() in _TRUTHY
+
+
+def _normalise_item(item: Any, index: int) -> Optional[Dict[str, Any]]:
+    """Validate one record, accepting both the legacy ``{category, title}`` shape
+    and the structured records emitted by the email bot.
+
+    A bad item is skipped with a warning rather than failing the whole show;
+    a missing title is taken from the start of the summary.
+    """
+
+    if not isinstance(item, dict):
+        logger.warning("Skipping email summary item %d: not an object", index)
+        return None
+    title = str(item.get("title") or "").strip()
+    if not title:
+        title = str(item.get("summary") or "").strip()[:_TITLE_FROM_SUMMARY_CHARS]
+    if not title:
+        logger.warning("Skipping email summary item %d: no title or summary", index)
+        return None
+
+    record = dict(item)
+    record["category"] = str(item.get("category") or "email")
+    record["title"] = title
+    for flag in ("important", "need_reply"):
+        if flag in item:
+            record[flag] = _as_bool(item[flag])
+    spoken = str(item.get("spoken_line") or "").strip()
+    if spoken:
+        record["spoken_line"] = spoken
+    else:
+        record.pop("spoken_line", None)
+    return record
+
+
 def load_email_summary(path: str | Path) -> List[Dict[str, Any]]:
     """Load an email summary JSON document.
 
@@ -21,7 +70,9 @@ def load_email_summary(path: str | Path) -> List[Dict[str, Any]]:
     Returns
     -------
     list of dict
-        The email summaries.
+        The email summaries, without items that are not objects or have
+        neither a title nor a summary. Items that already carry a
+        ``spoken_line`` are passed through LLM-A unchanged.
     """
 
     json_path = Path(path)
@@ -36,4 +87,5 @@ def load_email_summary(path: str | Path) -> List[Dict[str, Any]]:
     if not isinstance(data, list):
         raise EmailSummaryLoaderError("Expected email summary JSON to contain a list")
 
-    return data
+    records = (_normalise_item(item, index) for index, item in enumerate(data))
+    return [record for record in records if record is not None]
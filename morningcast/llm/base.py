@@ -1,11 +1,21 @@
 """Shared OpenAI helper utilities."""
 from __future__ import annotations
 
+import asyncio
 import os
+import threading
+import time
 from dataclasses import dataclass
-from typing import Any, Dict, Iterable, Optional
+from typing import Any, Coroutine, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, TypeVar
 
-from openai import OpenAI
+from openai import APIConnectionError, APITimeoutError, AsyncOpenAI, InternalServerError, RateLimitError
+
+from ..replay.fixtures import FixtureStore
+from ..utils.logging import get_logger
+from .cache import LLMResponseCache
+from .metrics import LLMCallRecord, LLMMetrics
+
+logger = get_logger(__name__)
 
 
 @dataclass(slots=True)
@@ -13,24 +23,305 @@ class OpenAIConfig:
     api_key: str
     model: str
     temperature: float = 0.7
+    timeout: Optional[float] = None
+    max_concurrency: int = 4
+    cache: Optional[LLMResponseCache] = None
+    use_cache: bool = True
+    prompt_token_budget: Optional[int] = None
+    fixtures: Optional[FixtureStore] = None
+    stage: str = ""
+    metrics: Optional[LLMMetrics] = None
+    max_retries: int = 2
+
+
+_CLIENT_LOCK = threading.Lock()
+_ASYNC_CLIENTS: Dict[str, AsyncOpenAI] = {}
+_SEMAPHORES: Dict[int, asyncio.Semaphore] = {}
+_LOOP: Optional[asyncio.AbstractEventLoop] = None
+# Retries are done here rather than inside the SDK so they can be counted per call.
+_RETRYABLE = (APIConnectionError, APITimeoutError, RateLimitError, InternalServerError)
+_RETRY_BASE_DELAY = 1.0
+# Size of the pieces a replayed completion is streamed back in.
+_REPLAY_CHUNK_CHARS = 24
+_END_OF_STREAM = object()
+
+T = TypeVar("T")
+
+
+def _resolve_key(api_key: Optional[str]) -> str:
+    return api_key or os.environ.get("OPENAI_API_KEY", "")
+
+
+def _background_loop() -> asyncio.AbstractEventLoop:
+    """Start (once) the event loop that owns the shared async client."""
+    global _LOOP
+    with _CLIENT_LOCK:
+        if _LOOP is None or _LOOP.is_closed():
+            loop = asyncio.new_event_loop()
+            thread = threading.Thread(target=loop.run_forever, name="morningcast-llm", daemon=True)
+            thread.start()
+            _LOOP = loop
+        return _LOOP
+
+
+def get_shared_async_client(api_key: Optional[str] = None) -> AsyncOpenAI:
+    """Return the process-wide client; it must only be awaited on the background loop.
+
+    Sync and streaming calls are bridged onto the same loop, so every stage
+    shares this one connection pool.
+    """
+    key = _resolve_key(api_key)
+    with _CLIENT_LOCK:
+        if key not in _ASYNC_CLIENTS:
+            _ASYNC_CLIENTS[key] = AsyncOpenAI(api_key=key or None, max_retries=0)
+        return _ASYNC_CLIENTS[key]
+
+
+def _run(coro: Coroutine[Any, Any, T]) -> T:
+    """Block the calling thread until ``coro`` finishes on the background loop."""
+    return asyncio.run_coroutine_threadsafe(coro, _background_loop()).result()
+
+
+async def _next_chunk(iterator: Any) -> Any:
+    try:
+        return await iterator.__anext__()
+    except StopAsyncIteration:
+        return _END_OF_STREAM
+
+
+def _usage(response: Any) -> Optional[Dict[str, int]]:
+    usage = getattr(response, "usage", None)
+    if usage is None:
+        return None
+    return {
+        "prompt_tokens": getattr(usage, "prompt_tokens", None) or 0,
+        "completion_tokens": getattr(usage, "completion_tokens", None) or 0,
+    }
+
+
+def _semaphore(limit: int) -> asyncio.Semaphore:
+    # Only touched from the background loop, so no extra locking is needed.
+    limit = max(1, limit)
+    if limit not in _SEMAPHORES:
+        _SEMAPHORES[limit] = asyncio.Semaphore(limit)
+    return _SEMAPHORES[limit]
 
 
 class OpenAIHelper:
-    """Thin wrapper around the OpenAI responses API."""
+    """Thin wrapper around the OpenAI chat completions API.
+
+    ``complete`` is the synchronous path used by most stages; ``acomplete`` and
+    ``complete_many`` add a concurrency semaphore so fan-out stages can issue
+    requests in parallel. All three, and ``stream``, go through one async client
+    on a background loop, and ``config.timeout`` is enforced by the SDK alone
+    (a timeout surfaces as a retryable ``APITimeoutError``). With ``config.fixtures`` set,
+    responses are recorded to or replayed from a fixture directory, and in
+    replay mode no client is ever created. Every call is reported to
+    ``config.metrics`` when one is attached.
+    """
 
     def __init__(self, config: OpenAIConfig):
         self.config = config
-        self._client = OpenAI(api_key=config.api_key or os.environ.get("OPENAI_API_KEY"))
 
-    def complete(self, messages: Iterable[Dict[str, Any]], **kwargs: Any) -> str:
+    def _params(self, messages: Iterable[Dict[str, Any]], kwargs: Dict[str, Any]) -> Dict[str, Any]:
         params = {
             "model": self.config.model,
             "messages": list(messages),
             "temperature": self.config.temperature,
         }
+        if self.config.timeout is not None:
+            params["timeout"] = self.config.timeout
         params.update(kwargs)
-        response = self._client.chat.completions.create(**params)
-        return response.choices[0].message.content or ""
+        return params
+
+    def _cache_key(self, params: Dict[str, Any]) -> Optional[str]:
+        if self.config.cache is None or not self.config.use_cache:
+            return None
+        return self.config.cache.key_for(params)
+
+    def _replayed(self, params: Dict[str, Any]) -> Optional[Tuple[str, float, Optional[Dict[str, int]]]]:
+        """Return ``(content, simulated delay, usage)`` when replaying fixtures."""
+        fixtures = self.config.fixtures
+        if fixtures is None or not fixtures.replaying:
+            return None
+        content, elapsed, usage = fixtures.load_llm(LLMResponseCache.key_for(params))
+        return content, fixtures.simulated_delay(elapsed), usage
+
+    def _retry_delay(self, attempt: int, exc: BaseException) -> float:
+        delay = _RETRY_BASE_DELAY * 2 ** (attempt - 1)
+        logger.warning(
+            "LLM %s call failed (%s); retry %d/%d in %.1fs",
+            self.config.stage or self.config.model,
+            exc.__class__.__name__,
+            attempt,
+            self.config.max_retries,
+            delay,
+        )
+        return delay
+
+    async def _create(self, params: Dict[str, Any]) -> Tuple[Any, int]:
+        """Issue the request on the background loop, retrying transient failures."""
+        client = get_shared_async_client(self.config.api_key)
+        retries = 0
+        while True:
+            try:
+                return await client.chat.completions.create(**params), retries
+            except _RETRYABLE as exc:
+                if retries >= self.config.max_retries:
+                    raise
+                retries += 1
+                await asyncio.sleep(self._retry_delay(retries, exc))
+
+    def _finish(
+        self,
+        params: Dict[str, Any],
+        content: str,
+        started: float,
+        *,
+        usage: Optional[Dict[str, int]] = None,
+        ttft: Optional[float] = None,
+        retries: int = 0,
+        cache_hit: bool = False,
+        replayed: bool = False,
+    ) -> None:
+        """Record the fixture (when recording) and emit the per-call metrics record."""
+        elapsed = time.perf_counter() - started
+        fixtures = self.config.fixtures
+        if fixtures is not None and fixtures.recording:
+            fixtures.save_llm(LLMResponseCache.key_for(params), params, content, elapsed, usage)
+        if self.config.metrics is not None:
+            self.config.metrics.add(
+                LLMCallRecord(
+                    stage=self.config.stage or "llm",
+                    model=self.config.model,
+                    prompt_tokens=(usage or {}).get("prompt_tokens"),
+                    completion_tokens=(usage or {}).get("completion_tokens"),
+                    wall_seconds=round(elapsed, 4),
+                    ttft_seconds=round(ttft, 4) if ttft is not None else None,
+                    retries=retries,
+                    cache_hit=cache_hit,
+                    replayed=replayed,
+                )
+            )
+
+    def complete(self, messages: Iterable[Dict[str, Any]], **kwargs: Any) -> str:
+        params = self._params(messages, kwargs)
+        started = time.perf_counter()
+        replayed = self._replayed(params)
+        if replayed is not None:
+            content, delay, usage = replayed
+            time.sleep(delay)
+            self._finish(params, content, started, usage=usage, replayed=True)
+            return content
+        key = self._cache_key(params)
+        cached = self.config.cache.get(key) if key is not None else None
+        if cached is not None:
+            self._finish(params, cached, started, cache_hit=True)
+            return cached
+        response, retries = _run(self._create(params))
+        content = response.choices[0].message.content or ""
+        if key is not None:
+            self.config.cache.put(key, content)
+        self._finish(params, content, started, usage=_usage(response), retries=retries)
+        return content
+
+    def stream(self, messages: Iterable[Dict[str, Any]], **kwargs: Any) -> Iterator[str]:
+        """Yield the completion as text deltas; a cache hit is yielded in one piece.
+
+        Replayed responses are re-chunked and spread over the simulated delay
+        so downstream streaming consumers see a realistic arrival pattern.
+        """
+        params = self._params(messages, kwargs)
+        started = time.perf_counter()
+        replayed = self._replayed(params)
+        if replayed is not None:
+            content, delay, usage = replayed
+            pieces = [content[i : i + _REPLAY_CHUNK_CHARS] for i in range(0, len(content), _REPLAY_CHUNK_CHARS)]
+            ttft = None
+            for piece in pieces:
+                time.sleep(delay / len(pieces))
+                if ttft is None:
+                    ttft = time.perf_counter() - started
+                yield piece
+            self._finish(params, content, started, usage=usage, ttft=ttft, replayed=True)
+            return
+        key = self._cache_key(params)
+        cached = self.config.cache.get(key) if key is not None else None
+        if cached is not None:
+            self._finish(params, cached, started, ttft=time.perf_counter() - started, cache_hit=True)
+            yield cached
+            return
+        params["stream"] = True
+        params["stream_options"] = {"include_usage": True}
+        stream, retries = _run(self._create(params))
+        parts: List[str] = []
+        usage: Optional[Dict[str, int]] = None
+        ttft = None
+        try:
+            # Each chunk is awaited on the background loop, one at a time.
+            while (chunk := _run(_next_chunk(stream))) is not _END_OF_STREAM:
+                if getattr(chunk, "usage", None) is not None:
+                    usage = _usage(chunk)
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta.content or ""
+                if delta:
+                    if ttft is None:
+                        ttft = time.perf_counter() - started
+                    parts.append(delta)
+                    yield delta
+        finally:
+            _run(stream.close())  # release the pooled connection even if the consumer stops early
+        content = "".join(parts)
+        if key is not None:
+            self.config.cache.put(key, content)
+        self._finish(params, content, started, usage=usage, ttft=ttft, retries=retries)
+
+    async def acomplete(self, messages: Iterable[Dict[str, Any]], **kwargs: Any) -> str:
+        """Async variant of :meth:`complete`; must run on the shared background loop."""
+        params = self._params(messages, kwargs)
+        replayed = self._replayed(params)
+        if replayed is not None:
+            content, delay, usage = replayed
+            async with _semaphore(self.config.max_concurrency):
+                started = time.perf_counter()
+                await asyncio.sleep(delay)
+            self._finish(params, content, started, usage=usage, replayed=True)
+            return content
+        started = time.perf_counter()
+        key = self._cache_key(params)
+        cached = self.config.cache.get(key) if key is not None else None
+        if cached is not None:
+            self._finish(params, cached, started, cache_hit=True)
+            return cached
+        async with _semaphore(self.config.max_concurrency):
+            # Wall time starts once a slot is free so queueing behind the semaphore is not counted.
+            started = time.perf_counter()
+            response, retries = await self._create(params)
+        content = response.choices[0].message.content or ""
+        if key is not None:
+            self.config.cache.put(key, content)
+        self._finish(params, content, started, usage=_usage(response), retries=retries)
+        return content
+
+    def complete_many(
+        self,
+        requests: Sequence[Iterable[Dict[str, Any]]],
+        *,
+        return_exceptions: bool = False,
+        **kwargs: Any,
+    ) -> List[Any]:
+        """Run several completions concurrently and return results in order (sync facade)."""
+        if not requests:
+            return []
+
+        async def _gather() -> List[Any]:
+            return await asyncio.gather(
+                *(self.acomplete(messages, **kwargs) for messages in requests),
+                return_exceptions=return_exceptions,
+            )
+
+        return _run(_gather())
 
 
 def build_system_prompt(persona: Optional[Dict[str, Any]] = None) -> str:
@@ -0,0 +1,130 @@
+"""Content-addressed disk cache for LLM responses."""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from ..utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Request parameters that do not influence the completion text.
+_IGNORED_PARAMS = {"timeout", "stream", "stream_options"}
+
+
+class LLMResponseCache:
+    """Opt-in cache keyed by model, temperature, messages and extra kwargs.
+
+    Entries live as small JSON files under ``directory``; they expire after
+    ``ttl_seconds`` and the least recently used ones are evicted once the cache
+    grows past ``max_bytes``.
+    """
+
+    def __init__(self, directory: Path, *, ttl_seconds: Optional[float] = 72 * 3600, max_bytes: int = 64 * 1024 * 1024):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._size = sum(path.stat().st_size for path in self.directory.glob("*/*.json"))
+
+    @staticmethod
+    def key_for(params: Dict[str, Any]) -> str:
+        material = {k: v for k, v in params.items() if k not in _IGNORED_PARAMS}
+        encoded = json.dumps(material, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}.json"
+
+    def get(self, key: str) -> Optional[str]:
+        path = self._path(key)
+        try:
+            entry = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            with self._lock:
+                self.misses += 1
+            return None
+        if self.ttl_seconds is not None and time.time() - entry.get("created_at", 0) > self.ttl_seconds:
+            self._remove(path)
+            with self._lock:
+                self.misses += 1
+            return None
+        try:
+            os.utime(path)  # bump recency for LRU eviction
+        except OSError:
+            pass
+        with self._lock:
+            self.hits += 1
+        return entry.get("content")
+
+    def put(self, key: str, content: str) -> None:
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        payload = json.dumps({"created_at": time.time(), "content": content}, ensure_ascii=False)
+        tmp_path = path.with_suffix(f".{threading.get_ident()}.tmp")
+        tmp_path.write_text(payload, encoding="utf-8")
+        added = tmp_path.stat().st_size
+        with self._lock:
+            # Overwriting a key (e.g. after expiry or a concurrent miss) only adds the difference.
+            try:
+                added -= path.stat().st_size
+            except FileNotFoundError:
+                pass
+            os.replace(tmp_path, path)
+            self._size += added
+            over_budget = self._size > self.max_bytes
+        if over_budget:
+            self._evict()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            hits, misses, size = self.hits, self.misses, self._size
+        total = hits + misses
+        return {
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": round(hits / total, 3) if total else 0.0,
+            "size_bytes": size,
+        }
+
+    def _remove(self, path: Path) -> None:
+        try:
+            size = path.stat().st_size
+            path.unlink()
+        except OSError:
+            return
+        with self._lock:
+            self._size -= size
+
+    def _evict(self) -> None:
+        entries = []
+        for path in self.directory.glob("*/*.json"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        entries.sort()
+        total = sum(size for _, size, _ in entries)
+        target = int(self.max_bytes * 0.8)
+        removed = 0
+        for _, size, path in entries:
+            if total <= target:
+                break
+            try:
+                path.unlink()
+            except OSError:
+                continue
+            total -= size
+            removed += 1
+        with self._lock:
+            self._size = total
+        logger.info("LLM cache evicted %d entries (%d bytes remain)", removed, total)
@@ -0,0 +1,86 @@
+"""Per-call LLM latency and token accounting."""
+from __future__ import annotations
+
+import json
+import threading
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, List, Optional
+
+from ..utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+@dataclass(slots=True)
+class LLMCallRecord:
+    stage: str
+    model: str
+    prompt_tokens: Optional[int]
+    completion_tokens: Optional[int]
+    wall_seconds: float
+    ttft_seconds: Optional[float] = None
+    retries: int = 0
+    cache_hit: bool = False
+    replayed: bool = False
+
+
+class LLMMetrics:
+    """Thread-safe collector shared by every stage of one pipeline run."""
+
+    def __init__(self) -> None:
+        self._records: List[LLMCallRecord] = []
+        self._lock = threading.Lock()
+
+    def add(self, record: LLMCallRecord) -> None:
+        with self._lock:
+            self._records.append(record)
+        logger.debug("LLM call %s", json.dumps(asdict(record), ensure_ascii=False))
+
+    def records(self) -> List[LLMCallRecord]:
+        with self._lock:
+            return list(self._records)
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        """Aggregate the records per stage, in the order stages first appeared."""
+        stages: Dict[str, Dict[str, Any]] = {}
+        for record in self.records():
+            stage = stages.setdefault(
+                record.stage,
+                {
+                    "model": record.model,
+                    "calls": 0,
+                    "cache_hits": 0,
+                    "retries": 0,
+                    "prompt_tokens": 0,
+                    "completion_tokens": 0,
+                    "wall_seconds": 0.0,
+                    "max_wall_seconds": 0.0,
+                    "ttft_seconds": None,
+                },
+            )
+            stage["calls"] += 1
+            stage["cache_hits"] += int(record.cache_hit)
+            stage["retries"] += record.retries
+            stage["prompt_tokens"] += record.prompt_tokens or 0
+            stage["completion_tokens"] += record.completion_tokens or 0
+            stage["wall_seconds"] = round(stage["wall_seconds"] + record.wall_seconds, 3)
+            stage["max_wall_seconds"] = round(max(stage["max_wall_seconds"], record.wall_seconds), 3)
+            if record.ttft_seconds is not None and stage["ttft_seconds"] is None:
+                stage["ttft_seconds"] = round(record.ttft_seconds, 3)
+        return stages
+
+    def log_summary(self) -> None:
+        for name, stage in self.summary().items():
+            logger.info(
+                "LLM %s (%s): %d call(s), %.2fs total, %.2fs slowest, %d+%d tokens, %d cache hit(s), %d retry(ies)%s",
+                name,
+                stage["model"],
+                stage["calls"],
+                stage["wall_seconds"],
+                stage["max_wall_seconds"],
+                stage["prompt_tokens"],
+                stage["completion_tokens"],
+                stage["cache_hits"],
+                stage["retries"],
+                f", first token after {stage['ttft_seconds']:.2f}s" if stage["ttft_seconds"] is not None else "",
+            )
@@ -1,24 +1,144 @@
 """LLM-B: Plan the show structure and music placements."""
 from __future__ import annotations
 
-from typing import Any, Dict, List
+import json
+import re
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
 
+from ..utils.logging import get_logger
 from .base import OpenAIConfig, OpenAIHelper
+from .prompt_builder import PLANNER_TRIM_RULES, compact_json, fit_to_budget, planner_view
+
+logger = get_logger(__name__)
 
 PLAN_PROMPT = (
     "請根據以下資訊規劃早晨節目。\n"
-    "輸出段落列表，每段包含 id, title, emotion, song(可選), reason(可選)。\n"
-    "以 JSON array 輸出，確保可被解析。\n"
+    "輸出段落列表，每段包含 id, title, emotion, song(可選), reason(可選), lines(可選，該段使用的 spoken_lines 索引陣列)。\n"
+    '以 JSON object 輸出，格式為 {{"segments": [...]}}，確保可被解析。\n'
     "輸入資料：\n{payload}"
 )
 
+REPAIR_PROMPT = (
+    "下面這段 JSON 不符合節目段落格式，請只修正錯誤並輸出修正後的 JSON object，不要改動其他內容。\n"
+    '格式：{{"segments": [{{"id": 字串或整數, "title": 字串, "emotion": 字串, "song": 字串或 null, "reason": 字串或 null, "lines": 整數陣列或 null}}]}}\n'
+    "錯誤：\n{errors}\n"
+    "原始輸出：\n{response}"
+)
+
+# field -> (accepted types, required)
+SEGMENT_SCHEMA: Dict[str, Tuple[Tuple[type, ...], bool]] = {
+    "id": ((str, int), True),
+    "title": ((str,), True),
+    "emotion": ((str,), True),
+    "song": ((str, type(None)), False),
+    "reason": ((str, type(None)), False),
+    "lines": ((list, type(None)), False),
+}
+# Incremental runs hash each segment by the lines it uses, so the planner must list them.
+LINES_REQUIRED = "每段都必須提供 lines，只列出該段實際使用的 spoken_lines 索引。\n"
+
+
+class PlanValidationError(RuntimeError):
+    """Raised when LLM-B output cannot be repaired into valid segments."""
 
-def plan_program(payload: Dict[str, Any], config: OpenAIConfig) -> str:
+
+@dataclass(slots=True)
+class PlanResult:
+    segments: List[Dict[str, Any]]
+    repair_attempts: int = 0
+    repair_seconds: float = 0.0
+
+
+def plan_program(payload: Dict[str, Any], config: OpenAIConfig, *, require_lines: bool = False) -> str:
     helper = OpenAIHelper(config)
+    template = PLAN_PROMPT + LINES_REQUIRED if require_lines else PLAN_PROMPT
+    serialised = fit_to_budget(
+        planner_view(payload),
+        config.prompt_token_budget,
+        PLANNER_TRIM_RULES,
+        stage="LLM-B",
+        overhead=template,
+    )
     response = helper.complete(
         [
             {"role": "system", "content": "You are a radio program director who thinks in Mandarin."},
-            {"role": "user", "content": PLAN_PROMPT.format(payload=payload)},
-        ]
+            {"role": "user", "content": template.format(payload=serialised)},
+        ],
+        response_format={"type": "json_object"},
     )
     return response
+
+
+def validate_segments(
+    response: str, *, require_lines: bool = False
+) -> Tuple[Optional[List[Dict[str, Any]]], List[str]]:
+    """Parse and validate planner output, returning ``(segments, errors)``."""
+    text = response.strip()
+    if text.startswith("```"):
+        text = re.sub(r"^```[a-zA-Z0-9]*\n", "", text)
+        text = re.sub(r"```$", "", text).strip()
+    try:
+        data = json.loads(text)
+    except json.JSONDecodeError as exc:
+        return None, [f"JSON 解析失敗：{exc.msg}（第 {exc.lineno} 行第 {exc.colno} 欄）"]
+
+    if isinstance(data, dict):
+        data = data.get("segments")
+    if not isinstance(data, list) or not data:
+        return None, ['需要非空的 "segments" 陣列']
+
+    errors: List[str] = []
+    segments: List[Dict[str, Any]] = []
+    for index, segment in enumerate(data):
+        if not isinstance(segment, dict):
+            errors.append(f"segments[{index}] 不是物件")
+            continue
+        for field, (types, required) in SEGMENT_SCHEMA.items():
+            if field not in segment:
+                if required:
+                    errors.append(f"segments[{index}] 缺少 {field}")
+                continue
+            if not isinstance(segment[field], types) or isinstance(segment[field], bool):
+                errors.append(f"segments[{index}].{field} 型別錯誤")
+        if require_lines and segment.get("lines") is None:
+            errors.append(f"segments[{index}] 缺少 lines")
+        segments.append(segment)
+    return (None, errors) if errors else (segments, [])
+
+
+def request_plan(
+    payload: Dict[str, Any], config: OpenAIConfig, *, max_repairs: int = 2, require_lines: bool = False
+) -> PlanResult:
+    """Plan the show and repair invalid output with small targeted requests instead of re-planning.
+
+    ``require_lines`` makes each segment's ``lines`` mandatory, as incremental runs need them.
+    """
+    response = plan_program(payload, config, require_lines=require_lines)
+    segments, errors = validate_segments(response, require_lines=require_lines)
+    result = PlanResult(segments=segments or [])
+    if segments is not None:
+        return result
+
+    helper = OpenAIHelper(config)
+    started = time.perf_counter()
+    while errors and result.repair_attempts < max_repairs:
+        result.repair_attempts += 1
+        logger.warning("LLM-B output invalid (%s); repair attempt %d", "; ".join(errors[:3]), result.repair_attempts)
+        response = helper.complete(
+            [
+                {"role": "system", "content": "You repair JSON so it matches a schema. Output JSON only."},
+                {"role": "user", "content": REPAIR_PROMPT.format(errors=compact_json(errors[:10]), response=response)},
+            ],
+            response_format={"type": "json_object"},
+        )
+        segments, errors = validate_segments(response, require_lines=require_lines)
+    result.repair_seconds = round(time.perf_counter() - started, 3)
+
+    if segments is None:
+        logger.error("Failed to repair LLM-B response: %s", response)
+        raise PlanValidationError(f"Invalid LLM-B output after {result.repair_attempts} repair attempts")
+    logger.info("LLM-B output repaired after %d attempt(s) in %.2fs", result.repair_attempts, result.repair_seconds)
+    result.segments = segments
+    return result
@@ -0,0 +1,107 @@
+"""Compact, token-budgeted serialisation for the planner and script prompts."""
+from __future__ import annotations
+
+import copy
+import json
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from ..utils.logging import get_logger
+from ..utils.tokens import estimate_tokens
+
+logger = get_logger(__name__)
+
+# Strings longer than this are clipped once list trimming alone cannot meet the budget.
+MAX_STRING_CHARS = 160
+
+# (list key, minimum items kept); applied in order, always dropping from the end.
+PLANNER_TRIM_RULES: Tuple[Tuple[str, int], ...] = (("songs_meta", 8), ("calendar", 3), ("spoken_lines", 4))
+SCRIPT_TRIM_RULES: Tuple[Tuple[str, int], ...] = (("calendar", 3), ("spoken_lines", 4), ("segments", 3))
+
+_SONG_PROMPT_FIELDS = ("title", "artist", "bpm", "energy")
+
+
+def compact_json(value: Any) -> str:
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"), default=str)
+
+
+def _drop_empty(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {k: _drop_empty(v) for k, v in value.items() if v is not None and v != "" and v != [] and v != {}}
+    if isinstance(value, list):
+        return [_drop_empty(v) for v in value]
+    return value
+
+
+def planner_view(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Drop what LLM-B does not need: file paths, and raw emails already covered by spoken lines."""
+    view = {k: v for k, v in payload.items() if k != "songs_meta"}
+    if payload.get("spoken_lines"):
+        view.pop("emails", None)
+    view["songs_meta"] = [{k: song.get(k) for k in _SONG_PROMPT_FIELDS} for song in payload.get("songs_meta", [])]
+    return _drop_empty(view)
+
+
+def script_view(plan: Dict[str, Any]) -> Dict[str, Any]:
+    """Keep the segments plus the spoken material LLM-C writes from; drop the duplicated planner inputs."""
+    inputs = plan.get("inputs", {})
+    view = {
+        "segments": plan.get("segments", []),
+        "spoken_lines": inputs.get("spoken_lines", []),
+        "weather": inputs.get("weather"),
+        "calendar": inputs.get("calendar", []),
+    }
+    return _drop_empty(view)
+
+
+def _clip_strings(value: Any, limit: int) -> Any:
+    if isinstance(value, str):
+        return value if len(value) <= limit else value[: limit - 1] + "…"
+    if isinstance(value, dict):
+        return {k: _clip_strings(v, limit) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_clip_strings(v, limit) for v in value]
+    return value
+
+
+def fit_to_budget(
+    data: Dict[str, Any],
+    budget: Optional[int],
+    rules: Sequence[Tuple[str, int]],
+    *,
+    stage: str,
+    overhead: str = "",
+) -> str:
+    """Serialise ``data`` compactly and trim it deterministically until the prompt fits ``budget``.
+
+    Lists named in ``rules`` lose items from the end down to their minimum, in
+    rule order; if that is not enough, long strings are clipped. ``overhead`` is
+    the rest of the prompt and counts against the budget.
+    """
+    fixed = estimate_tokens(overhead)
+    text = compact_json(data)
+    tokens = fixed + estimate_tokens(text)
+    original = tokens
+    if budget is not None and tokens > budget:
+        data = copy.deepcopy(data)
+        for key, minimum in rules:
+            items: List[Any] = data.get(key) or []
+            while tokens > budget and len(items) > minimum:
+                items.pop()
+                text = compact_json(data)
+                tokens = fixed + estimate_tokens(text)
+            if tokens <= budget:
+                break
+        if tokens > budget:
+            data = _clip_strings(data, MAX_STRING_CHARS)
+            text = compact_json(data)
+            tokens = fixed + estimate_tokens(text)
+        if tokens > budget:
+            logger.warning("%s prompt still over budget after trimming: %d > %d tokens", stage, tokens, budget)
+    logger.info(
+        "%s prompt: ~%d tokens%s%s",
+        stage,
+        tokens,
+        f" (budget {budget})" if budget is not None else "",
+        f", trimmed from ~{original}" if tokens != original else "",
+    )
+    return text
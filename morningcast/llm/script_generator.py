@@ -1,10 +1,13 @@
 """LLM-C: generate SSML broadcast script."""
 from __future__ import annotations
 
-import json
-from typing import Any, Dict
+import html
+import re
+from typing import Any, Dict, Iterable, Iterator, List, Sequence, Tuple
 
 from .base import OpenAIConfig, OpenAIHelper, build_system_prompt
+from ..utils.segmenter import AUTO, iter_sentences, paragraphs
+from .prompt_builder import SCRIPT_TRIM_RULES, compact_json, fit_to_budget, script_view
 
 SCRIPT_PROMPT = (
     "你是一位早晨電台主持人，根據段落規劃與角色設定，"
@@ -14,16 +17,107 @@ SCRIPT_PROMPT = (
     "請直接輸出 <speak> ... </speak>。"
 )
 
+SEGMENT_PROMPT = (
+    "你是一位早晨電台主持人，正在逐段撰寫節目逐字稿。"
+    "請只寫出下面這一段（SSML），以一個或多個 <p> 元素輸出，不要包含 <speak>。\n"
+    "{position}"
+    "本段規劃：\n{segment}\n"
+    "本段素材：\n{material}\n"
+    "前一段：{previous}；下一段：{next}\n"
+    "角色設定：\n{persona}"
+)
 
-def generate_script(plan: Any, persona: Dict[str, Any], config: OpenAIConfig) -> str:
-    helper = OpenAIHelper(config)
+# Flush a streamed piece at the first sentence end after this many characters, even mid-paragraph.
+_MIN_SENTENCE_CHUNK = 120
+_PARAGRAPH = re.compile(r"<p[\s>][\s\S]*?</p\s*>", re.IGNORECASE)
+_WRAPPER = re.compile(r"```[a-zA-Z]*|<\/?speak[^>]*>", re.IGNORECASE)
+
+
+def _script_messages(plan: Any, persona: Dict[str, Any], config: OpenAIConfig) -> List[Dict[str, str]]:
     system_prompt = build_system_prompt(persona)
-    prompt = SCRIPT_PROMPT.format(plan=json.dumps(plan, ensure_ascii=False, indent=2), persona=json.dumps(persona, ensure_ascii=False))
-    response = helper.complete(
-        [
-            {"role": "system", "content": system_prompt},
-            {"role": "user", "content": prompt},
-        ],
-        max_tokens=2000,
+    persona_json = compact_json(persona)
+    plan_json = fit_to_budget(
+        script_view(plan) if isinstance(plan, dict) else {"segments": plan},
+        config.prompt_token_budget,
+        SCRIPT_TRIM_RULES,
+        stage="LLM-C",
+        overhead=system_prompt + SCRIPT_PROMPT + persona_json,
     )
+    prompt = SCRIPT_PROMPT.format(plan=plan_json, persona=persona_json)
+    return [
+        {"role": "system", "content": system_prompt},
+        {"role": "user", "content": prompt},
+    ]
+
+
+def generate_script(plan: Any, persona: Dict[str, Any], config: OpenAIConfig) -> str:
+    helper = OpenAIHelper(config)
+    response = helper.complete(_script_messages(plan, persona, config), max_tokens=2000)
     return response
+
+
+def _segment_messages(context: Dict[str, Any], persona: Dict[str, Any]) -> List[Dict[str, str]]:
+    if context.get("opening"):
+        position = "這是節目的開場段，請先向聽眾問早。\n"
+    elif context.get("closing"):
+        position = "這是節目的最後一段，請自然地收尾。\n"
+    else:
+        position = ""
+    prompt = SEGMENT_PROMPT.format(
+        position=position,
+        segment=compact_json(context["segment"]),
+        material=compact_json(context["material"]),
+        previous=context.get("previous") or "無",
+        next=context.get("next") or "無",
+        persona=compact_json(persona),
+    )
+    return [
+        {"role": "system", "content": build_system_prompt(persona)},
+        {"role": "user", "content": prompt},
+    ]
+
+
+def _segment_ssml(response: str) -> str:
+    """The ``<p>`` elements of a segment response, wrapping bare text when the model skipped them."""
+    found = _PARAGRAPH.findall(response)
+    if found:
+        return "".join(found)
+    return "".join(
+        "<p>" + "".join(f"<s>{html.escape(sentence)}</s>" for sentence in group) + "</p>"
+        for group in paragraphs(_WRAPPER.sub("", response))
+    )
+
+
+def generate_segment_scripts(
+    contexts: Sequence[Dict[str, Any]], persona: Dict[str, Any], config: OpenAIConfig
+) -> List[str]:
+    """Write the SSML paragraphs of several plan segments concurrently, one request per segment."""
+    helper = OpenAIHelper(config)
+    responses = helper.complete_many([_segment_messages(context, persona) for context in contexts], max_tokens=800)
+    return [_segment_ssml(response) for response in responses]
+
+
+def generate_script_stream(plan: Any, persona: Dict[str, Any], config: OpenAIConfig) -> Iterator[str]:
+    """Stream the LLM-C completion as raw text deltas."""
+    helper = OpenAIHelper(config)
+    yield from helper.stream(_script_messages(plan, persona, config), max_tokens=2000)
+
+
+def iter_script_paragraphs(deltas: Iterable[str]) -> Iterator[Tuple[List[str], bool]]:
+    """Cut a streamed script into speakable pieces as soon as they are complete.
+
+    Deltas go through the shared sentence segmenter, so SSML and Markdown are
+    parsed exactly as for whole scripts. Yields ``(sentences, paragraph_end)``:
+    a piece ends with its paragraph, or at a sentence end once it is long
+    enough to be worth a TTS call.
+    """
+    piece: List[str] = []
+    size = 0
+    for sentence in iter_sentences(deltas, AUTO):
+        piece.append(sentence.text)
+        size += len(sentence.text)
+        if sentence.paragraph_end or size >= _MIN_SENTENCE_CHUNK:
+            yield piece, sentence.paragraph_end
+            piece, size = [], 0
+    if piece:
+        yield piece, True
@@ -1,10 +1,18 @@
 """LLM-A: refine structured data into spoken lines."""
 from __future__ import annotations
 
-from typing import Any, Dict, Iterable, List
+import json
+import re
+from typing import Any, Dict, Iterable, List, Optional
 
+from ..utils.logging import get_logger
+from ..utils.tokens import estimate_tokens
 from .base import OpenAIConfig, OpenAIHelper
 
+logger = get_logger(__name__)
+
+SYSTEM_PROMPT = "You are a Taiwanese Mandarin radio copywriter."
+
 PROMPT_TEMPLATE = (
     "你是溫暖幽默的電台撰稿員。\n"
     "請將以下資料改寫成可口語播報的一句話，保持生活化語氣。\n"
@@ -12,17 +20,136 @@ PROMPT_TEMPLATE = (
     "輸出：\n以 JSON 格式回傳，包含 spoken_line 欄位。"
 )
 
+BATCH_PROMPT_TEMPLATE = (
+    "你是溫暖幽默的電台撰稿員。\n"
+    "請將以下每一筆資料各自改寫成可口語播報的一句話，保持生活化語氣。\n"
+    "輸入（共 {count} 筆，index 從 0 開始）：\n{inputs}\n"
+    "輸出：\n只回傳一個 JSON array，長度為 {count}，"
+    '每個元素為 {{"index": 對應的 index, "spoken_line": "..."}}，不要加任何說明。'
+)
+
+
+def refine_items(
+    items: Iterable[Dict[str, Any]],
+    config: OpenAIConfig,
+    *,
+    batch_token_budget: Optional[int] = None,
+) -> List[str]:
+    """Return one spoken line per item.
 
-def refine_items(items: Iterable[Dict[str, Any]], config: OpenAIConfig) -> List[str]:
+    Items that already carry a ``spoken_line`` (e.g. condensed upstream by the
+    email bot) are used as-is without an LLM call. With ``batch_token_budget``
+    the remaining items are packed into as few requests as fit the budget;
+    items whose batched answer is missing or invalid are retried one by one.
+    An item whose own request fails falls back to its ``summary`` (or ``""``).
+    Requests are issued concurrently, bounded by ``config.max_concurrency``.
+    """
     helper = OpenAIHelper(config)
-    spoken_lines: List[str] = []
-    for item in items:
-        user_prompt = PROMPT_TEMPLATE.format(input=item)
-        response = helper.complete(
-            [
-                {"role": "system", "content": "You are a Taiwanese Mandarin radio copywriter."},
-                {"role": "user", "content": user_prompt},
-            ]
+    items = list(items)
+    spoken_lines: List[Optional[str]] = [None] * len(items)
+    pending: List[int] = []
+    for index, item in enumerate(items):
+        if item.get("spoken_line"):
+            spoken_lines[index] = str(item["spoken_line"]).strip()
+        else:
+            pending.append(index)
+
+    if batch_token_budget and len(pending) > 1:
+        batches = _pack_batches(items, pending, batch_token_budget)
+        responses = helper.complete_many(
+            [_batch_messages([items[i] for i in batch]) for batch in batches],
+            return_exceptions=True,
         )
-        spoken_lines.append(response.strip())
-    return spoken_lines
+        for batch, response in zip(batches, responses):
+            if isinstance(response, Exception):
+                logger.warning("LLM-A batch of %d items failed: %s", len(batch), response)
+                continue
+            for index, line in zip(batch, _parse_batch_response(response, len(batch))):
+                spoken_lines[index] = line
+        retries = [index for index in pending if not spoken_lines[index]]
+        if retries:
+            logger.warning("LLM-A batch left %d of %d items unresolved; retrying individually", len(retries), len(pending))
+        pending = retries
+
+    responses = helper.complete_many([_single_messages(items[index]) for index in pending], return_exceptions=True)
+    for index, response in zip(pending, responses):
+        if isinstance(response, Exception):
+            # One failed item must not discard the lines that did come back.
+            logger.warning("LLM-A failed for item %d: %s; using its summary", index, response)
+            spoken_lines[index] = str(items[index].get("summary") or "").strip()
+        else:
+            spoken_lines[index] = _extract_spoken_line(response)
+    return [line or "" for line in spoken_lines]
+
+
+def _single_messages(item: Dict[str, Any]) -> List[Dict[str, str]]:
+    return [
+        {"role": "system", "content": SYSTEM_PROMPT},
+        {"role": "user", "content": PROMPT_TEMPLATE.format(input=item)},
+    ]
+
+
+def _batch_messages(batch: List[Dict[str, Any]]) -> List[Dict[str, str]]:
+    inputs = "\n".join(f"[{index}] {_serialise_item(item)}" for index, item in enumerate(batch))
+    return [
+        {"role": "system", "content": SYSTEM_PROMPT},
+        {"role": "user", "content": BATCH_PROMPT_TEMPLATE.format(count=len(batch), inputs=inputs)},
+    ]
+
+
+def _pack_batches(items: List[Dict[str, Any]], indices: List[int], token_budget: int) -> List[List[int]]:
+    overhead = estimate_tokens(SYSTEM_PROMPT) + estimate_tokens(BATCH_PROMPT_TEMPLATE)
+    batches: List[List[int]] = []
+    current: List[int] = []
+    used = overhead
+    for index in indices:
+        cost = estimate_tokens(_serialise_item(items[index])) + 4
+        if current and used + cost > token_budget:
+            batches.append(current)
+            current, used = [], overhead
+        current.append(index)
+        used += cost
+    if current:
+        batches.append(current)
+    return batches
+
+
+def _serialise_item(item: Dict[str, Any]) -> str:
+    return json.dumps(item, ensure_ascii=False, separators=(",", ":"), default=str)
+
+
+def _strip_code_fence(text: str) -> str:
+    text = text.strip()
+    if text.startswith("```"):
+        text = re.sub(r"^```[a-zA-Z0-9]*\n?", "", text)
+        text = re.sub(r"```$", "", text)
+    return text.strip()
+
+
+def _extract_spoken_line(response: str) -> str:
+    """Pull ``spoken_line`` out of a JSON answer, falling back to the raw reply as before."""
+    try:
+        data = json.loads(_strip_code_fence(response))
+    except json.JSONDecodeError:
+        return response.strip()
+    if isinstance(data, dict) and isinstance(data.get("spoken_line"), str) and data["spoken_line"].strip():
+        return data["spoken_line"].strip()
+    return response.strip()
+
+
+def _parse_batch_response(response: str, count: int) -> List[Optional[str]]:
+    lines: List[Optional[str]] = [None] * count
+    try:
+        data = json.loads(_strip_code_fence(response))
+    except json.JSONDecodeError:
+        return lines
+    if not isinstance(data, list):
+        return lines
+    for position, entry in enumerate(data):
+        if not isinstance(entry, dict):
+            continue
+        index = entry.get("index", position)
+        line = entry.get("spoken_line")
+        if isinstance(index, int) and 0 <= index < count and isinstance(line, str) and line.strip() and lines[index] is None:
+            lines[index] = line.strip()
+    return lines
@@ -0,0 +1,176 @@
+"""Per-segment show units, so a re-run only regenerates the segments whose inputs changed."""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from ..audio.mixer import SongSegmentPlan
+from ..tts.base import SentenceTimings
+from ..utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+# The only plan fields LLM-C writes a segment from; ``reason`` and ``song`` are planner notes.
+SCRIPT_FIELDS = ("title", "emotion")
+
+
+def _digest(value: Any) -> str:
+    material = json.dumps(value, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+def segment_material(segment: Dict[str, Any], spoken_lines: Sequence[str]) -> List[str]:
+    """Spoken lines a segment draws on; all of them when the planner did not list any."""
+    indices = segment.get("lines")
+    if not isinstance(indices, list):
+        return list(spoken_lines)
+    picked: List[str] = []
+    for index in indices:
+        try:
+            position = int(index)
+        except (TypeError, ValueError):
+            continue
+        if 0 <= position < len(spoken_lines):
+            picked.append(spoken_lines[position])
+    return picked
+
+
+@dataclass(slots=True)
+class SegmentUnit:
+    """One plan segment with its script paragraphs and voice audio."""
+
+    index: int
+    context: Dict[str, Any]
+    input_hash: str
+    script: str = ""
+    voice_path: Optional[Path] = None
+    timings: Optional[SentenceTimings] = None
+    script_reused: bool = False
+    voice_reused: bool = False
+    # ``cache_identity`` of the engine that voices (or voiced) the segment.
+    voice_identity: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def voice_hash(self) -> str:
+        """Key of the segment's audio: its script plus the engine, voice and format speaking it."""
+        return _digest({"script": self.script, "engine": self.voice_identity})
+
+
+def build_units(
+    segments: Sequence[Dict[str, Any]],
+    spoken_lines: Sequence[str],
+    *,
+    persona: Dict[str, Any],
+    model: str,
+) -> List[SegmentUnit]:
+    """Turn plan segments into units hashed by everything their script is written from.
+
+    That is the segment's title and emotion, the spoken lines it uses, its
+    neighbours' titles (for transitions), whether it opens or closes the show,
+    the persona and the model. The context is also what LLM-C is prompted
+    with, so a change to any other plan field (ids, line indices, reasons)
+    leaves the segment untouched.
+    """
+    units: List[SegmentUnit] = []
+    for index, segment in enumerate(segments):
+        context = {
+            "segment": {key: segment.get(key) for key in SCRIPT_FIELDS},
+            "material": segment_material(segment, spoken_lines),
+            "previous": segments[index - 1].get("title") if index > 0 else None,
+            "next": segments[index + 1].get("title") if index + 1 < len(segments) else None,
+            "opening": index == 0,
+            "closing": index == len(segments) - 1,
+        }
+        input_hash = _digest({"context": context, "persona": persona, "model": model})
+        units.append(SegmentUnit(index=index, context=context, input_hash=input_hash))
+    return units
+
+
+@dataclass(slots=True)
+class _Manifest:
+    scripts: Dict[str, str] = field(default_factory=dict)
+    voices: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    hooks: Dict[str, float] = field(default_factory=dict)
+
+
+class IncrementalStore:
+    """Scripts, voice audio, song hooks and bed excerpts of one show, keyed by their input hashes.
+
+    ``manifest.json`` maps unit input hashes to script paragraphs and voice
+    hashes (script plus engine identity) to rendered voice files; audio lives next to it. Recording a run
+    drops units the show no longer uses, so the store stays the size of one
+    show.
+    """
+
+    def __init__(self, directory: Path):
+        self.directory = Path(directory)
+        self.manifest_path = self.directory / "manifest.json"
+        self._lock = threading.Lock()
+        self._manifest = _Manifest()
+        if self.manifest_path.exists():
+            try:
+                data = json.loads(self.manifest_path.read_text(encoding="utf-8"))
+                self._manifest = _Manifest(
+                    scripts=data.get("scripts", {}), voices=data.get("voices", {}), hooks=data.get("hooks", {})
+                )
+            except (OSError, json.JSONDecodeError, AttributeError) as exc:
+                logger.warning("Ignoring unreadable incremental manifest %s: %s", self.manifest_path, exc)
+
+    def script_for(self, input_hash: str) -> Optional[str]:
+        with self._lock:
+            return self._manifest.scripts.get(input_hash)
+
+    def voice_path(self, voice_hash: str) -> Path:
+        return self.directory / "voice" / f"{voice_hash[:24]}.wav"
+
+    def voice_for(self, voice_hash: str) -> Optional[Tuple[Path, Optional[SentenceTimings]]]:
+        with self._lock:
+            entry = self._manifest.voices.get(voice_hash)
+        path = self.voice_path(voice_hash)
+        if entry is None or not path.exists():
+            return None
+        return path, entry.get("timings")
+
+    @staticmethod
+    def _song_key(path: Path) -> str:
+        stat = path.stat()
+        return f"{path}:{stat.st_size}:{int(stat.st_mtime)}"
+
+    def hook_for(self, song_path: Path) -> Optional[float]:
+        with self._lock:
+            return self._manifest.hooks.get(self._song_key(song_path))
+
+    def remember_hook(self, song_path: Path, seconds: float) -> None:
+        with self._lock:
+            self._manifest.hooks[self._song_key(song_path)] = seconds
+            self._save()
+
+    def bed_path(self, plan: SongSegmentPlan) -> Path:
+        """Where the excerpt described by ``plan`` is kept; it is reusable while the path exists."""
+        key = _digest([self._song_key(plan.source), round(plan.start, 2), plan.duration, plan.fade_in, plan.fade_out])
+        return self.directory / "beds" / f"{key[:24]}.wav"
+
+    def record(self, units: Sequence[SegmentUnit]) -> None:
+        """Store this run's units and delete voice files no unit refers to any more."""
+        with self._lock:
+            self._manifest.scripts = {unit.input_hash: unit.script for unit in units}
+            self._manifest.voices = {unit.voice_hash: {"timings": unit.timings} for unit in units}
+            self._save()
+            keep = {self.voice_path(voice_hash).name for voice_hash in self._manifest.voices}
+        voice_dir = self.directory / "voice"
+        if voice_dir.exists():
+            for path in voice_dir.glob("*.wav"):
+                if path.name not in keep:
+                    path.unlink(missing_ok=True)
+
+    def _save(self) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.manifest_path.with_suffix(".tmp")
+        payload = {"scripts": self._manifest.scripts, "voices": self._manifest.voices, "hooks": self._manifest.hooks}
+        tmp_path.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+        os.replace(tmp_path, self.manifest_path)
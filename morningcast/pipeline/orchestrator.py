@@ -2,40 +2,72 @@
 from __future__ import annotations
 
 import json
+import math
 import os
 import re
-from dataclasses import dataclass
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import asdict, dataclass
 from datetime import date, datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 from dotenv import load_dotenv
 
+from ..audio.duration_model import DurationModel
 from ..audio.hook_finder import find_hook
 from ..audio.mixer import (
     SongSegmentPlan,
     append_full_song,
     crossfade_tracks,
     duck_voice_over,
+    duck_with_envelope,
     extract_segment,
     export_with_metadata,
+    speech_regions,
+    stitch_voice_chunks,
+    trim_to_duration,
+    wav_duration,
 )
 from ..data.email_parser import load_email_summary
 from ..data.songs_loader import SongMetadata, load_songs
 from ..data.weather import WeatherForecast, WeatherRequest, fetch_weather
 from ..llm.base import OpenAIConfig
-from ..llm.program_planner import plan_program
-from ..llm.script_generator import generate_script
+from ..llm.cache import LLMResponseCache
+from ..llm.metrics import LLMMetrics
+from ..llm.program_planner import request_plan
+from ..llm.script_generator import (
+    generate_script,
+    generate_script_stream,
+    generate_segment_scripts,
+    iter_script_paragraphs,
+)
 from ..llm.semantic_refiner import refine_items
+from ..replay.fixtures import FixtureStore, ReplayTTSEngine
 from ..tts.azure_tts import AzureTTSEngine
-from ..tts.base import TextToSpeechEngine
+from ..tts.base import SentenceTimings, TextToSpeechEngine
+from ..tts.cache import CachedTTSEngine, TTSAudioCache
+from ..tts.selector import EngineHealthStore, TTSSelector
+from ..tts.timing import place_chunk_timings
+from ..tts.chunked import PARAGRAPH_PAUSE, SENTENCE_PAUSE, VoiceChunk, render_chunk, render_chunks, split_plain_text, split_ssml
 from ..tts.edge_tts_fallback import EdgeTTSEngine
 from ..tts.elevenlabs_tts import ElevenLabsTTSEngine
 from ..utils.logging import get_logger
+from ..utils.segmenter import MARKDOWN, SSML, join_sentences, ssml_from_paragraphs, to_plain_text, to_ssml
 from ..utils.time import timestamp_slug
+from .incremental import IncrementalStore, SegmentUnit, build_units
 
 logger = get_logger(__name__)
 
+# Bed excerpt per song when the show length is unknown, and the floor when sizing to an estimate.
+BED_EXCERPT_SECONDS = 45.0
+MIN_BED_EXCERPT_SECONDS = 20.0
+BED_CROSSFADE_SECONDS = 4.0
+# Beds are planned this much longer than estimated, then trimmed to the voice plus a short tail.
+BED_MARGIN = 1.15
+BED_TAIL_SECONDS = 3.0
+# Incremental runs round excerpt lengths up to this step so small length changes reuse excerpts.
+BED_EXCERPT_STEP_SECONDS = 5.0
+
 
 @dataclass(slots=True)
 class PipelineConfig:
@@ -51,6 +83,27 @@ class PipelineConfig:
     output_dir: Path = Path("out")
     llm_api_key: Optional[str] = None
     llm_models: Dict[str, str] = None  # type: ignore[assignment]
+    refiner_batch_tokens: int = 3000
+    llm_concurrency: int = 4
+    llm_timeout: Optional[float] = 60.0
+    llm_cache_dir: Optional[Path] = None
+    llm_cache_ttl_hours: float = 72.0
+    llm_cache_max_mb: int = 64
+    llm_cache_bypass: Tuple[str, ...] = ()
+    stream_script: bool = False
+    prompt_token_budgets: Dict[str, int] = None  # type: ignore[assignment]
+    fixture_dir: Optional[Path] = None
+    fixture_mode: str = "record"
+    fixture_latency: float = 0.0
+    tts_chunk_chars: int = 0
+    tts_workers: int = 4
+    # The cache works per sentence, so setting it implies chunked synthesis whatever tts_chunk_chars is.
+    tts_cache_dir: Optional[Path] = None
+    tts_cache_max_mb: int = 256
+    tts_health_path: Optional[Path] = None
+    tts_hedge: bool = False
+    duration_model_path: Optional[Path] = None
+    incremental: bool = False
 
     def __post_init__(self) -> None:  # pragma: no cover - dataclass hook
         if self.llm_models is None:
@@ -59,6 +112,8 @@ class PipelineConfig:
                 "planner": "gpt-4o",
                 "script": "gpt-4o",
             }
+        # Overrides are per stage; 0 disables trimming for that stage.
+        self.prompt_token_budgets = {"planner": 6000, "script": 6000, **(self.prompt_token_budgets or {})}
 
 
 class MorningCastPipeline:
@@ -67,9 +122,38 @@ class MorningCastPipeline:
         self.config = config
         self.config.output_dir.mkdir(parents=True, exist_ok=True)
         self.persona = self._load_persona(config.persona_path)
+        self.llm_cache: Optional[LLMResponseCache] = None
+        if config.llm_cache_dir:
+            self.llm_cache = LLMResponseCache(
+                config.llm_cache_dir,
+                ttl_seconds=config.llm_cache_ttl_hours * 3600,
+                max_bytes=config.llm_cache_max_mb * 1024 * 1024,
+            )
+            logger.info("LLM response cache enabled at %s", config.llm_cache_dir)
+        self.tts_cache: Optional[TTSAudioCache] = None
+        if config.tts_cache_dir:
+            self.tts_cache = TTSAudioCache(config.tts_cache_dir, max_bytes=config.tts_cache_max_mb * 1024 * 1024)
+            logger.info("TTS audio cache enabled at %s", config.tts_cache_dir)
+        self.tts_selector = TTSSelector(
+            self._tts_candidates(),
+            EngineHealthStore(config.tts_health_path or config.output_dir / "tts_health.json"),
+            hedge=config.tts_hedge,
+        )
+        self.duration_model = DurationModel(config.duration_model_path or config.output_dir / "duration_model.json")
+        self.llm_metrics = LLMMetrics()
+        self.fixtures: Optional[FixtureStore] = None
+        if config.fixture_dir:
+            self.fixtures = FixtureStore(config.fixture_dir, config.fixture_mode, latency_scale=config.fixture_latency)
+            logger.info("Fixture %s mode using %s", config.fixture_mode, config.fixture_dir)
         logger.info("Pipeline configured for %s", config.date)
 
     def run(self) -> Dict[str, Any]:
+        try:
+            return self._produce_show()
+        finally:
+            self.tts_selector.close()
+
+    def _produce_show(self) -> Dict[str, Any]:
         logger.info("Starting MorningCast pipeline")
         email_data = load_email_summary(self.config.email_json)
         songs = load_songs(self.config.songs_csv)
@@ -90,31 +174,91 @@ class MorningCastPipeline:
             structured_items.append({"category": "calendar", **event})
 
         spoken_lines = self._run_llm_a(structured_items)
-        plan_json = self._run_llm_b(spoken_lines, weather, songs, calendar_events, email_data)
-        script = self._run_llm_c(plan_json)
+        plan_json = self._run_llm_b(
+            list(zip(structured_items, spoken_lines)), weather, songs, calendar_events, email_data
+        )
 
         slug = timestamp_slug(datetime.combine(self.config.date, datetime.min.time()))
-        transcript_path = self.config.output_dir / f"podcast_{slug}.md"
-        transcript_path.write_text(script, encoding="utf-8")
-        logger.info("Transcript saved to %s", transcript_path)
-
-        plain_text, ssml = self._prepare_script_variants(script)
-        plaintext_path = self.config.output_dir / f"podcast_{slug}.txt"
-        plaintext_path.write_text(plain_text, encoding="utf-8")
-        logger.info("Plain text transcript saved to %s", plaintext_path)
+        voice_path = self.config.output_dir / f"podcast_{slug}_voice.wav"
+        voice_timings: SentenceTimings = []
+        store: Optional[IncrementalStore] = None
+        units: List[SegmentUnit] = []
+        if self.config.incremental:
+            store = IncrementalStore(self.config.output_dir / "incremental" / slug)
+            if self.config.stream_script:
+                logger.warning("--stream-script is ignored in incremental mode")
+        expected_voice = self._expected_voice()
+        # The bed only needs the show length, so it is prepared while TTS runs and trimmed afterwards.
+        bed_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="music-bed")
+        try:
+            bed_future: Optional[Future] = None
+            estimated_seconds: Optional[float] = None
+            if store:
+                units = self._write_segment_units(plan_json, store)
+                script = "<speak>" + "".join(unit.script for unit in units) + "</speak>"
+            elif self.config.stream_script:
+                estimated_seconds = self.duration_model.typical(expected_voice)
+                bed_future = bed_pool.submit(self._build_music_mix, plan_json, songs, slug, target_seconds=estimated_seconds)
+                script, voice_timings = self._run_llm_c_streaming(plan_json, voice_path, slug)
+            else:
+                script = self._run_llm_c(plan_json)
+
+            transcript_path = self.config.output_dir / f"podcast_{slug}.md"
+            transcript_path.write_text(script, encoding="utf-8")
+            logger.info("Transcript saved to %s", transcript_path)
+
+            plain_text, ssml = self._prepare_script_variants(script)
+            plaintext_path = self.config.output_dir / f"podcast_{slug}.txt"
+            plaintext_path.write_text(plain_text, encoding="utf-8")
+            logger.info("Plain text transcript saved to %s", plaintext_path)
+
+            plan_json["llm_metrics"] = self.llm_metrics.summary()
+            self.llm_metrics.log_summary()
+
+            if store or not self.config.stream_script:
+                estimated_seconds = self.duration_model.estimate(ssml, expected_voice).seconds
+                logger.info("Estimated voice track length %.1fs (%s)", estimated_seconds, expected_voice)
+                bed_future = bed_pool.submit(
+                    self._build_music_mix, plan_json, songs, slug, target_seconds=estimated_seconds, store=store
+                )
+                if store:
+                    voice_timings = self._render_segment_units(units, store, voice_path, slug)
+                    plan_json["incremental"] = {
+                        "segments": len(units),
+                        "scripts_regenerated": sum(1 for unit in units if not unit.script_reused),
+                        "voices_resynthesised": sum(1 for unit in units if not unit.voice_reused),
+                    }
+                else:
+                    voice_timings = self._render_tts(plain_text, ssml, voice_path, slug)
+            plan_json["tts"] = self._tts_report()
+            plan_json["voice_timings"] = voice_timings
+            voice_seconds = wav_duration(voice_path)
+            plan_json["duration"] = {
+                "estimated_seconds": round(estimated_seconds, 2) if estimated_seconds is not None else None,
+                "voice_seconds": round(voice_seconds, 2),
+            }
+            self._calibrate_duration(ssml, plan_json["tts"]["engines"], voice_seconds)
 
-        timeline_path = self.config.output_dir / f"podcast_{slug}.json"
-        timeline_path.write_text(json.dumps(plan_json, ensure_ascii=False, indent=2), encoding="utf-8")
+            timeline_path = self.config.output_dir / f"podcast_{slug}.json"
+            timeline_path.write_text(json.dumps(plan_json, ensure_ascii=False, indent=2), encoding="utf-8")
 
-        voice_path = self.config.output_dir / f"podcast_{slug}_voice.wav"
-        self._render_tts(plain_text, ssml, voice_path)
+            music_mix_path, final_song_path = bed_future.result()  # type: ignore[union-attr]
+        finally:
+            # Also on failure: a queued bed build is cancelled and a running one is joined, not leaked.
+            bed_pool.shutdown(cancel_futures=True)
 
-        music_mix_path, final_song_path = self._build_music_mix(plan_json, songs, slug)
         ducked_path: Path
         if music_mix_path:
+            bed_path = music_mix_path.with_name(f"music_bed_{slug}.wav")
+            music_mix_path = trim_to_duration(music_mix_path, bed_path, voice_seconds + BED_TAIL_SECONDS)
             ducked_path = self.config.output_dir / f"podcast_{slug}_mix.wav"
-            duck_voice_over(music_mix_path, voice_path, ducked_path)
-            logger.info("Voice and background bed mixed to %s", ducked_path)
+            if voice_timings:
+                regions = speech_regions(voice_timings)
+                duck_with_envelope(music_mix_path, voice_path, ducked_path, regions)
+                logger.info("Voice and background bed mixed to %s (%d speech regions)", ducked_path, len(regions))
+            else:
+                duck_voice_over(music_mix_path, voice_path, ducked_path)
+                logger.info("Voice and background bed mixed to %s", ducked_path)
         else:
             ducked_path = voice_path
 
@@ -136,6 +280,10 @@ class MorningCastPipeline:
             },
         )
 
+        if self.llm_cache:
+            logger.info("LLM cache stats: %s", self.llm_cache.stats())
+        if self.tts_cache:
+            logger.info("TTS cache stats: %s", self.tts_cache.stats())
         logger.info("MorningCast pipeline completed")
         return {
             "transcript_path": transcript_path,
@@ -153,26 +301,55 @@ class MorningCastPipeline:
 
     def _get_weather(self) -> WeatherForecast:
         request = WeatherRequest(latitude=self.config.latitude, longitude=self.config.longitude, city=self.config.city)
-        weather = fetch_weather(request)
+        if self.fixtures:
+            data = self.fixtures.call_json(
+                "weather",
+                {"request": asdict(request), "date": self.config.date},
+                lambda: asdict(fetch_weather(request)),
+            )
+            weather = WeatherForecast(**{**data, "date": date.fromisoformat(str(data["date"]))})
+        else:
+            weather = fetch_weather(request)
         logger.info("Weather fetched: %s %s-%s", weather.city, weather.temperature_low, weather.temperature_high)
         return weather
 
+    def _llm_config(self, stage: str, *, temperature: float) -> OpenAIConfig:
+        return OpenAIConfig(
+            api_key=self.config.llm_api_key or os.environ.get("OPENAI_API_KEY", ""),
+            model=self.config.llm_models[stage],
+            temperature=temperature,
+            timeout=self.config.llm_timeout,
+            max_concurrency=self.config.llm_concurrency,
+            cache=self.llm_cache,
+            use_cache=stage not in self.config.llm_cache_bypass,
+            prompt_token_budget=self.config.prompt_token_budgets.get(stage) or None,
+            fixtures=self.fixtures,
+            stage=stage,
+            metrics=self.llm_metrics,
+        )
+
     def _run_llm_a(self, items: List[Dict[str, Any]]) -> List[str]:
-        config = OpenAIConfig(api_key=self.config.llm_api_key or os.environ.get("OPENAI_API_KEY", ""), model=self.config.llm_models["refiner"], temperature=0.6)
-        lines = refine_items(items, config)
-        logger.info("LLM-A produced %d spoken lines", len(lines))
+        config = self._llm_config("refiner", temperature=0.6)
+        lines = refine_items(items, config, batch_token_budget=self.config.refiner_batch_tokens or None)
+        precomputed = sum(1 for item in items if item.get("spoken_line"))
+        logger.info("LLM-A produced %d spoken lines (%d precomputed upstream)", len(lines), precomputed)
         return lines
 
     def _run_llm_b(
         self,
-        spoken_lines: List[str],
+        spoken: List[Tuple[Dict[str, Any], str]],
         weather: WeatherForecast,
         songs: List[SongMetadata],
         calendar_events: List[Dict[str, Any]],
         email_data: List[Dict[str, Any]],
     ) -> Dict[str, Any]:
+        # Weather and calendar lines first, then emails (already ordered by importance upstream),
+        # so budget trimming drops the least important email lines first. ``spoken`` pairs each
+        # line with its item, so this does not depend on where the emails sit in the list.
+        email_ids = {id(item) for item in email_data}
+        ordered = sorted(spoken, key=lambda pair: id(pair[0]) in email_ids)
         payload = {
-            "spoken_lines": spoken_lines,
+            "spoken_lines": [line for _, line in ordered],
             "emails": email_data,
             "weather": {
                 "city": weather.city,
@@ -191,47 +368,139 @@ class MorningCastPipeline:
                 for song in songs
             ],
         }
-        config = OpenAIConfig(api_key=self.config.llm_api_key or os.environ.get("OPENAI_API_KEY", ""), model=self.config.llm_models["planner"], temperature=0.4)
-        response = plan_program(payload, config)
-        response = response.strip()
-        if response.startswith("```"):
-            response = re.sub(r"^```[a-zA-Z0-9]*\n", "", response)
-            response = re.sub(r"```$", "", response)
-            response = response.strip()
-        try:
-            plan = json.loads(response)
-        except json.JSONDecodeError as exc:
-            logger.error("Failed to parse LLM-B response: %s", response)
-            raise RuntimeError("Invalid LLM-B output") from exc
-        logger.info("LLM-B produced %d segments", len(plan))
+        config = self._llm_config("planner", temperature=0.4)
+        result = request_plan(payload, config, require_lines=self.config.incremental)
+        logger.info("LLM-B produced %d segments", len(result.segments))
         return {
             "generated_at": datetime.utcnow().isoformat() + "Z",
             "inputs": payload,
-            "segments": plan,
+            "segments": result.segments,
+            "planner": {
+                "repair_attempts": result.repair_attempts,
+                "repair_seconds": result.repair_seconds,
+            },
         }
 
     def _run_llm_c(self, plan: Dict[str, Any]) -> str:
-        config = OpenAIConfig(api_key=self.config.llm_api_key or os.environ.get("OPENAI_API_KEY", ""), model=self.config.llm_models["script"], temperature=0.7)
+        config = self._llm_config("script", temperature=0.7)
         script = generate_script(plan, self.persona, config)
         logger.info("LLM-C generated script of length %d characters", len(script))
         return script
 
-    def _select_tts_engine(self) -> TextToSpeechEngine:
-        try:
-            return AzureTTSEngine()
-        except Exception as exc:
-            logger.warning("Azure TTS unavailable: %s", exc)
-        try:
-            return ElevenLabsTTSEngine()
-        except Exception as exc:
-            logger.warning("ElevenLabs TTS unavailable: %s", exc)
-        logger.info("Falling back to Edge TTS")
-        return EdgeTTSEngine()
+    def _run_llm_c_streaming(self, plan: Dict[str, Any], voice_path: Path, slug: str) -> Tuple[str, SentenceTimings]:
+        """Stream LLM-C and synthesise each finished paragraph while the rest is generated."""
+        config = self._llm_config("script", temperature=0.7)
+        engine = self._select_tts_engine()
+        temp_dir = self.config.output_dir / "tmp"
+        temp_dir.mkdir(exist_ok=True)
+
+        chunks: List[VoiceChunk] = []
+        rendered: List[Future] = []
+        deltas: List[str] = []
+
+        def _collect(stream: Any) -> Any:
+            for delta in stream:
+                deltas.append(delta)
+                yield delta
+
+        # The pool keeps up to tts_workers engine sessions busy while LLM-C keeps streaming.
+        with ThreadPoolExecutor(max_workers=max(1, self.config.tts_workers)) as pool:
+            for sentences, paragraph_end in iter_script_paragraphs(
+                _collect(generate_script_stream(plan, self.persona, config))
+            ):
+                plain = join_sentences(sentences)
+                pause = PARAGRAPH_PAUSE if paragraph_end else SENTENCE_PAUSE
+                chunk = VoiceChunk(plain, ssml_from_paragraphs([sentences]), pause)
+                piece_path = temp_dir / f"voice_{slug}_{len(chunks):03d}.wav"
+                chunks.append(chunk)
+                rendered.append(pool.submit(render_chunk, engine, chunk, piece_path))
+                logger.info("LLM-C piece %d handed to TTS (%d characters)", len(chunks), len(plain))
+            piece_paths = []
+            chunk_timings = []
+            for index, future in enumerate(rendered):
+                chunk_timings.append(future.result()[1])
+                piece_paths.append(temp_dir / f"voice_{slug}_{index:03d}.wav")
+
+        if not piece_paths:
+            raise ValueError("Streaming LLM-C produced no speakable paragraphs")
+        timings = self._stitch_voice(chunks, piece_paths, chunk_timings, voice_path)
+        script = "".join(deltas)
+        logger.info("LLM-C streamed script of length %d characters in %d pieces", len(script), len(piece_paths))
+        logger.info("Voice track rendered to %s", voice_path)
+        return script, timings
 
-    def _render_tts(self, plain_text: str, ssml: str, output_path: Path) -> None:
+    def _select_tts_engine(self) -> TextToSpeechEngine:
+        if self.fixtures and self.fixtures.replaying:
+            return ReplayTTSEngine(self.fixtures)
+        if self.fixtures:
+            return ReplayTTSEngine(self.fixtures, self.tts_selector)
+        return self.tts_selector
+
+    def _tts_candidates(self) -> List[Tuple[str, Callable[[], TextToSpeechEngine]]]:
+        """Engines in preference order; each is wrapped in the audio cache when one is configured."""
+
+        def _cached(factory: Callable[[], TextToSpeechEngine]) -> Callable[[], TextToSpeechEngine]:
+            if not self.tts_cache:
+                return factory
+            return lambda: CachedTTSEngine(factory(), self.tts_cache)  # type: ignore[arg-type]
+
+        return [
+            ("azure", _cached(AzureTTSEngine)),
+            ("elevenlabs", _cached(ElevenLabsTTSEngine)),
+            ("edge", _cached(EdgeTTSEngine)),
+        ]
+
+    def _tts_report(self) -> Dict[str, Any]:
+        parts = [{"file": name, **info} for name, info in sorted(self.tts_selector.rendered.items())]
+        engines: Dict[str, int] = {}
+        for part in parts:
+            engines[part["engine"]] = engines.get(part["engine"], 0) + 1
+        stats = self.tts_selector.stats()
+        logger.info("TTS latency: %s", stats)
+        return {"engines": engines, "latency": stats, "parts": parts}
+
+    def _render_tts(self, plain_text: str, ssml: str, output_path: Path, slug: str) -> SentenceTimings:
+        """Render the voice track and return sentence timings on it (empty when unknown)."""
         engine = self._select_tts_engine()
-        engine.synthesize(plain_text=plain_text, ssml=ssml, output_path=output_path)
+        if self.config.tts_chunk_chars > 0 or self.tts_cache:
+            chunks = self._script_chunks(plain_text, ssml)
+            paths, chunk_timings = render_chunks(
+                engine,
+                chunks,
+                self.config.output_dir / "tmp",
+                stem=f"voice_{slug}",
+                max_workers=self.config.tts_workers,
+            )
+            timings = self._stitch_voice(chunks, paths, chunk_timings, output_path)
+        else:
+            timings = engine.synthesize(plain_text=plain_text, ssml=ssml, output_path=output_path) or []
         logger.info("Voice track rendered to %s", output_path)
+        return timings
+
+    @staticmethod
+    def _stitch_voice(
+        chunks: List[VoiceChunk],
+        paths: List[Path],
+        chunk_timings: List[Optional[SentenceTimings]],
+        output_path: Path,
+    ) -> SentenceTimings:
+        placements = stitch_voice_chunks(paths, output_path, pauses=[chunk.pause_after for chunk in chunks])
+        return place_chunk_timings([chunk.plain for chunk in chunks], chunk_timings, placements)
+
+    def _script_chunks(self, plain_text: str, ssml: str) -> List[VoiceChunk]:
+        """Split the script for chunked TTS, keeping the LLM's SSML markup when it can be regrouped.
+
+        With the TTS cache on, every sentence is its own chunk, wrapped in
+        minimal SSML, so recurring lines hit the cache independently of their
+        neighbours; inline markup inside a paragraph is not kept in that mode.
+        """
+        if self.tts_cache:
+            return [VoiceChunk(text, to_ssml(text), pause) for text, pause in split_plain_text(ssml, 1, markup=SSML)]
+        fragments = split_ssml(ssml, self.config.tts_chunk_chars)
+        if fragments is not None:
+            return [VoiceChunk(to_plain_text(fragment, SSML), fragment, pause) for fragment, pause in fragments]
+        pieces = split_plain_text(plain_text, self.config.tts_chunk_chars)
+        return [VoiceChunk(text, to_ssml(text), pause) for text, pause in pieces]
 
     def _prepare_script_variants(self, script: str) -> tuple[str, str]:
         """Return a plain text version of the script and an SSML rendition."""
@@ -241,16 +510,15 @@ class MorningCastPipeline:
 
         ssml_candidate = self._extract_ssml_block(script)
         if ssml_candidate:
-            plain = self._ssml_to_plain_text(ssml_candidate)
+            plain = to_plain_text(ssml_candidate, SSML)
             if not plain:
                 raise ValueError("SSML block did not contain readable content")
             return plain, ssml_candidate
 
-        plain = self._markdown_to_plain_text(script)
+        plain = to_plain_text(script, MARKDOWN)
         if not plain:
             raise ValueError("Script did not contain any readable content")
-        ssml = self._plain_text_to_ssml(plain)
-        return plain, ssml
+        return plain, to_ssml(plain)
 
     @staticmethod
     def _extract_ssml_block(script: str) -> Optional[str]:
@@ -264,73 +532,123 @@ class MorningCastPipeline:
             return speak_match.group(1).strip()
         return None
 
-    @staticmethod
-    def _ssml_to_plain_text(ssml: str) -> str:
-        import html
-
-        text = re.sub(r"<\/?speak[^>]*>", " ", ssml, flags=re.IGNORECASE)
-        text = re.sub(r"</p>", "\n\n", text, flags=re.IGNORECASE)
-        text = re.sub(r"<[^>]+>", " ", text)
-        text = re.sub(r"[ \t]+", " ", text)
-        text = re.sub(r"\n{3,}", "\n\n", text)
-        text = re.sub(r"\s+\n", "\n", text)
-        text = re.sub(r"\n\s+", "\n", text)
-        return html.unescape(text.strip())
-
-    @staticmethod
-    def _markdown_to_plain_text(script: str) -> str:
-        import html
-
-        text = script
-        text = re.sub(r"```[\s\S]*?```", "\n", text)
-        text = re.sub(r"`([^`]+)`", r"\1", text)
-        text = re.sub(r"\[([^\]]+)\]\([^)]+\)", r"\1", text)
-        text = re.sub(r"[*_]{1,3}([^*_]+)[*_]{1,3}", r"\1", text)
-        text = re.sub(r"^\s{0,3}#+\s*", "", text, flags=re.MULTILINE)
-        text = re.sub(r"^\s{0,3}(?:[-*+]\s+|\d+\.\s+)", "", text, flags=re.MULTILINE)
-        text = re.sub(r"<[^>]+>", " ", text)
-        lines = [line.strip() for line in text.splitlines()]
-
-        paragraphs: List[str] = []
-        current: List[str] = []
-        for line in lines:
-            if not line:
-                if current:
-                    paragraphs.append(" ".join(current))
-                    current = []
-                continue
-            current.append(line)
-        if current:
-            paragraphs.append(" ".join(current))
-
-        cleaned = "\n\n".join(paragraphs).strip()
-        cleaned = re.sub(r"[ \t]+", " ", cleaned)
-        return html.unescape(cleaned)
-
-    @staticmethod
-    def _plain_text_to_ssml(plain_text: str) -> str:
-        import html
-
-        paragraphs = [para.strip() for para in re.split(r"\n\s*\n", plain_text) if para.strip()]
-        if not paragraphs:
-            raise ValueError("Plain text conversion produced no paragraphs")
-
-        sentence_splitter = re.compile(r"(?<=[.!?])\s+")
-        ssml_parts: List[str] = []
-        for para in paragraphs:
-            sentences = [html.escape(sentence.strip()) for sentence in sentence_splitter.split(para) if sentence.strip()]
-            if not sentences:
-                continue
-            ssml_parts.append("<p>" + "".join(f"<s>{sentence}</s>" for sentence in sentences) + "</p>")
+    def _write_segment_units(self, plan: Dict[str, Any], store: IncrementalStore) -> List[SegmentUnit]:
+        """Script every plan segment, asking LLM-C only for segments whose inputs changed."""
+        config = self._llm_config("script", temperature=0.7)
+        units = build_units(
+            plan.get("segments", []),
+            plan.get("inputs", {}).get("spoken_lines", []),
+            persona=self.persona,
+            model=config.model,
+        )
+        pending: List[SegmentUnit] = []
+        for unit in units:
+            script = store.script_for(unit.input_hash)
+            if script is None:
+                pending.append(unit)
+            else:
+                unit.script, unit.script_reused = script, True
+        if pending:
+            scripts = generate_segment_scripts([unit.context for unit in pending], self.persona, config)
+            for unit, script in zip(pending, scripts):
+                unit.script = script
+        logger.info("LLM-C wrote %d of %d segments (%d reused)", len(pending), len(units), len(units) - len(pending))
+        return units
+
+    def _render_segment_units(
+        self, units: List[SegmentUnit], store: IncrementalStore, voice_path: Path, slug: str
+    ) -> SentenceTimings:
+        """Synthesise changed segments only, then splice every segment's audio into the voice track."""
+        expected = self._expected_identity()
+        pending: List[SegmentUnit] = []
+        for unit in units:
+            unit.voice_identity = expected
+            cached = store.voice_for(unit.voice_hash)
+            if cached is None:
+                pending.append(unit)
+            else:
+                unit.voice_path, unit.timings = cached
+                unit.voice_reused = True
+
+        def _render(unit: SegmentUnit) -> None:
+            plain, ssml = self._prepare_script_variants(f"<speak>{unit.script}</speak>")
+            stem = f"voice_{slug}_seg{unit.index:02d}"
+            rendered_path = self.config.output_dir / "tmp" / f"{stem}.wav"
+            rendered_path.parent.mkdir(exist_ok=True)
+            unit.timings = self._render_tts(plain, ssml, rendered_path, f"{slug}_seg{unit.index:02d}")
+            # A segment a fallback engine spoke is stored under that engine, so the next
+            # run with the primary healthy re-synthesises it instead of mixing voices.
+            unit.voice_identity = self._rendered_identity(stem, expected)
+            path = store.voice_path(unit.voice_hash)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(rendered_path, path)
+            unit.voice_path = path
+
+        if pending:
+            with ThreadPoolExecutor(max_workers=max(1, min(self.config.tts_workers, len(pending)))) as pool:
+                list(pool.map(_render, pending))
+        store.record(units)
+        logger.info("Re-synthesised %d of %d segments; splicing voice track", len(pending), len(units))
+
+        placements = stitch_voice_chunks(
+            [unit.voice_path for unit in units],  # type: ignore[misc]
+            voice_path,
+            pauses=[PARAGRAPH_PAUSE] * len(units),
+        )
+        return place_chunk_timings(
+            [to_plain_text(unit.script, SSML) for unit in units],
+            [unit.timings for unit in units],
+            placements,
+        )
 
-        if not ssml_parts:
-            raise ValueError("Plain text sanitisation removed all readable content")
+    def _expected_identity(self) -> Dict[str, Any]:
+        """``cache_identity`` of the engine expected to voice this run."""
+        if self.fixtures and self.fixtures.replaying:
+            return {"engine": "replay"}
+        name = self.tts_selector.preferred_engine()
+        return self.tts_selector.identity(name) if name else {"engine": None}
 
-        return "<speak>" + "".join(ssml_parts) + "</speak>"
+    def _rendered_identity(self, stem: str, expected: Dict[str, Any]) -> Dict[str, Any]:
+        """Identity of the engines that rendered the files named ``stem``/``stem_NNN``."""
+        names = sorted(
+            {
+                info["engine"]
+                for file_name, info in self.tts_selector.rendered.items()
+                if file_name == f"{stem}.wav" or file_name.startswith(f"{stem}_")
+            }
+        )
+        if not names:
+            return expected  # replayed fixtures
+        if len(names) == 1:
+            return self.tts_selector.identity(names[0])
+        return {"engines": [self.tts_selector.identity(name) for name in names]}
+
+    def _expected_voice(self) -> str:
+        """Duration-model key for the engine expected to voice this run."""
+        if self.fixtures and self.fixtures.replaying:
+            return "replay"
+        name = self.tts_selector.preferred_engine()
+        return self.tts_selector.voice_key(name) if name else "default"
+
+    def _calibrate_duration(self, ssml: str, engines: Dict[str, int], voice_seconds: float) -> None:
+        if not engines:
+            return  # replayed audio says nothing about the live engines
+        name = max(engines, key=engines.__getitem__)
+        self.duration_model.observe(ssml, self.tts_selector.voice_key(name), voice_seconds)
 
     def _build_music_mix(
-        self, plan: Dict[str, Any], songs: List[SongMetadata], slug: str
+        self,
+        plan: Dict[str, Any],
+        songs: List[SongMetadata],
+        slug: str,
+        *,
+        target_seconds: Optional[float] = None,
+        store: Optional[IncrementalStore] = None,
     ) -> tuple[Optional[Path], Optional[Path]]:
+        """Extract and crossfade the bed; with ``target_seconds`` excerpts are sized to cover the show.
+
+        With an incremental ``store``, song hooks and excerpts from earlier runs are reused.
+        """
         segments = plan.get("segments", [])
         song_sequence: List[SongMetadata] = []
         for segment in segments:
@@ -352,17 +670,28 @@ class MorningCastPipeline:
             logger.warning("Final song %s is missing on disk", final_song.title)
 
         bed_candidates = song_sequence[:-1]
+        excerpt = BED_EXCERPT_SECONDS
+        if target_seconds and bed_candidates:
+            covered = target_seconds * BED_MARGIN + BED_TAIL_SECONDS + (len(bed_candidates) - 1) * BED_CROSSFADE_SECONDS
+            excerpt = max(MIN_BED_EXCERPT_SECONDS, covered / len(bed_candidates))
+            if store:
+                excerpt = math.ceil(excerpt / BED_EXCERPT_STEP_SECONDS) * BED_EXCERPT_STEP_SECONDS
+            logger.info("Sizing %d bed excerpts to %.1fs each for a %.1fs show", len(bed_candidates), excerpt, target_seconds)
 
         extracted_paths: List[Path] = []
         temp_dir = self.config.output_dir / "tmp"
         temp_dir.mkdir(exist_ok=True)
         for idx, song in enumerate(bed_candidates):
-            hook = find_hook(song.path)
-            output = temp_dir / f"segment_{idx}_{slug}.wav"
-            extract_segment(
-                SongSegmentPlan(source=song.path, start=max(hook.time_seconds - 15, 0), duration=45.0),
-                output,
-            )
+            hook_seconds = store.hook_for(song.path) if store else None
+            if hook_seconds is None:
+                hook_seconds = find_hook(song.path).time_seconds
+                if store:
+                    store.remember_hook(song.path, hook_seconds)
+            segment_plan = SongSegmentPlan(source=song.path, start=max(hook_seconds - 15, 0), duration=excerpt)
+            output = store.bed_path(segment_plan) if store else temp_dir / f"segment_{idx}_{slug}.wav"
+            if not (store and output.exists()):
+                output.parent.mkdir(parents=True, exist_ok=True)
+                extract_segment(segment_plan, output)
             extracted_paths.append(output)
 
         if not extracted_paths:
@@ -370,7 +699,7 @@ class MorningCastPipeline:
             return None, final_song_path
 
         mix_path = temp_dir / f"music_mix_{slug}.wav"
-        crossfade_tracks(extracted_paths, mix_path)
+        crossfade_tracks(extracted_paths, mix_path, crossfade=BED_CROSSFADE_SECONDS)
         logger.info("Music mix rendered to %s", mix_path)
         return mix_path, final_song_path
 
@@ -382,6 +711,11 @@ class MorningCastPipeline:
         return None
 
     def _get_calendar_events(self) -> List[Dict[str, Any]]:
+        if self.fixtures:
+            return self.fixtures.call_json("calendar", {"date": self.config.date, "days": 1}, self._fetch_calendar_events)
+        return self._fetch_calendar_events()
+
+    def _fetch_calendar_events(self) -> List[Dict[str, Any]]:
         if not self.config.calendar_credentials or not self.config.calendar_credentials.exists():
             return []
         from ..data.calendar import CalendarConfig, fetch_events
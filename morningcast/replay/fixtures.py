@@ -0,0 +1,153 @@
+"""Record/replay fixtures so the pipeline can run end-to-end offline."""
+from __future__ import annotations
+
+import hashlib
+import json
+import shutil
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from ..tts.base import SentenceTimings, TextToSpeechEngine
+from ..utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+RECORD = "record"
+REPLAY = "replay"
+
+
+class FixtureMissingError(RuntimeError):
+    """Raised in replay mode when no recording matches a request."""
+
+
+def fixture_key(material: Any) -> str:
+    encoded = json.dumps(material, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+class FixtureStore:
+    """Directory of recorded LLM responses, data fetches and TTS audio.
+
+    In ``record`` mode real calls go through and their results (plus how long
+    they took) are written to ``directory``. In ``replay`` mode the same
+    requests are answered from disk, optionally sleeping for the recorded
+    latency multiplied by ``latency_scale``.
+    """
+
+    def __init__(self, directory: Path, mode: str, *, latency_scale: float = 0.0):
+        if mode not in (RECORD, REPLAY):
+            raise ValueError(f"Unknown fixture mode: {mode}")
+        self.directory = Path(directory)
+        self.mode = mode
+        self.latency_scale = latency_scale
+        self._lock = threading.Lock()
+        for sub in ("llm", "data", "tts"):
+            (self.directory / sub).mkdir(parents=True, exist_ok=True)
+
+    @property
+    def replaying(self) -> bool:
+        return self.mode == REPLAY
+
+    @property
+    def recording(self) -> bool:
+        return self.mode == RECORD
+
+    def simulated_delay(self, elapsed: float) -> float:
+        return max(0.0, elapsed * self.latency_scale)
+
+    def _write_json(self, path: Path, payload: Dict[str, Any]) -> None:
+        tmp_path = path.with_suffix(f".{threading.get_ident()}.tmp")
+        tmp_path.write_text(json.dumps(payload, ensure_ascii=False, indent=2, default=str), encoding="utf-8")
+        tmp_path.replace(path)
+
+    def _read_json(self, path: Path, what: str) -> Dict[str, Any]:
+        try:
+            return json.loads(path.read_text(encoding="utf-8"))
+        except FileNotFoundError as exc:
+            raise FixtureMissingError(f"No recorded {what} fixture at {path}") from exc
+
+    # LLM completions -----------------------------------------------------
+    def load_llm(self, key: str) -> Tuple[str, float, Optional[Dict[str, int]]]:
+        entry = self._read_json(self.directory / "llm" / f"{key}.json", "LLM")
+        return entry["content"], float(entry.get("elapsed", 0.0)), entry.get("usage")
+
+    def save_llm(
+        self,
+        key: str,
+        params: Dict[str, Any],
+        content: str,
+        elapsed: float,
+        usage: Optional[Dict[str, int]] = None,
+    ) -> None:
+        self._write_json(
+            self.directory / "llm" / f"{key}.json",
+            {"model": params.get("model"), "elapsed": round(elapsed, 4), "usage": usage, "content": content},
+        )
+
+    # Generic data fetches (weather, calendar) -----------------------------
+    def call_json(self, kind: str, material: Any, fetch: Callable[[], Any]) -> Any:
+        path = self.directory / "data" / f"{kind}_{fixture_key(material)}.json"
+        if self.replaying:
+            entry = self._read_json(path, kind)
+            time.sleep(self.simulated_delay(float(entry.get("elapsed", 0.0))))
+            return entry["value"]
+        started = time.perf_counter()
+        value = fetch()
+        self._write_json(path, {"elapsed": round(time.perf_counter() - started, 4), "value": value})
+        return value
+
+    # TTS audio -----------------------------------------------------------
+    def tts_paths(self, key: str) -> Tuple[Path, Path]:
+        return self.directory / "tts" / f"{key}.audio", self.directory / "tts" / f"{key}.json"
+
+    def load_tts(self, key: str, output_path: Path) -> Tuple[float, Optional[SentenceTimings]]:
+        """Copy the recorded audio to ``output_path``; returns the recorded latency and timings."""
+        audio_path, meta_path = self.tts_paths(key)
+        entry = self._read_json(meta_path, "TTS")
+        shutil.copyfile(audio_path, output_path)
+        return float(entry.get("elapsed", 0.0)), entry.get("timings")
+
+    def save_tts(
+        self,
+        key: str,
+        rendered_path: Path,
+        engine: str,
+        elapsed: float,
+        timings: Optional[SentenceTimings] = None,
+    ) -> None:
+        audio_path, meta_path = self.tts_paths(key)
+        shutil.copyfile(rendered_path, audio_path)
+        self._write_json(meta_path, {"engine": engine, "elapsed": round(elapsed, 4), "timings": timings})
+
+
+class ReplayTTSEngine(TextToSpeechEngine):
+    """Wrap a real engine to record its audio, or stand in for it during replay.
+
+    Recordings are keyed by the text only, so a replay does not need the
+    credentials of whichever engine produced them.
+    """
+
+    def __init__(self, store: FixtureStore, inner: Optional[TextToSpeechEngine] = None):
+        if store.recording and inner is None:
+            raise ValueError("Recording TTS fixtures requires a real engine")
+        self.store = store
+        self.inner = inner
+
+    def cache_identity(self) -> Dict[str, Any]:
+        return self.inner.cache_identity() if self.inner is not None else {"engine": "replay"}
+
+    def synthesize(self, *, plain_text: str, ssml: str, output_path: Path) -> Optional[SentenceTimings]:
+        key = fixture_key({"plain_text": plain_text, "ssml": ssml})
+        if self.store.replaying:
+            elapsed, timings = self.store.load_tts(key, output_path)
+            time.sleep(self.store.simulated_delay(elapsed))
+            return timings
+
+        started = time.perf_counter()
+        timings = self.inner.synthesize(plain_text=plain_text, ssml=ssml, output_path=output_path)  # type: ignore[union-attr]
+        elapsed = time.perf_counter() - started
+        self.store.save_tts(key, output_path, type(self.inner).__name__, elapsed, timings)
+        logger.debug("Recorded TTS fixture %s (%.2fs)", key[:12], elapsed)
+        return timings
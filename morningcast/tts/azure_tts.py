@@ -3,6 +3,7 @@ from __future__ import annotations
 
 import os
 from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
 
 _IMPORT_ERROR = None
 try:  # pragma: no cover - optional dependency
@@ -11,22 +12,40 @@ except ImportError as exc:  # pragma: no cover - optional dependency
     speechsdk = None  # type: ignore
     _IMPORT_ERROR = exc
 
-from .base import TextToSpeechEngine
+from .base import PCM_FORMAT, SentenceTimings, TextToSpeechEngine
+from .timing import TICKS_PER_SECOND, sentences_from_words
 
 
 class AzureTTSEngine(TextToSpeechEngine):  # pragma: no cover - network service
-    def __init__(self, key: str | None = None, region: str | None = None):
+    consumes_ssml = True
+
+    def __init__(self, key: str | None = None, region: str | None = None, voice: str | None = None):
         if speechsdk is None:
             raise RuntimeError("Azure Speech SDK is not installed") from _IMPORT_ERROR  # type: ignore[name-defined]
         self.key = key or os.environ.get("AZURE_SPEECH_KEY")
         self.region = region or os.environ.get("AZURE_SPEECH_REGION")
         if not self.key or not self.region:
             raise RuntimeError("Azure TTS credentials are missing")
+        self.voice = voice or os.environ.get("AZURE_SPEECH_VOICE", "zh-TW-HsiaoChenNeural")
+
+    def cache_identity(self) -> Dict[str, Any]:
+        return {"engine": "azure", "voice": self.voice, "format": PCM_FORMAT}
 
-    def synthesize(self, *, plain_text: str, ssml: str, output_path: Path) -> None:
+    def synthesize(self, *, plain_text: str, ssml: str, output_path: Path) -> Optional[SentenceTimings]:
         speech_config = speechsdk.SpeechConfig(subscription=self.key, region=self.region)
+        speech_config.speech_synthesis_voice_name = self.voice
+        speech_config.set_speech_synthesis_output_format(speechsdk.SpeechSynthesisOutputFormat.Riff44100Hz16BitMonoPcm)
         audio_cfg = speechsdk.audio.AudioOutputConfig(filename=str(output_path))
         synthesizer = speechsdk.SpeechSynthesizer(speech_config=speech_config, audio_config=audio_cfg)
+        words: List[Tuple[str, float, float]] = []
+
+        def _on_boundary(evt: Any) -> None:
+            if evt.boundary_type == speechsdk.SpeechSynthesisBoundaryType.Word:
+                start = evt.audio_offset / TICKS_PER_SECOND
+                words.append((evt.text, start, start + evt.duration.total_seconds()))
+
+        synthesizer.synthesis_word_boundary.connect(_on_boundary)
         result = synthesizer.speak_ssml_async(ssml).get()
         if result.reason != speechsdk.ResultReason.SynthesizingAudioCompleted:
             raise RuntimeError(f"Azure TTS synthesis failed: {result.reason}")
+        return sentences_from_words(plain_text, words) if words else None
@@ -1,12 +1,75 @@
 """Base TTS interface."""
 from __future__ import annotations
 
+import wave
 from abc import ABC, abstractmethod
 from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+# Canonical voice format every engine writes, so mixing never has to probe or resample voice audio.
+PCM_SAMPLE_RATE = 44100
+PCM_CHANNELS = 1
+PCM_SAMPLE_WIDTH = 2
+PCM_FORMAT = f"pcm_s16le_{PCM_SAMPLE_RATE}_mono"
+
+# Sentence timings relative to the start of the rendered file: [{"text", "start", "end"}] in seconds.
+SentenceTimings = List[Dict[str, Any]]
 
 
 class TextToSpeechEngine(ABC):
+    # Whether synthesis reads the SSML rendition (and so its prosody markup) rather than the plain text.
+    consumes_ssml = False
+
+    def cache_identity(self) -> Dict[str, Any]:
+        """Everything besides the text that changes how this engine sounds."""
+        return {"engine": type(self).__name__}
+
     @abstractmethod
-    def synthesize(self, *, plain_text: str, ssml: str, output_path: Path) -> None:  # pragma: no cover - I/O heavy
-        """Render speech from either plain text or SSML."""
+    def synthesize(
+        self, *, plain_text: str, ssml: str, output_path: Path
+    ) -> Optional[SentenceTimings]:  # pragma: no cover - I/O heavy
+        """Render speech from either plain text or SSML into a canonical PCM WAV at ``output_path``.
+
+        Engines that report speech boundaries return sentence timings; others return ``None``.
+        """
         raise NotImplementedError
+
+
+def open_pcm_wav(path: Path) -> Any:
+    """Open ``path`` for writing raw canonical PCM frames; the header is finalised on close."""
+    handle = wave.open(str(path), "wb")
+    handle.setnchannels(PCM_CHANNELS)
+    handle.setsampwidth(PCM_SAMPLE_WIDTH)
+    handle.setframerate(PCM_SAMPLE_RATE)
+    return handle
+
+
+def is_canonical_wav(path: Path) -> bool:
+    try:
+        with wave.open(str(path), "rb") as handle:
+            return (
+                handle.getnchannels() == PCM_CHANNELS
+                and handle.getsampwidth() == PCM_SAMPLE_WIDTH
+                and handle.getframerate() == PCM_SAMPLE_RATE
+            )
+    except (wave.Error, EOFError, OSError):
+        return False
+
+
+def convert_to_pcm_wav(source: Path, target: Path) -> None:
+    """Transcode any audio file ffmpeg can read into the canonical PCM WAV."""
+    try:
+        import ffmpeg  # type: ignore
+    except ImportError as exc:  # pragma: no cover - optional dependency should exist
+        raise RuntimeError("ffmpeg-python is required to convert TTS audio") from exc
+
+    target.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        (
+            ffmpeg.input(str(source))
+            .output(str(target), ac=PCM_CHANNELS, ar=PCM_SAMPLE_RATE, acodec="pcm_s16le")
+            .overwrite_output()
+            .run(quiet=True)
+        )
+    except ffmpeg.Error as exc:  # type: ignore[attr-defined]  # pragma: no cover - system tool error
+        raise RuntimeError(f"Failed to convert {source.name} to PCM WAV with ffmpeg") from exc
@@ -0,0 +1,169 @@
+"""Sentence-level cache of rendered TTS audio."""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+import shutil
+import threading
+import time
+import unicodedata
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from ..utils.logging import get_logger
+from .base import SentenceTimings, TextToSpeechEngine
+
+logger = get_logger(__name__)
+
+
+def normalise_text(text: str) -> str:
+    return re.sub(r"\s+", " ", unicodedata.normalize("NFKC", text)).strip()
+
+
+class TTSAudioCache:
+    """Rendered audio keyed by engine identity (engine, voice, prosody) and normalised text.
+
+    Files live under ``directory`` next to a small JSON sidecar recording how
+    long the original synthesis took; the least recently used entries are
+    evicted once the cache grows past ``max_bytes``.
+    """
+
+    def __init__(self, directory: Path, *, max_bytes: int = 256 * 1024 * 1024):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.seconds_saved = 0.0
+        self.chars_saved = 0
+        self._lock = threading.Lock()
+        self._size = sum(path.stat().st_size for path in self.directory.glob("*/*.audio"))
+
+    @staticmethod
+    def key_for(identity: Dict[str, Any], text: str) -> str:
+        material = json.dumps({"engine": identity, "text": normalise_text(text)}, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    def _paths(self, key: str) -> tuple[Path, Path]:
+        folder = self.directory / key[:2]
+        return folder / f"{key}.audio", folder / f"{key}.json"
+
+    def fetch(self, key: str, output_path: Path, *, chars: int) -> Optional[Dict[str, Any]]:
+        """Copy a cached rendering to ``output_path`` and return its metadata, or ``None`` on a miss."""
+        audio_path, meta_path = self._paths(key)
+        try:
+            shutil.copyfile(audio_path, output_path)
+            os.utime(audio_path)  # bump recency for LRU eviction
+        except OSError:
+            with self._lock:
+                self.misses += 1
+            return None
+        try:
+            meta = json.loads(meta_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            meta = {}
+        with self._lock:
+            self.hits += 1
+            self.seconds_saved += float(meta.get("elapsed", 0.0))
+            self.chars_saved += chars
+        return meta
+
+    def store(
+        self,
+        key: str,
+        rendered_path: Path,
+        *,
+        elapsed: float,
+        timings: Optional[SentenceTimings] = None,
+    ) -> None:
+        audio_path, meta_path = self._paths(key)
+        audio_path.parent.mkdir(parents=True, exist_ok=True)
+        suffix = f".{threading.get_ident()}.tmp"
+        tmp_path = audio_path.with_suffix(suffix)
+        shutil.copyfile(rendered_path, tmp_path)
+        added = tmp_path.stat().st_size
+        with self._lock:
+            # Another worker may have cached the same key; only count the difference.
+            try:
+                added -= audio_path.stat().st_size
+            except FileNotFoundError:
+                pass
+            os.replace(tmp_path, audio_path)
+            self._size += added
+            over_budget = self._size > self.max_bytes
+        meta = {"created_at": time.time(), "elapsed": round(elapsed, 4), "timings": timings}
+        tmp_meta = meta_path.with_suffix(suffix)
+        tmp_meta.write_text(json.dumps(meta, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp_meta, meta_path)
+        if over_budget:
+            self._evict()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            hits, misses, size = self.hits, self.misses, self._size
+            seconds_saved, chars_saved = self.seconds_saved, self.chars_saved
+        total = hits + misses
+        return {
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": round(hits / total, 3) if total else 0.0,
+            "seconds_saved": round(seconds_saved, 2),
+            "chars_saved": chars_saved,
+            "size_bytes": size,
+        }
+
+    def _evict(self) -> None:
+        entries = []
+        for path in self.directory.glob("*/*.audio"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        entries.sort()
+        total = sum(size for _, size, _ in entries)
+        target = int(self.max_bytes * 0.8)
+        removed = 0
+        for _, size, path in entries:
+            if total <= target:
+                break
+            try:
+                path.unlink()
+                path.with_suffix(".json").unlink(missing_ok=True)
+            except OSError:
+                continue
+            total -= size
+            removed += 1
+        with self._lock:
+            self._size = total
+        logger.info("TTS cache evicted %d entries (%d bytes remain)", removed, total)
+
+
+class CachedTTSEngine(TextToSpeechEngine):
+    """Serve repeated sentences from :class:`TTSAudioCache` and render the rest with ``inner``."""
+
+    def __init__(self, inner: TextToSpeechEngine, cache: TTSAudioCache):
+        self.inner = inner
+        self.cache = cache
+        self._local = threading.local()
+
+    def last_call_hit(self) -> bool:
+        """Whether the calling thread's most recent ``synthesize`` was served from the cache."""
+        return getattr(self._local, "hit", False)
+
+    def cache_identity(self) -> Dict[str, Any]:
+        return self.inner.cache_identity()
+
+    def synthesize(self, *, plain_text: str, ssml: str, output_path: Path) -> Optional[SentenceTimings]:
+        text = ssml if self.inner.consumes_ssml else plain_text
+        key = self.cache.key_for(self.inner.cache_identity(), text)
+        meta = self.cache.fetch(key, output_path, chars=len(plain_text))
+        self._local.hit = meta is not None
+        if meta is not None:
+            return meta.get("timings")
+        started = time.perf_counter()
+        timings = self.inner.synthesize(plain_text=plain_text, ssml=ssml, output_path=output_path)
+        self.cache.store(key, output_path, elapsed=time.perf_counter() - started, timings=timings)
+        return timings
@@ -0,0 +1,125 @@
+"""Split a script into chunks and synthesise them concurrently."""
+from __future__ import annotations
+
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional, Sequence, Tuple
+
+from ..utils.logging import get_logger
+from ..utils.segmenter import PLAIN, iter_sentences, join_sentences
+from .base import SentenceTimings, TextToSpeechEngine
+
+logger = get_logger(__name__)
+
+# Silence inserted between stitched chunks, in seconds.
+PARAGRAPH_PAUSE = 0.6
+SENTENCE_PAUSE = 0.25
+
+_SSML_PARAGRAPH = re.compile(r"<p[\s>][\s\S]*?</p\s*>", re.IGNORECASE)
+_SSML_BETWEEN = re.compile(r"^(?:\s|<break[^>]*/>)*$", re.IGNORECASE)
+_TAG = re.compile(r"<[^>]+>")
+
+
+@dataclass(slots=True)
+class VoiceChunk:
+    plain: str
+    ssml: str
+    pause_after: float = PARAGRAPH_PAUSE
+
+
+def _pack(units: Sequence[Tuple[str, bool, int]], max_chars: int) -> List[Tuple[List[Tuple[str, bool]], float]]:
+    """Greedily pack ``(text, ends_paragraph, length)`` units into groups of at most ``max_chars``."""
+    groups: List[Tuple[List[Tuple[str, bool]], float]] = []
+    current: List[Tuple[str, bool]] = []
+    size = 0
+    for text, ends_paragraph, length in units:
+        if current and size + length > max_chars:
+            groups.append((current, PARAGRAPH_PAUSE if current[-1][1] else SENTENCE_PAUSE))
+            current, size = [], 0
+        current.append((text, ends_paragraph))
+        size += length
+    if current:
+        groups.append((current, PARAGRAPH_PAUSE))
+    return groups
+
+
+def split_plain_text(plain_text: str, max_chars: int, *, markup: str = PLAIN) -> List[Tuple[str, float]]:
+    """Cut text at sentence ends into ``(text, pause_after)`` pieces, never splitting a sentence.
+
+    ``markup`` lets SSML or Markdown be segmented directly instead of being
+    converted to plain text first.
+    """
+    units = [(sentence.text, sentence.paragraph_end, len(sentence.text)) for sentence in iter_sentences(plain_text, markup)]
+
+    pieces: List[Tuple[str, float]] = []
+    for group, pause in _pack(units, max_chars):
+        paragraphs: List[str] = []
+        current: List[str] = []
+        for sentence, ends_paragraph in group:
+            current.append(sentence)
+            if ends_paragraph:
+                paragraphs.append(join_sentences(current))
+                current = []
+        if current:
+            paragraphs.append(join_sentences(current))
+        pieces.append(("\n\n".join(paragraphs), pause))
+    return pieces
+
+
+def split_ssml(ssml: str, max_chars: int) -> Optional[List[Tuple[str, float]]]:
+    """Regroup ``<p>`` elements into standalone SSML documents sharing the original envelope.
+
+    Returns ``None`` when the document has no paragraphs or has markup between
+    them that would not survive regrouping; callers then chunk the plain text.
+    """
+    paragraphs = list(_SSML_PARAGRAPH.finditer(ssml))
+    if not paragraphs:
+        return None
+    for previous, following in zip(paragraphs, paragraphs[1:]):
+        if not _SSML_BETWEEN.match(ssml[previous.end() : following.start()]):
+            return None
+    head, tail = ssml[: paragraphs[0].start()], ssml[paragraphs[-1].end() :]
+    units = [(match.group(0), True, len(_TAG.sub("", match.group(0)).strip())) for match in paragraphs]
+    return [
+        (head + "".join(text for text, _ in group) + tail, pause)
+        for group, pause in _pack(units, max_chars)
+    ]
+
+
+def render_chunk(
+    engine: TextToSpeechEngine, chunk: VoiceChunk, output_path: Path
+) -> Tuple[float, Optional[SentenceTimings]]:
+    """Synthesise one chunk and return the seconds it took plus any sentence timings."""
+    started = time.perf_counter()
+    timings = engine.synthesize(plain_text=chunk.plain, ssml=chunk.ssml, output_path=output_path)
+    return time.perf_counter() - started, timings
+
+
+def render_chunks(
+    engine: TextToSpeechEngine,
+    chunks: Sequence[VoiceChunk],
+    work_dir: Path,
+    *,
+    stem: str,
+    max_workers: int = 4,
+) -> Tuple[List[Path], List[Optional[SentenceTimings]]]:
+    """Synthesise ``chunks`` with a bounded worker pool; return paths and timings in script order."""
+    if not chunks:
+        raise ValueError("No chunks to synthesise")
+    work_dir.mkdir(parents=True, exist_ok=True)
+    paths = [work_dir / f"{stem}_{index:03d}.wav" for index in range(len(chunks))]
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(chunks)))) as pool:
+        results = list(pool.map(lambda pair: render_chunk(engine, *pair), zip(chunks, paths)))
+    durations = [seconds for seconds, _ in results]
+    logger.info(
+        "Rendered %d TTS chunks in %.2fs (slowest %.2fs, %.2fs if sequential)",
+        len(chunks),
+        time.perf_counter() - started,
+        max(durations),
+        sum(durations),
+    )
+    return paths, [timings for _, timings in results]
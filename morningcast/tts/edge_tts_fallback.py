@@ -2,16 +2,13 @@
 from __future__ import annotations
 
 import asyncio
-import html
 import os
 import platform
-import re
 import shutil
 import subprocess
-import unicodedata
 from contextlib import suppress
 from pathlib import Path
-from typing import Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 try:  # pragma: no cover - optional dependency
     from aiohttp import ClientError
@@ -31,7 +28,9 @@ except ImportError as exc:  # pragma: no cover - optional dependency
     _IMPORT_ERROR = exc
 
 from ..utils.logging import get_logger
-from .base import TextToSpeechEngine
+from ..utils.segmenter import PLAIN, SSML, iter_sentences, join_sentences
+from .base import PCM_FORMAT, SentenceTimings, TextToSpeechEngine, convert_to_pcm_wav
+from .timing import TICKS_PER_SECOND, sentences_from_words
 
 logger = get_logger(__name__)
 
@@ -40,79 +39,65 @@ class EdgeTTSEngine(TextToSpeechEngine):  # pragma: no cover - async network cal
     def __init__(self, voice: str = "zh-TW-HsiaoChenNeural"):
         self.voice = voice
 
-    def synthesize(self, *, plain_text: str, ssml: str, output_path: Path) -> None:
+    def cache_identity(self) -> Dict[str, Any]:
+        return {"engine": "edge", "voice": self.voice, "format": PCM_FORMAT}
+
+    def synthesize(self, *, plain_text: str, ssml: str, output_path: Path) -> Optional[SentenceTimings]:
         text = self._prepare_text(plain_text=plain_text, ssml=ssml)
 
         logger.debug("Edge TTS rendering %d characters", len(text))
         if edge_tts is None:
             if self._attempt_native_fallback(text, output_path, reason="edge-tts not installed"):
-                return
+                return None
             raise RuntimeError("edge-tts is not installed") from _IMPORT_ERROR  # type: ignore[name-defined]
 
         try:
-            asyncio.run(self._synthesize(text, output_path))
+            return asyncio.run(self._synthesize(text, output_path))
         except (EdgeTTSException, ClientError, asyncio.TimeoutError, OSError) as exc:
             logger.warning("Edge TTS synthesis failed (%s); attempting native fallback", exc)
             if self._attempt_native_fallback(text, output_path, reason=str(exc)):
-                return
+                return None
             raise
 
     def _prepare_text(self, *, plain_text: str, ssml: str) -> str:
         """Return a clean plain-text payload that Edge TTS can read."""
 
-        text = plain_text.strip()
-        if not text and ssml.strip():
-            text = self._ssml_to_plain_text(ssml)
-
-        text = self._normalise_text(text)
+        source, markup = (plain_text, PLAIN) if plain_text.strip() else (ssml, SSML)
+        # Paragraph breaks are not needed here; Edge reads one normalised line.
+        text = join_sentences(sentence.text for sentence in iter_sentences(source, markup, normalise=True))
         if not text:
             raise ValueError("No readable text available for Edge TTS synthesis")
         return text
 
-    async def _synthesize(self, text: str, output_path: Path) -> None:
+    async def _synthesize(self, text: str, output_path: Path) -> Optional[SentenceTimings]:
         if edge_tts is None:
             raise RuntimeError("edge-tts is not installed") from _IMPORT_ERROR  # type: ignore[name-defined]
-        communicate = edge_tts.Communicate(text=text, voice=self.voice)
-        await communicate.save(str(output_path))
-
-    @staticmethod
-    def _ssml_to_plain_text(ssml: str) -> str:
-        text = re.sub(r"<\/?speak[^>]*>", " ", ssml, flags=re.IGNORECASE)
-        text = re.sub(r"</p>", "\n\n", text, flags=re.IGNORECASE)
-        text = re.sub(r"<br\s*/?>", "\n", text, flags=re.IGNORECASE)
-        text = re.sub(r"<[^>]+>", " ", text)
-        text = re.sub(r"[ \t]+", " ", text)
-        text = re.sub(r"\n{3,}", "\n\n", text)
-        text = text.replace("\xa0", " ")
-        return html.unescape(text.strip())
-
-    @staticmethod
-    def _normalise_text(text: str) -> str:
-        """Strip unsupported characters and compress whitespace."""
-
-        if not text:
-            return ""
-
-        text = unicodedata.normalize("NFKC", text)
-        text = text.replace("\r\n", "\n").replace("\r", "\n")
-        # Remove any lingering markup braces or brackets that trip SSML parsing.
-        text = re.sub(r"[<>\[\]{}]", " ", text)
-
-        cleaned_chars = []
-        for char in text:
-            category = unicodedata.category(char)
-            if category.startswith("C"):
-                # Skip control characters entirely.
-                continue
-            if category in {"Sk", "So"}:
-                # Replace emojis or other symbols with a readable pause.
-                cleaned_chars.append(" ")
-                continue
-            cleaned_chars.append(char)
-
-        collapsed = "".join(cleaned_chars)
-        collapsed = re.sub(r"\s+", " ", collapsed)
-        return collapsed.strip()
+        try:
+            communicate = edge_tts.Communicate(text=text, voice=self.voice, boundary="WordBoundary")
+        except TypeError:  # older edge-tts always emits WordBoundary and has no option
+            communicate = edge_tts.Communicate(text=text, voice=self.voice)
+        words: List[Tuple[str, float, float]] = []
+        sentences: SentenceTimings = []
+        # Edge only streams MP3; transcode once here so every engine hands over the same PCM WAV.
+        mp3_path = output_path.with_name(output_path.name + ".mp3")
+        try:
+            with mp3_path.open("wb") as handle:
+                async for chunk in communicate.stream():
+                    if chunk["type"] == "audio":
+                        handle.write(chunk["data"])
+                    elif chunk["type"] in ("WordBoundary", "SentenceBoundary"):
+                        start = chunk["offset"] / TICKS_PER_SECOND
+                        end = start + chunk["duration"] / TICKS_PER_SECOND
+                        if chunk["type"] == "WordBoundary":
+                            words.append((chunk["text"], start, end))
+                        else:
+                            sentences.append({"text": chunk["text"], "start": round(start, 3), "end": round(end, 3)})
+            convert_to_pcm_wav(mp3_path, output_path)
+        finally:
+            mp3_path.unlink(missing_ok=True)
+        if sentences:
+            return sentences
+        return sentences_from_words(text, words) if words else None
 
     def _attempt_native_fallback(self, text: str, output_path: Path, *, reason: str) -> bool:
         """Try using a platform-native TTS tool when edge-tts fails."""
@@ -168,21 +153,7 @@ class EdgeTTSEngine(TextToSpeechEngine):  # pragma: no cover - async network cal
     def _convert_audio(source: Path, target: Path) -> None:
         """Convert AIFF output into a WAV container for downstream processing."""
 
-        try:
-            import ffmpeg  # type: ignore
-        except ImportError as exc:  # pragma: no cover - optional dependency should exist
-            raise RuntimeError("ffmpeg-python is required for macOS TTS fallback conversion") from exc
-
-        target.parent.mkdir(parents=True, exist_ok=True)
-        try:
-            (
-                ffmpeg.input(str(source))
-                .output(str(target), ac=1, ar=44100, acodec="pcm_s16le")
-                .overwrite_output()
-                .run(quiet=True)
-            )
-        except ffmpeg.Error as exc:  # type: ignore[attr-defined]  # pragma: no cover - system tool error
-            raise RuntimeError("Failed to convert native TTS audio with ffmpeg") from exc
+        convert_to_pcm_wav(source, target)
 
     @staticmethod
     def _temporary_file(suffix: str, *, content: Optional[str] = None):
@@ -2,12 +2,39 @@
 from __future__ import annotations
 
 import os
+import threading
 from pathlib import Path
-from typing import Optional
+from typing import Any, Dict, Optional
 
 import requests
 
-from .base import TextToSpeechEngine
+from ..utils.logging import get_logger
+from .base import PCM_FORMAT, PCM_SAMPLE_RATE, SentenceTimings, TextToSpeechEngine, open_pcm_wav
+from .chunked import split_plain_text
+
+logger = get_logger(__name__)
+
+# Characters per request; longer scripts are split at sentence ends.
+MAX_REQUEST_CHARS = 2500
+_CONNECT_TIMEOUT = 10.0
+_MIN_READ_TIMEOUT = 30.0
+# Extra read budget per character of text, so long requests are not cut off mid-stream.
+_READ_SECONDS_PER_CHAR = 0.05
+_STREAM_CHUNK_BYTES = 16 * 1024
+
+_SESSION_LOCK = threading.Lock()
+_SESSION: Optional[requests.Session] = None
+
+
+def get_shared_session() -> requests.Session:
+    """Return the process-wide keep-alive session for ElevenLabs requests."""
+    global _SESSION
+    with _SESSION_LOCK:
+        if _SESSION is None:
+            _SESSION = requests.Session()
+            adapter = requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=8)
+            _SESSION.mount("https://", adapter)
+        return _SESSION
 
 
 class ElevenLabsTTSEngine(TextToSpeechEngine):  # pragma: no cover - network service
@@ -16,15 +43,59 @@ class ElevenLabsTTSEngine(TextToSpeechEngine):  # pragma: no cover - network ser
         if not self.api_key:
             raise RuntimeError("ElevenLabs API key missing")
         self.voice_id = voice_id or os.environ.get("ELEVENLABS_VOICE_ID", "21m00Tcm4TlvDq8ikWAM")
+        self.model_id = "eleven_monolingual_v1"
+        self.voice_settings = {"stability": 0.4, "similarity_boost": 0.8}
+        self.session = get_shared_session()
+
+    def cache_identity(self) -> Dict[str, Any]:
+        return {
+            "engine": "elevenlabs",
+            "voice": self.voice_id,
+            "model": self.model_id,
+            "settings": self.voice_settings,
+            "format": PCM_FORMAT,
+        }
+
+    def synthesize(self, *, plain_text: str, ssml: str, output_path: Path) -> Optional[SentenceTimings]:
+        parts = [text for text, _ in split_plain_text(plain_text, MAX_REQUEST_CHARS)] or [plain_text]
+        tmp_path = output_path.with_name(output_path.name + ".part")
+        # Raw PCM is requested, so chunks go straight into the WAV container without decoding.
+        with open_pcm_wav(tmp_path) as handle:
+            for index, text in enumerate(parts):
+                # Neighbouring text keeps intonation continuous across request boundaries.
+                self._stream_part(
+                    text,
+                    handle,
+                    previous_text=parts[index - 1] if index > 0 else None,
+                    next_text=parts[index + 1] if index + 1 < len(parts) else None,
+                )
+        os.replace(tmp_path, output_path)
+        if len(parts) > 1:
+            logger.debug("ElevenLabs rendered %d characters in %d requests", len(plain_text), len(parts))
+        return None  # the streaming endpoint reports no sentence timings
 
-    def synthesize(self, *, plain_text: str, ssml: str, output_path: Path) -> None:
+    def _stream_part(self, text: str, handle: Any, *, previous_text: Optional[str], next_text: Optional[str]) -> None:
         url = f"https://api.elevenlabs.io/v1/text-to-speech/{self.voice_id}/stream"
         headers = {"xi-api-key": self.api_key}
-        payload = {
-            "text": plain_text,
-            "model_id": "eleven_monolingual_v1",
-            "voice_settings": {"stability": 0.4, "similarity_boost": 0.8},
+        payload: Dict[str, Any] = {
+            "text": text,
+            "model_id": self.model_id,
+            "voice_settings": self.voice_settings,
         }
-        response = requests.post(url, json=payload, headers=headers, timeout=30)
-        response.raise_for_status()
-        output_path.write_bytes(response.content)
+        if previous_text:
+            payload["previous_text"] = previous_text
+        if next_text:
+            payload["next_text"] = next_text
+        read_timeout = max(_MIN_READ_TIMEOUT, len(text) * _READ_SECONDS_PER_CHAR)
+        with self.session.post(
+            url,
+            json=payload,
+            headers=headers,
+            params={"output_format": f"pcm_{PCM_SAMPLE_RATE}"},
+            stream=True,
+            timeout=(_CONNECT_TIMEOUT, read_timeout),
+        ) as response:
+            response.raise_for_status()
+            for chunk in response.iter_content(chunk_size=_STREAM_CHUNK_BYTES):
+                if chunk:
+                    handle.writeframes(chunk)
@@ -0,0 +1,353 @@
+"""Health-aware TTS engine selection with a per-engine circuit breaker."""
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from ..utils.logging import get_logger
+from .base import SentenceTimings, TextToSpeechEngine, convert_to_pcm_wav, is_canonical_wav
+from .cache import CachedTTSEngine
+
+logger = get_logger(__name__)
+
+EngineFactory = Callable[[], TextToSpeechEngine]
+
+# Latency samples kept per engine, and how many are needed before hedge deadlines use them.
+_RECENT_SAMPLES = 50
+_MIN_LATENCY_SAMPLES = 5
+
+
+class EngineHealthStore:
+    """Recent failures and latency per engine, persisted between runs in a small JSON file.
+
+    After ``failure_threshold`` consecutive failures an engine's circuit opens
+    for ``cooldown_seconds``; once that passes the next call is a trial, and a
+    success closes the circuit again.
+    """
+
+    def __init__(self, path: Path, *, failure_threshold: int = 2, cooldown_seconds: float = 15 * 60):
+        self.path = Path(path)
+        self.failure_threshold = failure_threshold
+        self.cooldown_seconds = cooldown_seconds
+        self._lock = threading.Lock()
+        self._state: Dict[str, Dict[str, Any]] = {}
+        if self.path.exists():
+            try:
+                self._state = json.loads(self.path.read_text(encoding="utf-8"))
+            except (OSError, json.JSONDecodeError) as exc:
+                logger.warning("Ignoring unreadable TTS health state %s: %s", self.path, exc)
+
+    def _entry(self, name: str) -> Dict[str, Any]:
+        return self._state.setdefault(
+            name,
+            {"consecutive_failures": 0, "open_until": 0.0, "latency_ema": None, "last_error": None, "recent": []},
+        )
+
+    def is_open(self, name: str) -> bool:
+        with self._lock:
+            return self._entry(name)["open_until"] > time.time()
+
+    def latency_percentile(self, name: str, q: float) -> Optional[float]:
+        """Seconds per 100 characters at quantile ``q`` of recent calls, once enough are known."""
+        with self._lock:
+            samples = sorted(self._entry(name).get("recent") or [])
+        if len(samples) < _MIN_LATENCY_SAMPLES:
+            return None
+        return _percentile(samples, q)
+
+    def record_success(self, name: str, seconds: float, *, chars: int = 0) -> None:
+        with self._lock:
+            entry = self._entry(name)
+            entry["consecutive_failures"] = 0
+            entry["open_until"] = 0.0
+            # Latency is tracked per 100 characters so short and long chunks are comparable.
+            per_100 = seconds * 100 / max(chars, 1) if chars else seconds
+            previous = entry["latency_ema"]
+            entry["latency_ema"] = round(per_100 if previous is None else 0.7 * previous + 0.3 * per_100, 4)
+            entry["recent"] = (entry.get("recent") or [])[-(_RECENT_SAMPLES - 1):] + [round(per_100, 4)]
+            self._save()
+
+    def record_failure(self, name: str, error: BaseException) -> None:
+        with self._lock:
+            entry = self._entry(name)
+            entry["consecutive_failures"] += 1
+            entry["last_error"] = f"{error.__class__.__name__}: {error}"[:200]
+            if entry["consecutive_failures"] >= self.failure_threshold:
+                entry["open_until"] = time.time() + self.cooldown_seconds
+                logger.warning("TTS engine %s circuit opened for %.0fs", name, self.cooldown_seconds)
+            self._save()
+
+    def _save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(f".{threading.get_ident()}.tmp")
+        tmp_path.write_text(json.dumps(self._state, indent=2), encoding="utf-8")
+        os.replace(tmp_path, self.path)
+
+
+class TTSSelector(TextToSpeechEngine):
+    """Try engines in preference order for every call, skipping open circuits and failing over.
+
+    Engines are constructed lazily; one that cannot be constructed (missing
+    SDK or credentials) is dropped for the rest of the run without touching
+    its health record. Which engine rendered each output file is kept in
+    :attr:`rendered`.
+
+    With ``hedge`` on, a call still running after the engine's
+    ``hedge_percentile`` latency (scaled to the text length) gets a duplicate
+    request on the next engine sharing its voice, or on the same engine, and
+    the first result wins. Hedged requests run on a private pool; call
+    :meth:`close` when the run is over.
+    """
+
+    def __init__(
+        self,
+        candidates: Sequence[Tuple[str, EngineFactory]],
+        health: EngineHealthStore,
+        *,
+        hedge: bool = False,
+        hedge_percentile: float = 0.9,
+        hedge_min_seconds: float = 2.0,
+        hedge_default_seconds: float = 10.0,
+        hedge_workers: int = 8,
+    ):
+        if not candidates:
+            raise ValueError("At least one TTS engine candidate is required")
+        self.candidates = list(candidates)
+        self.health = health
+        self.hedge = hedge
+        self.hedge_percentile = hedge_percentile
+        self.hedge_min_seconds = hedge_min_seconds
+        self.hedge_default_seconds = hedge_default_seconds
+        self.rendered: Dict[str, Dict[str, Any]] = {}
+        self.hedged_calls = 0
+        self.hedge_wins = 0
+        self._latencies: List[float] = []
+        self._engines: Dict[str, Optional[TextToSpeechEngine]] = {}
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=hedge_workers, thread_name_prefix="tts-hedge") if hedge else None
+
+    def close(self) -> None:
+        """Shut down the hedging pool, dropping hedges that have not started."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+
+    def _engine(self, name: str, factory: EngineFactory) -> Optional[TextToSpeechEngine]:
+        with self._lock:
+            if name not in self._engines:
+                try:
+                    self._engines[name] = factory()
+                except Exception as exc:
+                    logger.warning("%s TTS unavailable: %s", name, exc)
+                    self._engines[name] = None
+            return self._engines[name]
+
+    def preferred_engine(self) -> Optional[str]:
+        """The engine the next call would try first, or ``None`` when none can be built."""
+        for name, factory in self.candidates:
+            if not self.health.is_open(name) and self._engine(name, factory) is not None:
+                return name
+        return None
+
+    def identity(self, name: str) -> Dict[str, Any]:
+        """``cache_identity`` of engine ``name``; just the name when it cannot be built."""
+        engine = self._engine(name, dict(self.candidates)[name])
+        return engine.cache_identity() if engine is not None else {"engine": name}
+
+    def voice_key(self, name: str) -> str:
+        """``engine:voice`` label for ``name``, for per-voice statistics."""
+        voice = self.identity(name).get("voice")
+        return f"{name}:{voice}" if voice else name
+
+    def synthesize(self, *, plain_text: str, ssml: str, output_path: Path) -> Optional[SentenceTimings]:
+        skipped: List[Tuple[str, EngineFactory]] = []
+        errors: List[str] = []
+        for name, factory in self.candidates:
+            if self.health.is_open(name):
+                skipped.append((name, factory))
+                continue
+            result = self._attempt(name, factory, plain_text, ssml, output_path, errors)
+            if result is not None:
+                return result.timings
+        # Every healthy engine failed: give the ones behind an open circuit a last chance
+        # rather than dropping this part of the show.
+        for name, factory in skipped:
+            logger.warning("Trying %s TTS despite its open circuit", name)
+            result = self._attempt(name, factory, plain_text, ssml, output_path, errors)
+            if result is not None:
+                return result.timings
+        raise RuntimeError(f"All TTS engines failed for {output_path.name}: {'; '.join(errors) or 'none available'}")
+
+    def _attempt(
+        self,
+        name: str,
+        factory: EngineFactory,
+        plain_text: str,
+        ssml: str,
+        output_path: Path,
+        errors: List[str],
+    ) -> Optional[_RunResult]:
+        engine = self._engine(name, factory)
+        if engine is None:
+            return None
+        started = time.perf_counter()
+        try:
+            if self.hedge:
+                winner, result, hedged = self._run_hedged(name, engine, plain_text, ssml, output_path)
+            else:
+                winner, hedged = name, False
+                result = _run(engine, plain_text, ssml, output_path)
+        except _HedgeFailed as exc:
+            # Each attempt's failure was already recorded against the engine that raised it.
+            errors.append(f"{name}: {exc}")
+            return None
+        except Exception as exc:
+            logger.warning("%s TTS failed for %s after %.1fs: %s", name, output_path.name, time.perf_counter() - started, exc)
+            self.health.record_failure(name, exc)
+            errors.append(f"{name}: {exc}")
+            return None
+        if not result.cached:
+            self.health.record_success(winner, result.seconds, chars=len(plain_text))
+        with self._lock:
+            self._latencies.append(time.perf_counter() - started)
+            self.rendered[output_path.name] = {
+                "engine": winner,
+                "seconds": round(result.seconds, 3),
+                "chars": len(plain_text),
+                "cached": result.cached,
+                "failovers": len(errors),
+                "hedged": hedged,
+            }
+        return result
+
+    def _hedge_deadline(self, name: str, chars: int) -> float:
+        per_100 = self.health.latency_percentile(name, self.hedge_percentile)
+        if per_100 is None:
+            return self.hedge_default_seconds
+        return max(self.hedge_min_seconds, per_100 * max(chars, 1) / 100)
+
+    def _hedge_target(self, name: str, engine: TextToSpeechEngine) -> Tuple[str, TextToSpeechEngine]:
+        """The next healthy engine speaking with the same voice, or ``engine`` itself."""
+        voice = engine.cache_identity().get("voice")
+        seen = False
+        for other_name, factory in self.candidates:
+            if other_name == name:
+                seen = True
+                continue
+            if not seen or self.health.is_open(other_name):
+                continue
+            other = self._engine(other_name, factory)
+            if other is not None and voice is not None and other.cache_identity().get("voice") == voice:
+                return other_name, other
+        return name, engine
+
+    def _run_hedged(
+        self,
+        name: str,
+        engine: TextToSpeechEngine,
+        plain_text: str,
+        ssml: str,
+        output_path: Path,
+    ) -> Tuple[str, _RunResult, bool]:
+        """Race a duplicate request against a slow one; the first success is moved to ``output_path``.
+
+        Both attempts write to their own temporary files. Engine calls cannot
+        be interrupted: a loser only gets ``cancel()``, which helps only if it
+        has not started; otherwise it runs to the end and its temporary file is
+        deleted when it does. Failed attempts are recorded against the engine
+        that raised; if every attempt fails, :class:`_HedgeFailed` is raised.
+        """
+        primary_path = output_path.with_name(f"{output_path.stem}.primary{output_path.suffix}")
+        primary = self._pool.submit(_run, engine, plain_text, ssml, primary_path)  # type: ignore[union-attr]
+        attempts: Dict[Future, Tuple[str, Path]] = {primary: (name, primary_path)}
+        deadline = self._hedge_deadline(name, len(plain_text))
+        done, pending = wait(attempts, timeout=deadline)
+        if pending:
+            backup_name, backup = self._hedge_target(name, engine)
+            logger.info(
+                "%s TTS exceeded %.1fs hedge deadline for %s; hedging with %s",
+                name,
+                deadline,
+                output_path.name,
+                backup_name,
+            )
+            hedge_path = output_path.with_name(f"{output_path.stem}.hedge{output_path.suffix}")
+            attempts[self._pool.submit(_run, backup, plain_text, ssml, hedge_path)] = (backup_name, hedge_path)  # type: ignore[union-attr]
+            with self._lock:
+                self.hedged_calls += 1
+            pending = set(attempts) - done
+
+        error: Optional[BaseException] = None
+        while True:
+            for future in done:
+                engine_name, path = attempts[future]
+                try:
+                    result = future.result()
+                except Exception as exc:
+                    logger.warning("%s TTS attempt for %s failed: %s", engine_name, output_path.name, exc)
+                    self.health.record_failure(engine_name, exc)
+                    path.unlink(missing_ok=True)
+                    error = exc
+                    continue
+                for loser in pending:
+                    loser.cancel()
+                    loser.add_done_callback(lambda _, lost=attempts[loser][1]: lost.unlink(missing_ok=True))
+                os.replace(path, output_path)
+                if future is not primary:
+                    with self._lock:
+                        self.hedge_wins += 1
+                return engine_name, result, len(attempts) > 1
+            if not pending:
+                raise _HedgeFailed(str(error) if error is not None else "TTS hedging produced no result") from error
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+
+    def stats(self) -> Dict[str, Any]:
+        """Per-call latency percentiles and hedging counters for the run report."""
+        with self._lock:
+            latencies = sorted(self._latencies)
+            hedged, wins = self.hedged_calls, self.hedge_wins
+        calls = len(latencies)
+        return {
+            "calls": calls,
+            "p50_seconds": round(_percentile(latencies, 0.5), 3) if calls else None,
+            "p95_seconds": round(_percentile(latencies, 0.95), 3) if calls else None,
+            "max_seconds": round(latencies[-1], 3) if calls else None,
+            "hedged": hedged,
+            "hedge_rate": round(hedged / calls, 3) if calls else 0.0,
+            "hedge_wins": wins,
+        }
+
+
+class _HedgeFailed(RuntimeError):
+    """Every attempt of a hedged call failed; each failure is already in the health store."""
+
+
+def _percentile(ordered: Sequence[float], q: float) -> float:
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+@dataclass(slots=True)
+class _RunResult:
+    seconds: float
+    cached: bool
+    timings: Optional[SentenceTimings]
+
+
+def _run(engine: TextToSpeechEngine, plain_text: str, ssml: str, output_path: Path) -> _RunResult:
+    """Synthesise once on the calling thread."""
+    started = time.perf_counter()
+    timings = engine.synthesize(plain_text=plain_text, ssml=ssml, output_path=output_path)
+    cached = isinstance(engine, CachedTTSEngine) and engine.last_call_hit()
+    if not is_canonical_wav(output_path):
+        # Cache entries or fixtures written before the canonical format still need one conversion.
+        logger.debug("Converting non-canonical TTS output %s", output_path.name)
+        raw_path = output_path.with_name(output_path.name + ".raw")
+        os.replace(output_path, raw_path)
+        convert_to_pcm_wav(raw_path, output_path)
+        raw_path.unlink(missing_ok=True)
+    return _RunResult(time.perf_counter() - started, cached, timings)
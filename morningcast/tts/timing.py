@@ -0,0 +1,77 @@
+"""Sentence timings from TTS boundary events, and their placement in the stitched voice track."""
+from __future__ import annotations
+
+from typing import Any, Optional, Sequence, Tuple
+
+from ..utils.segmenter import PLAIN, iter_sentences
+from .base import SentenceTimings
+
+# Engine boundary offsets are reported in 100 ns ticks.
+TICKS_PER_SECOND = 10_000_000
+
+
+def _weight(text: str) -> int:
+    return sum(1 for char in text if char.isalnum())
+
+
+def sentences_from_words(text: str, words: Sequence[Tuple[str, float, float]]) -> SentenceTimings:
+    """Group ``(word, start, end)`` boundaries into sentence timings for ``text``.
+
+    Boundary events carry words without punctuation, so words are consumed
+    until they cover as many letters/digits/CJK characters as the sentence has.
+    """
+    timings: SentenceTimings = []
+    index = 0
+    for sentence in iter_sentences(text, PLAIN):
+        needed = _weight(sentence.text)
+        if not needed:
+            continue
+        covered = 0
+        start: Optional[float] = None
+        end = 0.0
+        while index < len(words) and covered < needed:
+            word, word_start, word_end = words[index]
+            index += 1
+            covered += _weight(word)
+            start = word_start if start is None else start
+            end = word_end
+        if start is None:
+            break
+        timings.append({"text": sentence.text, "start": round(start, 3), "end": round(end, 3)})
+    return timings
+
+
+def place_chunk_timings(
+    chunk_texts: Sequence[str],
+    chunk_timings: Sequence[Optional[SentenceTimings]],
+    placements: Sequence[Any],
+) -> SentenceTimings:
+    """Shift per-chunk timings onto the stitched track.
+
+    ``placements`` are the mixer's ``ChunkPlacement`` records. A chunk without
+    engine timings becomes a single span covering its trimmed audio.
+    """
+    placed: SentenceTimings = []
+    for text, timings, placement in zip(chunk_texts, chunk_timings, placements):
+        if not timings:
+            placed.append(
+                {
+                    "text": text,
+                    "start": round(placement.offset, 3),
+                    "end": round(placement.offset + placement.trim_end - placement.trim_start, 3),
+                }
+            )
+            continue
+        for timing in timings:
+            start = max(timing["start"], placement.trim_start)
+            end = min(timing["end"], placement.trim_end)
+            if end <= start:
+                continue
+            placed.append(
+                {
+                    "text": timing["text"],
+                    "start": round(placement.offset + start - placement.trim_start, 3),
+                    "end": round(placement.offset + end - placement.trim_start, 3),
+                }
+            )
+    return placed
@@ -0,0 +1,263 @@
+"""Single-pass SSML/Markdown segmenter yielding normalised, CJK-aware sentences."""
+from __future__ import annotations
+
+import html
+import re
+import unicodedata
+from dataclasses import dataclass
+from typing import Iterable, Iterator, List, Optional, Sequence, Union
+
+PLAIN = "plain"
+MARKDOWN = "markdown"
+SSML = "ssml"
+AUTO = "auto"
+
+# Tokens shared by every markup. Order matters: earlier alternatives win at the same position.
+_COMMON_TOKENS = r"""
+ (?P<para></?(?:p|speak|voice)\b[^>]*>|<br\s*/?>)
+|(?P<sent></?s\b[^>]*>)
+|(?P<tag><[^>]*>)
+|(?P<blank>\n(?:[ \t\r]*\n)+)
+|(?P<nl>\r?\n)
+|(?P<end>[。！？!?]*[。！？]+[」』）”’]*|[.!?]+[)"'”’]*(?=\s|$|<|[\u3000-\u9fff]))
+"""
+_TEXT = r"|(?P<text>[^<>`\[\n*_#。！？.!?]+|[\s\S])"
+_MARKDOWN_TOKENS = r"""
+|(?P<codeblock>```[\s\S]*?```)
+|(?P<heading>^[ \t]{0,3}\#+[ \t]*)
+|(?P<item>^[ \t]{0,3}(?:[-*+]|\d+\.)[ \t]+)
+|(?P<link>\[(?P<label>[^\]\n]+)\]\([^)\n]*\))
+|(?P<code>`(?P<inline>[^`\n]+)`)
+|(?P<emph>[*_]{1,3})
+"""
+_SSML_TOKENS = r"|(?P<fence>```[a-zA-Z]*)"
+
+_PATTERNS = {
+    PLAIN: re.compile(_COMMON_TOKENS + _TEXT, re.X | re.M | re.I),
+    MARKDOWN: re.compile(_COMMON_TOKENS + _MARKDOWN_TOKENS + _TEXT, re.X | re.M | re.I),
+    SSML: re.compile(_COMMON_TOKENS + _SSML_TOKENS + _TEXT, re.X | re.M | re.I),
+}
+_SSML_HINT = re.compile(r"<(?:speak|p|s|prosody|break|voice|emphasis|say-as)\b", re.I)
+_WHITESPACE = re.compile(r"\s+")
+# Characters a partial stream may not end on: the token they start could still grow.
+_HOLD_BACK = " \t\r\n。！？.!?」』）”’)\"'*_#-+`"
+
+
+class _NormaliseTable(dict):
+    """``str.translate`` table resolved lazily, so each code point is classified once per process."""
+
+    def __missing__(self, codepoint: int) -> Optional[str]:
+        char = chr(codepoint)
+        category = unicodedata.category(char)
+        if char in "<>[]{}":
+            value: Optional[str] = " "  # stray markup braces trip SSML parsing downstream
+        elif char.isspace():
+            value = " "
+        elif category.startswith("C"):
+            value = None  # control and format characters
+        elif category in ("Sk", "So"):
+            value = " "  # emoji and other symbols become a short pause
+        else:
+            value = char
+        self[codepoint] = value
+        return value
+
+
+_NORMALISE = _NormaliseTable()
+
+
+def normalise_text(text: str) -> str:
+    """NFKC-normalise ``text``, drop control characters and symbols, and collapse whitespace."""
+    if not text:
+        return ""
+    text = unicodedata.normalize("NFKC", text).translate(_NORMALISE)
+    return _WHITESPACE.sub(" ", text).strip()
+
+
+def _is_cjk(char: str) -> bool:
+    return "\u2e80" <= char <= "\u9fff" or "\uf900" <= char <= "\ufaff" or "\uff00" <= char <= "\uffef"
+
+
+def join_sentences(sentences: Iterable[str]) -> str:
+    """Join sentences of one paragraph; CJK text is joined without spaces."""
+    joined = ""
+    for sentence in sentences:
+        if joined and not (_is_cjk(joined[-1]) or _is_cjk(sentence[0])):
+            joined += " "
+        joined += sentence
+    return joined
+
+
+@dataclass(slots=True)
+class Sentence:
+    text: str
+    paragraph_end: bool = False
+
+
+class SentenceSegmenter:
+    """Incremental tokenizer turning SSML, Markdown or plain text into sentences.
+
+    ``feed`` accepts arbitrary text deltas (e.g. a streamed LLM completion) and
+    returns the sentences completed so far; ``close`` flushes the rest. Input is
+    scanned once with a single regex: markup is dropped, ``<p>``/blank lines end
+    paragraphs, ``<s>`` and ``。！？.!?`` end sentences. Each sentence is
+    reported one step late so the paragraph flag of the last one is known.
+    """
+
+    def __init__(self, markup: str = AUTO, *, normalise: bool = False):
+        if markup not in (AUTO, PLAIN, MARKDOWN, SSML):
+            raise ValueError(f"Unknown markup {markup!r}")
+        self.markup = markup
+        self.normalise = normalise
+        self._pending = ""
+        self._context = ""
+        self._buffer: List[str] = []
+        self._held: Optional[Sentence] = None
+
+    def feed(self, delta: str) -> List[Sentence]:
+        self._pending += delta
+        if self.markup == AUTO:
+            if _SSML_HINT.search(self._pending):
+                self.markup = SSML
+            elif len(self._pending) < 64:
+                return []
+            else:
+                self.markup = MARKDOWN
+        cut = self._safe_cut(self._pending)
+        segment, self._pending = self._pending[:cut], self._pending[cut:]
+        return self._consume(segment)
+
+    def close(self) -> List[Sentence]:
+        if self.markup == AUTO:
+            self.markup = SSML if _SSML_HINT.search(self._pending) else MARKDOWN
+        segment, self._pending = self._pending, ""
+        emitted = self._consume(segment)
+        self._flush(emitted)
+        if self._held is not None:
+            self._held.paragraph_end = True
+            emitted.append(self._held)
+            self._held = None
+        return emitted
+
+    def _safe_cut(self, text: str) -> int:
+        """Length of the prefix of ``text`` whose tokens cannot change with more input.
+
+        Trimming trailing punctuation can reopen a link or tag that was closed,
+        so both rules are applied until the cut stops moving.
+        """
+        cut = len(text)
+        while True:
+            held = self._hold(text[: self._trim(text, cut)])
+            if held == cut:
+                return cut
+            cut = held
+
+    def _hold(self, head: str) -> int:
+        """Start of an unfinished tag, link, code span or list marker at the end of ``head``."""
+        cut = len(head)
+        tag = head.rfind("<")
+        if tag > head.rfind(">"):
+            cut = tag
+        if self.markup == MARKDOWN:
+            if head.count("```") % 2:
+                cut = min(cut, head.rfind("```"))
+            link = head.rfind("[")
+            if link > head.rfind(")"):
+                cut = min(cut, link)
+            if head.count("`") % 2:
+                cut = min(cut, head.rfind("`"))
+            line = head.rfind("\n") + 1
+            if head[line:].strip(" \t").isdigit():  # may become a numbered list marker
+                cut = min(cut, line)
+        else:
+            fence = head.rfind("```")
+            if fence != -1 and head[fence + 3 :].isalpha():  # language tag may still grow
+                cut = min(cut, fence)
+        return cut
+
+    @staticmethod
+    def _trim(text: str, cut: int) -> int:
+        while cut and text[cut - 1] in _HOLD_BACK:
+            cut -= 1
+        return cut
+
+    def _consume(self, segment: str) -> List[Sentence]:
+        emitted: List[Sentence] = []
+        if not segment:
+            return emitted
+        text = self._context + segment
+        # Scanning from ``pos`` keeps ``^`` honest when a delta starts mid-line.
+        for match in _PATTERNS[self.markup].finditer(text, len(self._context)):
+            kind = match.lastgroup
+            if kind == "text":
+                self._buffer.append(match.group(kind))
+            elif kind == "end":
+                self._buffer.append(match.group(kind))
+                self._flush(emitted)
+            elif kind in ("para", "blank"):
+                self._flush(emitted)
+                if self._held is not None:
+                    self._held.paragraph_end = True
+            elif kind == "sent":
+                self._flush(emitted)
+            elif kind in ("tag", "nl"):
+                self._buffer.append(" ")
+            elif kind == "link":
+                self._buffer.append(match.group("label"))
+            elif kind == "code":
+                self._buffer.append(match.group("inline"))
+            # codeblock, fence, heading, item and emphasis markers are dropped
+        self._context = segment[-1]
+        return emitted
+
+    def _flush(self, emitted: List[Sentence]) -> None:
+        raw = html.unescape("".join(self._buffer))
+        self._buffer.clear()
+        text = normalise_text(raw) if self.normalise else _WHITESPACE.sub(" ", raw).strip()
+        if not text:
+            return
+        if self._held is not None:
+            emitted.append(self._held)
+        self._held = Sentence(text)
+
+
+def iter_sentences(
+    source: Union[str, Iterable[str]], markup: str = AUTO, *, normalise: bool = False
+) -> Iterator[Sentence]:
+    """Yield sentences from a string or a stream of text deltas."""
+    segmenter = SentenceSegmenter(markup, normalise=normalise)
+    for delta in [source] if isinstance(source, str) else source:
+        yield from segmenter.feed(delta)
+    yield from segmenter.close()
+
+
+def paragraphs(source: Union[str, Iterable[str]], markup: str = AUTO, *, normalise: bool = False) -> List[List[str]]:
+    """Sentences of ``source`` grouped by paragraph."""
+    grouped: List[List[str]] = []
+    current: List[str] = []
+    for sentence in iter_sentences(source, markup, normalise=normalise):
+        current.append(sentence.text)
+        if sentence.paragraph_end:
+            grouped.append(current)
+            current = []
+    return grouped
+
+
+def to_plain_text(source: Union[str, Iterable[str]], markup: str = AUTO, *, normalise: bool = False) -> str:
+    """Readable text with one blank line between paragraphs."""
+    return "\n\n".join(join_sentences(group) for group in paragraphs(source, markup, normalise=normalise))
+
+
+def ssml_from_paragraphs(grouped: Iterable[Sequence[str]]) -> str:
+    """``<speak><p><s>`` markup for sentences already grouped by paragraph; empty string if there are none."""
+    parts = [
+        "<p>" + "".join(f"<s>{html.escape(sentence)}</s>" for sentence in group) + "</p>"
+        for group in grouped
+        if group
+    ]
+    return "<speak>" + "".join(parts) + "</speak>" if parts else ""
+
+
+def to_ssml(source: Union[str, Iterable[str]], markup: str = PLAIN) -> str:
+    """Wrap the sentences of ``source`` in ``<speak><p><s>`` markup; empty string if nothing is readable."""
+    return ssml_from_paragraphs(paragraphs(source, markup))
@@ -0,0 +1,7 @@
+import sys
+from pathlib import Path
+
+# The email bot is run from its own directory and imports ``utils.*`` as a top-level package.
+EMAIL_BOT_DIR = Path(__file__).resolve().parent.parent / "email_gpt_bot-main"
+if str(EMAIL_BOT_DIR) not in sys.path:
+    sys.path.insert(0, str(EMAIL_BOT_DIR))
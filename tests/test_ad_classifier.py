@@ -0,0 +1,52 @@
+import pytest
+
+from utils.ad_classifier import HashedNaiveBayes
+from utils.gpt_summary import FAILED_REPLY, is_failed_reply, local_ad_reply
+
+AD = {"subject": "限時優惠 全館五折", "from": "Shop <news@shop.example>", "body": "立即搶購，優惠只到今晚"}
+WORK = {"subject": "週會議程", "from": "Boss <boss@corp.example>", "body": "請準備本週專案進度報告"}
+
+
+def _trained(examples=10):
+    model = HashedNaiveBayes(n_features=2 ** 12, min_examples_per_class=examples)
+    for _ in range(examples):
+        model.learn(AD, True)
+        model.learn(WORK, False)
+    return model
+
+
+def test_untrained_model_abstains():
+    model = _trained(examples=3)
+    model.min_examples_per_class = 4
+    assert model.predict_proba(AD) is None
+
+
+def test_trained_model_separates_ads_and_survives_round_trip():
+    model = _trained()
+    assert model.predict_proba(AD) > 0.9
+    assert model.predict_proba(WORK) < 0.1
+    restored = HashedNaiveBayes.from_dict(model.to_dict())
+    assert restored.predict_proba(AD) == pytest.approx(model.predict_proba(AD))
+
+
+def test_failed_reply_is_not_a_label():
+    assert is_failed_reply({"summary": "失敗", "category": "未知"})
+    assert is_failed_reply({"summary": "會議改期", "category": "未知"})
+    assert not is_failed_reply({"summary": "會議改期", "category": "工作"})
+
+
+def test_training_skips_ads_and_failed_replies():
+    pytest.importorskip("openai")  # parse_gpt_reply lives in report_writer, which imports the SDK
+    from utils.gpt_summary import train_classifier_from_replies
+
+    model = HashedNaiveBayes(min_examples_per_class=1)
+    items = [dict(AD, is_ad=True), AD, WORK, WORK, AD]
+    replies = [
+        "摘要：略過\n分類：廣告",
+        "摘要：五折優惠\n是否重要：否\n分類：廣告",
+        "摘要：週會議程\n是否重要：是\n分類：工作",
+        FAILED_REPLY,
+        local_ad_reply(),
+    ]
+    assert train_classifier_from_replies(model, items, replies) == 2
+    assert model.doc_counts == {"low_value": 1, "keep": 1}
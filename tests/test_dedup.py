@@ -0,0 +1,44 @@
+import hashlib
+
+from utils import dedup
+
+
+def _reference_simhash(text):
+    weights = [0] * dedup.SIMHASH_BITS
+    for shingle in set(dedup._shingles(text)):
+        value = int.from_bytes(hashlib.blake2b(shingle.encode("utf-8"), digest_size=8).digest(), "big")
+        for bit in range(dedup.SIMHASH_BITS):
+            weights[bit] += 1 if value >> bit & 1 else -1
+    return sum(1 << bit for bit, weight in enumerate(weights) if weight > 0)
+
+
+def test_simhash_matches_per_bit_definition():
+    for text in ["", "ab", "build #1234 failed on main", "您的訂單已出貨，預計明天送達"]:
+        assert dedup.simhash(text) == _reference_simhash(text)
+
+
+def test_notifications_differing_only_in_numbers_cluster_together():
+    items = [
+        {"subject": "CI build #1201 failed", "body": "Pipeline 88 failed at step test on 2024-05-01."},
+        {"subject": "週會議程", "body": "請準備本週專案進度報告與下季預算。"},
+        {"subject": "CI build #1202 failed", "body": "Pipeline 89 failed at step test on 2024-05-02."},
+    ]
+    assert dedup.cluster_near_duplicates(items) == [[0, 2], [1]]
+
+
+def test_clusters_merge_transitively(monkeypatch):
+    fingerprints = {"a": 0, "b": 0b111, "c": 0b111111, "far": (1 << 64) - 1}
+    monkeypatch.setattr(dedup, "email_fingerprint", lambda item: fingerprints[item["subject"]])
+    items = [{"subject": name} for name in ("c", "far", "a", "b")]
+    assert dedup.cluster_near_duplicates(items) == [[0, 2, 3], [1]]
+
+
+def test_representative_records_duplicates():
+    items = [
+        {"subject": "Sale", "recipient_account": "home"},
+        {"subject": "Sale", "recipient_account": "work"},
+        {"subject": "Sale", "recipient_account": "home"},
+    ]
+    [rep] = dedup.pick_representatives(items, [[0, 1, 2]])
+    assert (rep["duplicate_count"], rep["duplicate_accounts"]) == (3, ["home", "work"])
+    assert dedup.annotate_summary("摘要：特賣", rep).endswith("共 3 封（收件信箱：home, work）")
@@ -0,0 +1,19 @@
+import json
+
+from morningcast.data.email_parser import load_email_summary
+
+
+def test_bad_items_are_skipped_not_fatal(tmp_path):
+    path = tmp_path / "email_summary.json"
+    items = [
+        {"title": "週會改期", "important": "是", "spoken_line": " 週會改到週四。 "},
+        {"summary": "帳單已寄出，請於月底前繳納"},
+        "not an object",
+        {"category": "work"},
+    ]
+    path.write_text(json.dumps(items, ensure_ascii=False), encoding="utf-8")
+    records = load_email_summary(path)
+    assert [record["title"] for record in records] == ["週會改期", "帳單已寄出，請於月底前繳納"]
+    assert records[0]["important"] is True
+    assert records[0]["spoken_line"] == "週會改到週四。"
+    assert records[1]["category"] == "email"
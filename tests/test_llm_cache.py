@@ -0,0 +1,46 @@
+import os
+import time
+
+from morningcast.llm.cache import LLMResponseCache
+
+
+def _disk_size(cache):
+    return sum(path.stat().st_size for path in cache.directory.glob("*/*.json"))
+
+
+def test_round_trip_counts_hits_and_misses(tmp_path):
+    cache = LLMResponseCache(tmp_path)
+    key = cache.key_for({"model": "m", "messages": [{"role": "user", "content": "早安"}], "timeout": 5})
+    assert key == cache.key_for({"model": "m", "messages": [{"role": "user", "content": "早安"}]})
+    assert cache.get(key) is None
+    cache.put(key, "你好")
+    assert cache.get(key) == "你好"
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["hit_rate"]) == (1, 1, 0.5)
+
+
+def test_overwriting_a_key_keeps_size_exact(tmp_path):
+    cache = LLMResponseCache(tmp_path)
+    for content in ["a" * 500, "b" * 500, "c" * 20]:
+        cache.put("ab" + "0" * 62, content)
+    assert cache.stats()["size_bytes"] == _disk_size(cache)
+
+
+def test_expired_entries_miss(tmp_path):
+    cache = LLMResponseCache(tmp_path, ttl_seconds=60)
+    cache.put("cd" + "0" * 62, "old")
+    path = cache._path("cd" + "0" * 62)
+    path.write_text('{"created_at": %f, "content": "old"}' % (time.time() - 120), encoding="utf-8")
+    assert cache.get("cd" + "0" * 62) is None
+    assert not path.exists()
+
+
+def test_eviction_drops_least_recently_used(tmp_path):
+    cache = LLMResponseCache(tmp_path, max_bytes=600)
+    keys = [f"{index:02d}" + "0" * 62 for index in range(3)]
+    for index, key in enumerate(keys):
+        cache.put(key, "x" * 200)
+        os.utime(cache._path(key), (1000 + index, 1000 + index))
+    cache.put("99" + "0" * 62, "x" * 200)
+    assert not cache._path(keys[0]).exists()
+    assert cache.stats()["size_bytes"] == _disk_size(cache) <= 600
@@ -0,0 +1,57 @@
+import json
+
+import pytest
+
+pytest.importorskip("openai")
+
+from morningcast.llm import program_planner  # noqa: E402
+from morningcast.llm.base import OpenAIConfig  # noqa: E402
+
+VALID = json.dumps({"segments": [{"id": 1, "title": "開場", "emotion": "warm", "lines": [0]}]})
+
+
+def test_validate_reports_every_schema_error():
+    response = json.dumps({"segments": [{"id": True, "title": "開場"}, "oops"]})
+    segments, errors = program_planner.validate_segments(response)
+    assert segments is None
+    assert errors == ["segments[0].id 型別錯誤", "segments[0] 缺少 emotion", "segments[1] 不是物件"]
+
+
+def test_validate_strips_code_fence_and_can_require_lines():
+    fenced = "```json\n" + json.dumps({"segments": [{"id": "a", "title": "t", "emotion": "e"}]}) + "\n```"
+    assert program_planner.validate_segments(fenced)[1] == []
+    assert program_planner.validate_segments(fenced, require_lines=True)[1] == ["segments[0] 缺少 lines"]
+
+
+class ScriptedHelper:
+    def __init__(self, replies):
+        self.replies = list(replies)
+        self.prompts = []
+
+    def __call__(self, config):
+        return self
+
+    def complete(self, messages, **kwargs):
+        self.prompts.append(messages[-1]["content"])
+        return self.replies.pop(0)
+
+
+def _plan(monkeypatch, first, repairs, **kwargs):
+    helper = ScriptedHelper(repairs)
+    monkeypatch.setattr(program_planner, "plan_program", lambda payload, config, require_lines=False: first)
+    monkeypatch.setattr(program_planner, "OpenAIHelper", helper)
+    result = program_planner.request_plan({}, OpenAIConfig(api_key="", model="m"), **kwargs)
+    return result, helper
+
+
+def test_invalid_plan_is_repaired_with_the_errors_fed_back(monkeypatch):
+    result, helper = _plan(monkeypatch, '{"segments": [{"id": 1}]}', ["not json", VALID])
+    assert result.repair_attempts == 2
+    assert result.segments[0]["title"] == "開場"
+    assert "segments[0] 缺少 title" in helper.prompts[0]
+    assert "JSON 解析失敗" in helper.prompts[1]
+
+
+def test_repairs_are_bounded(monkeypatch):
+    with pytest.raises(program_planner.PlanValidationError):
+        _plan(monkeypatch, "[]", ["[]", "[]", VALID], max_repairs=2)
@@ -0,0 +1,48 @@
+import random
+
+import pytest
+
+from morningcast.utils.segmenter import AUTO, MARKDOWN, PLAIN, SSML, iter_sentences
+
+SSML_SCRIPT = (
+    "```xml\n<speak><p><s>早安！今天天氣晴朗。</s><s>記得帶傘？</s></p>"
+    '<break time="500ms"/><p>Hello world. It is 7 a.m.&amp; sunny!</p></speak>\n```'
+)
+MARKDOWN_SCRIPT = (
+    "# 標題\n\n- 第一點：今天**很好**。\n- 第二點 [連結](http://x.com)。\n\n"
+    "1. 第三點 `code` 與 _強調_。\n  2. two\n\n```\nignored\n```\n最後一段! And (done)."
+)
+PLAIN_SCRIPT = "早安！今天天氣晴朗。記得帶傘？\n\nHello world. It's 7 a.m. \"Sunny\" (mostly)!\n\n最後一句。"
+
+CASES = [
+    (SSML_SCRIPT, SSML),
+    (SSML_SCRIPT, AUTO),
+    (MARKDOWN_SCRIPT, MARKDOWN),
+    (MARKDOWN_SCRIPT, AUTO),
+    (PLAIN_SCRIPT, PLAIN),
+]
+
+
+def _random_splits(text, rng):
+    cuts = sorted(rng.sample(range(1, len(text)), rng.randint(1, min(25, len(text) - 1))))
+    return [text[start:end] for start, end in zip([0] + cuts, cuts + [len(text)])]
+
+
+@pytest.mark.parametrize("text,markup", CASES, ids=["ssml", "ssml-auto", "markdown", "markdown-auto", "plain"])
+def test_streamed_deltas_match_whole_input(text, markup):
+    expected = list(iter_sentences(text, markup))
+    rng = random.Random(f"{markup}:{len(text)}")
+    for _ in range(2000):
+        deltas = _random_splits(text, rng)
+        assert list(iter_sentences(deltas, markup)) == expected, deltas
+
+
+def test_link_split_before_list_marker():
+    deltas = ["# 標題\n\n- 第一點：今天**很好**。\n-", " 第二點 [連結](http://x.com)。\n\n1", ". 第三點"]
+    sentences = [sentence.text for sentence in iter_sentences(deltas, MARKDOWN)]
+    assert sentences == ["標題", "第一點：今天很好。", "第二點 連結。", "第三點"]
+
+
+def test_cjk_sentence_ends():
+    sentences = [sentence.text for sentence in iter_sentences("早安！今天天氣晴朗。記得帶傘？", PLAIN)]
+    assert sentences == ["早安！", "今天天氣晴朗。", "記得帶傘？"]
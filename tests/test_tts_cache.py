@@ -0,0 +1,52 @@
+from morningcast.tts.base import TextToSpeechEngine
+from morningcast.tts.cache import CachedTTSEngine, TTSAudioCache
+
+
+class CountingEngine(TextToSpeechEngine):
+    def __init__(self, voice="HsiaoChen"):
+        self.voice = voice
+        self.calls = 0
+
+    def cache_identity(self):
+        return {"engine": "fake", "voice": self.voice}
+
+    def synthesize(self, *, plain_text, ssml, output_path):
+        self.calls += 1
+        output_path.write_bytes(plain_text.encode("utf-8") * 10)
+        return [{"text": plain_text, "start": 0.0, "end": 1.0}]
+
+
+def _disk_size(cache):
+    return sum(path.stat().st_size for path in cache.directory.glob("*/*.audio"))
+
+
+def test_repeated_sentence_is_served_from_cache(tmp_path):
+    cache = TTSAudioCache(tmp_path / "cache")
+    engine = CachedTTSEngine(CountingEngine(), cache)
+    first = engine.synthesize(plain_text="早安，今天天氣晴。", ssml="", output_path=tmp_path / "a.wav")
+    assert not engine.last_call_hit()
+    second = engine.synthesize(plain_text="早安，今天天氣晴。", ssml="", output_path=tmp_path / "b.wav")
+    assert engine.last_call_hit()
+    assert engine.inner.calls == 1
+    assert first == second
+    assert (tmp_path / "a.wav").read_bytes() == (tmp_path / "b.wav").read_bytes()
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["chars_saved"]) == (1, 1, len("早安，今天天氣晴。"))
+
+
+def test_voice_is_part_of_the_key(tmp_path):
+    cache = TTSAudioCache(tmp_path / "cache")
+    CachedTTSEngine(CountingEngine("A"), cache).synthesize(plain_text="Hi.", ssml="", output_path=tmp_path / "a.wav")
+    other = CachedTTSEngine(CountingEngine("B"), cache)
+    other.synthesize(plain_text="Hi.", ssml="", output_path=tmp_path / "b.wav")
+    assert other.inner.calls == 1
+
+
+def test_overwriting_a_key_keeps_size_exact(tmp_path):
+    cache = TTSAudioCache(tmp_path / "cache")
+    rendered = tmp_path / "rendered.wav"
+    for size in (400, 400, 50):
+        rendered.write_bytes(b"x" * size)
+        cache.store("ab" + "0" * 62, rendered, elapsed=1.0)
+    assert cache.stats()["size_bytes"] == _disk_size(cache) == 50
+    assert not list(cache.directory.glob("*/*.tmp"))
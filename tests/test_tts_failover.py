@@ -0,0 +1,70 @@
+import pytest
+
+from morningcast.tts.base import TextToSpeechEngine, open_pcm_wav
+from morningcast.tts.selector import EngineHealthStore, TTSSelector
+
+
+class FlakyEngine(TextToSpeechEngine):
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.calls = 0
+
+    def synthesize(self, *, plain_text, ssml, output_path):
+        self.calls += 1
+        if self.fail:
+            raise RuntimeError("service unavailable")
+        with open_pcm_wav(output_path) as handle:
+            handle.writeframes(b"\x00\x00" * 441)
+        return None
+
+
+def _unavailable():
+    raise ImportError("SDK not installed")
+
+
+def test_circuit_opens_after_threshold_and_persists(tmp_path):
+    health = EngineHealthStore(tmp_path / "health.json", failure_threshold=2)
+    health.record_failure("azure", RuntimeError("boom"))
+    assert not health.is_open("azure")
+    health.record_failure("azure", RuntimeError("boom"))
+    assert health.is_open("azure")
+    assert EngineHealthStore(tmp_path / "health.json").is_open("azure")
+    health.record_success("azure", 1.0, chars=100)
+    assert not health.is_open("azure")
+
+
+def test_circuit_closes_after_cooldown(tmp_path):
+    health = EngineHealthStore(tmp_path / "health.json", failure_threshold=1, cooldown_seconds=0)
+    health.record_failure("azure", RuntimeError("boom"))
+    assert not health.is_open("azure")
+
+
+def test_failover_skips_open_circuit_on_later_calls(tmp_path):
+    health = EngineHealthStore(tmp_path / "health.json", failure_threshold=2)
+    broken, backup = FlakyEngine(fail=True), FlakyEngine()
+    selector = TTSSelector(
+        [("sdk", _unavailable), ("azure", lambda: broken), ("edge", lambda: backup)], health
+    )
+    for index in range(3):
+        selector.synthesize(plain_text="早安", ssml="", output_path=tmp_path / f"{index}.wav")
+    assert broken.calls == 2 and backup.calls == 3
+    assert selector.rendered["0.wav"]["engine"] == "edge"
+    assert selector.rendered["0.wav"]["failovers"] == 1
+    assert selector.rendered["2.wav"]["failovers"] == 0
+    assert health._entry("sdk")["consecutive_failures"] == 0
+
+
+def test_open_circuit_gets_a_last_chance(tmp_path):
+    health = EngineHealthStore(tmp_path / "health.json", failure_threshold=1)
+    health.record_failure("azure", RuntimeError("earlier outage"))
+    recovered, broken = FlakyEngine(), FlakyEngine(fail=True)
+    selector = TTSSelector([("azure", lambda: recovered), ("edge", lambda: broken)], health)
+    selector.synthesize(plain_text="早安", ssml="", output_path=tmp_path / "out.wav")
+    assert selector.rendered["out.wav"]["engine"] == "azure"
+    assert not health.is_open("azure")
+
+
+def test_all_engines_failing_raises(tmp_path):
+    selector = TTSSelector([("azure", lambda: FlakyEngine(fail=True))], EngineHealthStore(tmp_path / "h.json"))
+    with pytest.raises(RuntimeError, match="All TTS engines failed"):
+        selector.synthesize(plain_text="早安", ssml="", output_path=tmp_path / "out.wav")
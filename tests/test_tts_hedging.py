@@ -0,0 +1,62 @@
+import threading
+
+from morningcast.tts.base import TextToSpeechEngine, open_pcm_wav
+from morningcast.tts.selector import EngineHealthStore, TTSSelector
+
+
+class FakeEngine(TextToSpeechEngine):
+    def __init__(self, voice="HsiaoChen", *, delay=0.0, fail=False, release=None):
+        self.voice = voice
+        self.delay = delay
+        self.fail = fail
+        self.release = release
+        self.calls = 0
+
+    def cache_identity(self):
+        return {"engine": "fake", "voice": self.voice}
+
+    def synthesize(self, *, plain_text, ssml, output_path):
+        self.calls += 1
+        if self.release is not None:
+            self.release.wait(self.delay)
+        if self.fail:
+            raise RuntimeError(f"{self.voice} down")
+        with open_pcm_wav(output_path) as handle:
+            handle.writeframes(b"\x00\x00" * 441)
+        return None
+
+
+def _selector(tmp_path, engines, **kwargs):
+    health = EngineHealthStore(tmp_path / "health.json")
+    candidates = [(name, (lambda engine=engine: engine)) for name, engine in engines]
+    return TTSSelector(candidates, health, hedge=True, hedge_default_seconds=0.05, **kwargs), health
+
+
+def test_slow_primary_is_hedged_on_engine_with_same_voice(tmp_path):
+    release = threading.Event()
+    slow = FakeEngine(delay=5.0, release=release)
+    backup = FakeEngine()
+    selector, _ = _selector(tmp_path, [("azure", slow), ("edge", backup)])
+    try:
+        selector.synthesize(plain_text="早安", ssml="", output_path=tmp_path / "out.wav")
+        assert selector.rendered["out.wav"]["engine"] == "edge"
+        assert selector.stats()["hedge_wins"] == 1
+    finally:
+        release.set()
+        selector.close()
+    assert (tmp_path / "out.wav").exists()
+
+
+def test_failed_backup_is_recorded_against_the_backup(tmp_path):
+    release = threading.Event()
+    slow = FakeEngine(delay=0.3, release=release)
+    broken = FakeEngine(fail=True)
+    selector, health = _selector(tmp_path, [("azure", slow), ("edge", broken)])
+    try:
+        selector.synthesize(plain_text="早安", ssml="", output_path=tmp_path / "out.wav")
+    finally:
+        selector.close()
+    assert selector.rendered["out.wav"]["engine"] == "azure"
+    assert health._entry("edge")["consecutive_failures"] == 1
+    assert health._entry("azure")["consecutive_failures"] == 0
+    assert not list(tmp_path.glob("out.*.wav"))